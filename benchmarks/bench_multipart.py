@@ -0,0 +1,72 @@
+"""Peak memory of multipart uploads for growing file sizes.
+
+Each upload runs in its own process against a local stand-in server that
+discards what it receives, and reports the peak RSS growth while the file
+is sent. `stream` is how MultipartRequest sends files, `buffered`
+materializes the whole body first, as uploads did before.
+
+    python benchmarks/bench_multipart.py [sizes in MB...]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from callfire import CallFireAPI  # noqa: E402
+from callfire.base import MultipartRequest  # noqa: E402
+from tests.server import Handler, LocalServer  # noqa: E402
+
+from bench_streaming import peak_rss  # noqa: E402
+
+
+class DiscardingHandler(Handler):
+
+    def _handle(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        while length:
+            length -= len(self.rfile.read(min(length, 64 * 1024)))
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'{}')
+
+    do_POST = _handle
+
+
+def upload(mode, url, path):
+    api = CallFireAPI('username', 'password', pool_size=1)
+    api.BASE_URL = url
+
+    before = peak_rss()
+    if mode == 'stream':
+        api.post_file_campaign_sound(payload=path)
+    else:
+        with open(path, 'rb') as stream:
+            body = MultipartRequest.generate_multipart(stream)
+        api.post_file_campaign_sound(payload=path)
+        del body
+    after = peak_rss()
+    print('{:<10} {:>6} MB file {:>10} KB peak RSS growth'.format(
+        mode, os.path.getsize(path) // 2 ** 20, after - before))
+
+
+def main(*sizes):
+    with LocalServer(handler=DiscardingHandler) as server:
+        for size in sizes or (1, 16, 64):
+            with tempfile.NamedTemporaryFile() as f:
+                for _ in range(size):
+                    f.write(os.urandom(2 ** 20))
+                f.flush()
+                for mode in ('stream', 'buffered'):
+                    subprocess.check_call(
+                        [sys.executable, __file__, '--upload', mode,
+                         server.url, f.name])
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--upload']:
+        upload(*sys.argv[2:])
+    else:
+        main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,48 @@
+"""Client-side overhead per call, excluding the network.
+
+Calls go through the memory transport, so the numbers are the cost of
+building, preparing and tracking a request and wrapping its response.
+
+    python benchmarks/bench_overhead.py [calls]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from callfire import CallFireAPI, MemoryTransport  # noqa: E402
+from callfire.base import JSONRequest  # noqa: E402
+
+
+class PreparingTransport(MemoryTransport):
+    """Memory transport also building the urllib request, as urlopen would."""
+
+    def open(self, request, *args, **kwargs):
+        request.prepare(*args[:3])
+        return super(PreparingTransport, self).open(request, *args, **kwargs)
+
+
+def main(calls=20000):
+    recipients = [{'phoneNumber': '1340888{:04d}'.format(i), 'message': 'Hi!'}
+                  for i in range(10)]
+    api = CallFireAPI('username', 'password', transport=MemoryTransport())
+    urllib_api = CallFireAPI(
+        'username', 'password', transport=PreparingTransport())
+
+    cases = (
+        ('auth header', lambda: api._get_auth_header()),
+        ('prepare request',
+         lambda: JSONRequest('/calls/1', query={'fields': 'id'}).prepare(
+             api.BASE_URL, api._get_auth_header(), 'GET')),
+        ('get_call', lambda: api.get_call(1, query={'fields': 'id'})),
+        ('send_texts', lambda: api.send_texts(body=recipients)),
+        ('get_call (urllib)', lambda: urllib_api.get_call(1)),
+    )
+    for label, case in cases:
+        best = min(timeit.repeat(case, number=calls, repeat=3))
+        print('{:<20} {:>8.2f} us/call'.format(label, best / calls * 1e6))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,47 @@
+"""Requests/sec of the pooled keep-alive transport against plain urlopen.
+
+Runs against a local stand-in server, so it measures connection setup and
+client overhead only; TLS handshakes against the real API make the gap wider.
+
+    python benchmarks/bench_pool.py [requests] [threads]
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from callfire import CallFireAPI  # noqa: E402
+from tests.server import LocalServer  # noqa: E402
+
+
+def run(api, requests, threads):
+    def worker(n):
+        for i in range(n):
+            api.get_call(i).json()
+
+    workers = [
+        threading.Thread(target=worker, args=(requests // threads,))
+        for _ in range(threads)
+    ]
+    started = time.time()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return requests / (time.time() - started)
+
+
+def main(requests=2000, threads=4):
+    with LocalServer(payload={'id': 1, 'state': 'FINISHED'}) as server:
+        for label, kwargs in (('urlopen', {}),
+                              ('pooled', {'pool_size': threads})):
+            api = CallFireAPI('username', 'password', **kwargs)
+            api.BASE_URL = server.url
+            print('{:<10} {:>10.1f} req/s'.format(
+                label, run(api, requests, threads)))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
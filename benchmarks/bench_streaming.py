@@ -0,0 +1,80 @@
+"""Peak memory of decoding a large list page with json() and iter_items().
+
+Each mode runs in its own process against a local stand-in server serving a
+page of items with attributes, and reports the peak RSS growth while the
+page is consumed, in kilobytes.
+
+    python benchmarks/bench_streaming.py [items] [attributes]
+"""
+import os
+import resource
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from callfire import CallFireAPI  # noqa: E402
+from tests.server import LocalServer  # noqa: E402
+
+
+def make_page(items, attributes):
+    return {
+        'items': [
+            {
+                'id': i,
+                'toNumber': '1340888{:04d}'.format(i),
+                'state': 'FINISHED',
+                'attributes': dict(
+                    ('attribute{}'.format(n), 'value {} {}'.format(i, n))
+                    for n in range(attributes)),
+            }
+            for i in range(items)
+        ],
+        'limit': items,
+        'offset': 0,
+        'totalCount': items,
+    }
+
+
+def peak_rss():
+    """Returns the peak RSS of this process in kilobytes."""
+    try:
+        # ru_maxrss survives exec on Linux, so it would report the parent
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except IOError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def consume(mode, url):
+    api = CallFireAPI('username', 'password')
+    api.BASE_URL = url
+    with api.streaming():
+        response = api.find_calls()
+
+    before = peak_rss()
+    if mode == 'json':
+        count = sum(1 for _ in response.json()['items'])
+    else:
+        count = sum(1 for _ in response.iter_items())
+    after = peak_rss()
+    print('{:<10} {:>6} items {:>10} KB peak RSS growth'.format(
+        mode, count, after - before))
+
+
+def main(items=1000, attributes=200):
+    page = make_page(items, attributes)
+    with LocalServer(payload=page) as server:
+        for mode in ('json', 'stream'):
+            subprocess.check_call(
+                [sys.executable, __file__, '--consume', mode, server.url])
+
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--consume']:
+        consume(*sys.argv[2:])
+    else:
+        main(*[int(arg) for arg in sys.argv[1:]])
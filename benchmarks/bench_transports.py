@@ -0,0 +1,39 @@
+"""Per-call latency of each transport against a local stand-in server.
+
+The memory transport never touches the network and shows the client-side
+overhead every other transport pays on top of its own cost.
+
+    python benchmarks/bench_transports.py [requests]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from callfire import (  # noqa: E402
+    CallFireAPI, HTTPTransport, MemoryTransport, UrllibTransport)
+from tests.server import LocalServer  # noqa: E402
+
+
+def run(api, requests):
+    started = time.time()
+    for i in range(requests):
+        api.get_call(i).json()
+    return (time.time() - started) / requests
+
+
+def main(requests=2000):
+    with LocalServer(payload={'id': 1, 'state': 'FINISHED'}) as server:
+        for transport in (UrllibTransport(),
+                          HTTPTransport(pool_size=1),
+                          MemoryTransport()):
+            api = CallFireAPI('username', 'password', transport=transport)
+            api.BASE_URL = server.url
+            print('{:<18} {:>8.1f} us/call'.format(
+                type(transport).__name__, run(api, requests) * 1e6))
+            api.close()
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -1,5 +1,29 @@
-from .base import CallFireError
+import sys
+
+from .archive import ArchiveResult, RecordingArchiver
+from .base import UrllibTransport
+from .batch import BatchResult
+from .breaker import CircuitBreaker
+from .bulk import BulkResult, BulkSender
+from .cache import Cache, MemoryCache, SQLiteCache
 from .callfire_v2 import CallFireAPIVersion2
+from .coalesce import SingleFlight
+from .csvstream import CSVStream
+from .exceptions import CallFireError, CircuitOpenError, DeadlineExceeded
+from .hedge import HedgePolicy
+from .loader import BatchLoader
+from .pagination import Paginator
+from .ratelimit import RateLimiter, TokenBucket
+from .recipients import RecipientLoader, read_csv
+from .response import Response, StreamedResponse
+from .retry import RetryBudget, RetryPolicy
+from .scan import WindowScanner
+from .streaming import JSONItemStream
+from .timeout import Deadline, Timeout
+from .transport import HTTPTransport, MemoryTransport, Transport
+
+if sys.version_info >= (3, 5):
+    from .aio import AsyncCallFireAPI, AsyncHTTPTransport
 
 # alias current version
 CallFireAPI = CallFireAPIVersion2
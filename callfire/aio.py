@@ -0,0 +1,354 @@
+"""Asyncio flavour of the API client, requires Python 3.5+."""
+import asyncio
+import collections
+import email.parser
+import http.client
+import io
+import ssl
+import time
+from urllib.error import HTTPError, URLError
+from urllib.parse import urlsplit
+
+from .base import BaseAPI
+from .callfire_v2 import CallFireAPIVersion2
+from .multipart import ChunkedBody, is_chunked
+from .response import Response
+from .retry import RetryPolicy
+from .transport import Transport
+
+
+_Connection = collections.namedtuple('_Connection', 'reader writer')
+
+
+class AsyncConnectionPool(object):
+    """Pool of keep-alive asyncio stream connections to a single host."""
+
+    def __init__(self, scheme, host, port=None, maxsize=100, timeout=None):
+        """Connection pool.
+
+        Must be created from within a running event loop.
+
+        :param scheme: `http` or `https`
+        :param host: host name
+        :param port: port, defaults to the scheme default
+        :param maxsize: maximum number of connections open at once, further
+        requests wait for a free connection
+        :param timeout: timeout in seconds for a single request
+        """
+        self.scheme = scheme
+        self.host = host
+        self.port = port or (443 if scheme == 'https' else 80)
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.num_connections = 0
+        self.num_requests = 0
+        self._idle = collections.deque()
+        self._semaphore = asyncio.Semaphore(maxsize)
+
+    async def _new_conn(self):
+        """Opens a new connection to the pool host."""
+        self.num_connections += 1
+        ssl_context = None
+        if self.scheme == 'https':
+            ssl_context = ssl.create_default_context()
+        reader, writer = await asyncio.open_connection(
+            self.host, self.port, ssl=ssl_context)
+        return _Connection(reader, writer)
+
+    async def _get_conn(self):
+        """Returns an idle connection or a new one if none is available.
+
+        :returns (connection, reused) pair
+        """
+        while self._idle:
+            conn = self._idle.pop()
+            if not conn.reader.at_eof():
+                return conn, True
+            conn.writer.close()
+        return await self._new_conn(), False
+
+    @staticmethod
+    def _serialize_head(method, path, host, body, headers):
+        """Serializes an HTTP/1.1 request line and headers."""
+        lines = [
+            '{} {} HTTP/1.1'.format(method, path),
+            'Host: {}'.format(host),
+        ]
+        for name, value in headers.items():
+            lines.append('{}: {}'.format(name, value))
+        if body is not None and not any(
+                name.lower() in ('content-length', 'transfer-encoding')
+                for name in headers):
+            lines.append('Content-Length: {}'.format(len(body)))
+        return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+    @staticmethod
+    async def _read_response(reader, method):
+        """Reads a response from the stream.
+
+        :returns (status, reason, headers, data, will_close) tuple
+        """
+        status_line = await reader.readline()
+        if not status_line:
+            raise http.client.RemoteDisconnected(
+                'Remote end closed connection without response')
+        version, status, reason = (
+            status_line.decode('latin-1').rstrip('\r\n').split(' ', 2) +
+            [''])[:3]
+        status = int(status)
+
+        header_lines = []
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            header_lines.append(line.decode('latin-1'))
+        headers = email.parser.Parser(
+            _class=http.client.HTTPMessage).parsestr(''.join(header_lines))
+
+        will_close = (
+            version == 'HTTP/1.0' or
+            headers.get('Connection', '').lower() == 'close')
+
+        if method == 'HEAD' or status in (204, 304) or status < 200:
+            data = b''
+        elif 'chunked' in headers.get('Transfer-Encoding', '').lower():
+            chunks = []
+            while True:
+                size = int((await reader.readline()).split(b';')[0], 16)
+                if not size:
+                    break
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+            data = b''.join(chunks)
+        elif headers.get('Content-Length') is not None:
+            data = await reader.readexactly(int(headers['Content-Length']))
+        else:
+            data = await reader.read()
+            will_close = True
+
+        return status, reason, headers, data, will_close
+
+    async def _exchange(self, conn, method, path, body, headers):
+        host = self.host
+        if self.port not in (80, 443):
+            host = '{}:{}'.format(host, self.port)
+        conn.writer.write(
+            self._serialize_head(method, path, host, body, headers))
+        if hasattr(body, 'read') and is_chunked(headers):
+            body = ChunkedBody(body)
+        if hasattr(body, 'read'):
+            # file-like bodies, e.g. multipart uploads, go in chunks
+            for chunk in iter(lambda: body.read(64 * 1024), b''):
+                conn.writer.write(chunk)
+                await conn.writer.drain()
+        elif body:
+            conn.writer.write(body)
+        await conn.writer.drain()
+        return await self._read_response(conn.reader, method)
+
+    async def urlopen(self, method, url, body=None, headers=None,
+                      timeout=None):
+        """Sends a request over a pooled connection.
+
+        :param method: request method
+        :param url: full request url, used for error reporting
+        :param body: request body
+        :param headers: request headers
+        :param timeout: timeout in seconds overriding the pool one
+        :returns Response
+        """
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        headers = headers or {}
+        if timeout is None:
+            timeout = self.timeout
+
+        self.num_requests += 1
+        await self._semaphore.acquire()
+        conn = None
+        try:
+            conn, reused = await self._get_conn()
+            try:
+                exchange = self._exchange(conn, method, path, body, headers)
+                status, reason, response_headers, data, will_close = (
+                    await asyncio.wait_for(exchange, timeout))
+            except (OSError, http.client.HTTPException,
+                    asyncio.IncompleteReadError):
+                conn.writer.close()
+                if not reused or not getattr(body, 'rewindable', True):
+                    raise
+                # writes are buffered, so the server may have processed the
+                # request and only an idempotent one is safe to send again
+                if method not in RetryPolicy.IDEMPOTENT_METHODS:
+                    raise
+                # the server may have dropped an idle keep-alive connection,
+                # give it one more go over a fresh one
+                if hasattr(body, 'rewind'):
+                    body.rewind()
+                conn = await self._new_conn()
+                exchange = self._exchange(conn, method, path, body, headers)
+                status, reason, response_headers, data, will_close = (
+                    await asyncio.wait_for(exchange, timeout))
+        except (OSError, ValueError, http.client.HTTPException,
+                asyncio.IncompleteReadError, asyncio.TimeoutError) as exc:
+            if conn is not None:
+                conn.writer.close()
+            raise URLError(exc)
+        finally:
+            self._semaphore.release()
+
+        if will_close:
+            conn.writer.close()
+        else:
+            self._idle.append(conn)
+
+        if status >= 400:
+            raise HTTPError(url, status, reason, response_headers,
+                            io.BytesIO(data))
+
+        return Response(url, status, reason, response_headers, data)
+
+    def close(self):
+        """Closes all idle connections."""
+        while self._idle:
+            self._idle.pop().writer.close()
+
+
+class AsyncHTTPTransport(Transport):
+    """Non-blocking transport, `open` and `close` are coroutines."""
+
+    def __init__(self, pool_size=100, timeout=None):
+        """Async HTTP transport.
+
+        :param pool_size: maximum number of connections open per host
+        :param timeout: timeout in seconds for a single request
+        """
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.pools = {}
+
+    def connection_pool(self, scheme, host, port=None):
+        """Returns the pool for a given host, creating it on first use."""
+        key = (scheme, host, port)
+        pool = self.pools.get(key)
+        if pool is None:
+            pool = AsyncConnectionPool(
+                scheme, host, port,
+                maxsize=self.pool_size, timeout=self.timeout)
+            self.pools[key] = pool
+        return pool
+
+    async def open(self, request, base_url, auth_header, method,
+                   stream=False, timeout=None):
+        """Sends a single request, bodies are always read up front.
+
+        The whole exchange is bounded by the longer of both timeouts.
+        """
+        url = request.get_url(base_url)
+        parts = urlsplit(url)
+        pool = self.connection_pool(parts.scheme, parts.hostname, parts.port)
+        return await pool.urlopen(
+            method, url, request.prepared_body,
+            request.get_headers(auth_header),
+            timeout=timeout.total if timeout is not None else None)
+
+    async def close(self):
+        for pool in self.pools.values():
+            pool.close()
+        # let the loop finish closing the socket transports
+        await asyncio.sleep(0)
+
+
+def _sync_only(name):
+    """Returns a stand-in for a helper built on blocking calls."""
+    def method(*args, **kwargs):
+        raise NotImplementedError(
+            '{} is not available on the asyncio client, use the blocking '
+            'CallFireAPI or gather API coroutines instead'.format(name))
+    method.__name__ = name
+    method.__doc__ = 'Not available on the asyncio client.'
+    return method
+
+
+class AsyncBaseAPI(BaseAPI):
+    """API base whose request methods return coroutines.
+
+    Helpers running API calls on threads or iterating over their results,
+    e.g. `map`, `paginate` or the `iter_*` and `download_*` methods, and
+    the thread-local `streaming`, `with_headers`, `with_timeout` and
+    `deadline` blocks are not available and raise `NotImplementedError`.
+    """
+
+    batch = _sync_only('batch')
+    map = _sync_only('map')
+    paginate = _sync_only('paginate')
+    scan = _sync_only('scan')
+    download = _sync_only('download')
+    loader = _sync_only('loader')
+    bulk = _sync_only('bulk')
+    load_recipients = _sync_only('load_recipients')
+    archive_recordings = _sync_only('archive_recordings')
+    streaming = _sync_only('streaming')
+    with_headers = _sync_only('with_headers')
+    with_timeout = _sync_only('with_timeout')
+    deadline = staticmethod(_sync_only('deadline'))
+
+    def __init__(self, username, password, debug=False, pool_size=100,
+                 transport=None, timeout=None):
+        """Async API base.
+
+        :param username: API username
+        :param password: API password
+        :param debug: enable debug logger
+        :param pool_size: maximum number of connections open per host
+        :param transport: transport with a coroutine `open`, defaults to
+        `AsyncHTTPTransport`
+        :param timeout: timeout of every request in seconds, or a (connect,
+        read) pair
+        """
+        if transport is None:
+            transport = AsyncHTTPTransport(pool_size=pool_size)
+        super(AsyncBaseAPI, self).__init__(
+            username, password, debug=debug, transport=transport,
+            timeout=timeout)
+
+    async def close(self):
+        """Releases connections held by the transport."""
+        await self.transport.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _open_request(self, request, method):
+        """Sends a single API request.
+
+        :param request: request object
+        :param method: request method
+        """
+        kwargs = {}
+        if self.timeout is not None:
+            kwargs['timeout'] = self.timeout
+        started = time.time()
+        try:
+            response = await self.transport.open(
+                request, self.BASE_URL, self._get_auth_header(), method,
+                **kwargs)
+        except URLError as wrapped_exc:
+            self._reraise(wrapped_exc, request, method)
+        return self._track(response, request, started)
+
+
+class AsyncCallFireAPI(AsyncBaseAPI, CallFireAPIVersion2):
+    """CallFire API v2 wrapper with every operation returning a coroutine.
+
+        >>> async with AsyncCallFireAPI(username, password) as api:
+        ...     response = await api.get_call(id)
+    """
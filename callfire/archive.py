@@ -0,0 +1,239 @@
+import collections
+import logging
+import os
+import socket
+import threading
+import time
+
+from six.moves import http_client
+
+from .batch import BatchExecutor
+from .download import copy_stream
+from .exceptions import CallFireError
+
+
+logger = logging.getLogger(__name__)
+
+
+class ArchiveResult(collections.namedtuple(
+        'ArchiveResult', 'call_id recording_id path status size error')):
+    """Outcome of archiving a single recording.
+
+    `status` is one of `saved`, `resumed`, `skipped` or `failed`. A call
+    whose recordings could not be listed gives a single failed result with
+    no `recording_id`.
+    """
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class RecordingArchiver(object):
+    """Downloads every recording of a call broadcast into a directory.
+
+    Calls are paged through while their recordings are downloaded on a
+    bounded thread pool, so listing and downloading overlap. Recordings are
+    written to a `.part` file renamed into place once complete, files
+    already in the directory are skipped and partial files left by an
+    interrupted run are resumed with a `Range` request. A server answering
+    the whole body instead has it written from scratch.
+
+        >>> archiver = RecordingArchiver(api, broadcast_id, 'archive/')
+        >>> for result in archiver:
+        ...     if not result.ok:
+        ...         print(result.call_id, result.error)
+        >>> archiver.recordings_saved, archiver.throughput
+    """
+
+    def __init__(self, api, broadcast_id, directory, query=None,
+                 concurrency=8, page_size=1000, buffer_size=64 * 1024,
+                 report=None, report_interval=10.0):
+        """Recording archiver.
+
+        :param api: API instance, preferably with a connection pool at
+        least `concurrency` connections large
+        :param broadcast_id: id of the call broadcast
+        :param directory: directory the recordings are saved to, created if
+        missing
+        :param query: query params of `get_call_broadcast_calls`
+        :param concurrency: number of calls processed in parallel
+        :param page_size: number of calls requested per page
+        :param buffer_size: size of the copy buffer kept per thread
+        :param report: callable receiving the archiver every
+        `report_interval` seconds and once when done, progress is logged
+        at info level by default
+        :param report_interval: seconds between progress reports
+        """
+        self.api = api
+        self.broadcast_id = broadcast_id
+        self.directory = directory
+        self.query = query
+        self.concurrency = concurrency
+        self.page_size = page_size
+        self.buffer_size = buffer_size
+        self.report = report or self.log_progress
+        self.report_interval = report_interval
+        self.calls_listed = 0
+        self.recordings_saved = 0
+        self.recordings_resumed = 0
+        self.recordings_skipped = 0
+        self.recordings_failed = 0
+        self.bytes_received = 0
+        self.started = None
+        self.finished = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @property
+    def elapsed(self):
+        """Seconds spent archiving so far."""
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    @property
+    def throughput(self):
+        """Bytes received per second."""
+        elapsed = self.elapsed
+        return self.bytes_received / elapsed if elapsed else 0.0
+
+    @property
+    def rate(self):
+        """Recordings saved per second."""
+        elapsed = self.elapsed
+        return self.recordings_saved / elapsed if elapsed else 0.0
+
+    @staticmethod
+    def log_progress(archiver):
+        logger.info(
+            'Broadcast %s: %d calls, %d recordings saved (%d resumed), '
+            '%d skipped, %d failed, %.1f recordings/s, %.1f KiB/s',
+            archiver.broadcast_id, archiver.calls_listed,
+            archiver.recordings_saved, archiver.recordings_resumed,
+            archiver.recordings_skipped, archiver.recordings_failed,
+            archiver.rate, archiver.throughput / 1024)
+
+    def path(self, call_id, recording_id):
+        """Returns the file path of a recording."""
+        return os.path.join(
+            self.directory, '{}-{}.mp3'.format(call_id, recording_id))
+
+    def iter_calls(self):
+        """Pages through the calls of the broadcast."""
+        for call in self.api.iter_call_broadcast_calls(
+                self.broadcast_id, query=self.query,
+                page_size=self.page_size):
+            with self._lock:
+                self.calls_listed += 1
+            yield call
+
+    def recording_ids(self, call):
+        """Returns ids of the recordings of a call.
+
+        Recordings embedded in the call records are used as is, the other
+        calls have them listed with `get_call_recordings`.
+
+        :param call: call dictionary
+        """
+        records = call.get('records') or []
+        if any('recordings' in record for record in records):
+            return [recording['id']
+                    for record in records
+                    for recording in record.get('recordings') or []]
+
+        recordings = self.api.get_call_recordings(call['id']).json()
+        if isinstance(recordings, dict):
+            recordings = recordings.get('items') or []
+        return [recording['id'] for recording in recordings]
+
+    def _buffer(self):
+        buffer = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            buffer = self._local.buffer = bytearray(self.buffer_size)
+        return buffer
+
+    def fetch(self, call_id, recording_id):
+        """Downloads a single recording unless it is already on disk.
+
+        :param call_id: call id
+        :param recording_id: recording id
+        :returns `ArchiveResult`
+        """
+        path = self.path(call_id, recording_id)
+        if os.path.exists(path):
+            return ArchiveResult(call_id, recording_id, path, 'skipped', 0,
+                                 None)
+
+        partial = path + '.part'
+        offset = os.path.getsize(partial) if os.path.exists(partial) else 0
+        headers = {'Range': 'bytes={}-'.format(offset)} if offset else {}
+        try:
+            with self.api.streaming(), self.api.with_headers(headers):
+                response = self.api.get_call_recording_mp3(recording_id)
+        except CallFireError as exc:
+            if offset and getattr(exc.wrapped_exc, 'code', None) == 416:
+                # the partial file does not match the recording any more
+                os.remove(partial)
+                return self.fetch(call_id, recording_id)
+            return ArchiveResult(call_id, recording_id, path, 'failed', 0,
+                                 exc)
+
+        resumed = offset > 0 and response.status == 206
+        try:
+            with open(partial, 'ab' if resumed else 'wb') as stream:
+                size = copy_stream(response, stream, self._buffer())
+        except (socket.error, http_client.HTTPException) as exc:
+            # what made it to disk is resumed on the next run
+            return ArchiveResult(call_id, recording_id, path, 'failed', 0,
+                                 exc)
+        os.rename(partial, path)
+        return ArchiveResult(call_id, recording_id, path,
+                             'resumed' if resumed else 'saved', size, None)
+
+    def archive_call(self, call):
+        """Downloads all recordings of a call.
+
+        :param call: call dictionary
+        :returns list of `ArchiveResult`
+        """
+        return [self.fetch(call['id'], recording_id)
+                for recording_id in self.recording_ids(call)]
+
+    def _count(self, result):
+        with self._lock:
+            self.bytes_received += result.size
+            if result.status == 'failed':
+                self.recordings_failed += 1
+            elif result.status == 'skipped':
+                self.recordings_skipped += 1
+            else:
+                self.recordings_saved += 1
+                if result.status == 'resumed':
+                    self.recordings_resumed += 1
+
+    def __iter__(self):
+        if not os.path.isdir(self.directory):
+            os.makedirs(self.directory)
+
+        self.started, self.finished = time.time(), None
+        reported = self.started
+        calls = ((self.archive_call, (call,)) for call in self.iter_calls())
+        executor = BatchExecutor(self.concurrency, ordered=False)
+        for batch_result in executor.run(calls):
+            if batch_result.ok:
+                results = batch_result.response
+            else:
+                call, = batch_result.args
+                results = [ArchiveResult(call['id'], None, None, 'failed', 0,
+                                         batch_result.error)]
+            for result in results:
+                self._count(result)
+                yield result
+
+            if time.time() - reported >= self.report_interval:
+                reported = time.time()
+                self.report(self)
+
+        self.finished = time.time()
+        self.report(self)
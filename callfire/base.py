@@ -1,36 +1,90 @@
 import abc
 import base64
+import contextlib
 import json
 import logging
+import re
+import socket
 import sys
-import types
+import threading
+import time
 import six
+from six.moves import http_client
+
+from .archive import RecordingArchiver
+from .batch import BatchExecutor
+from .bulk import BulkSender
+from .cache import cache_key
+from .coalesce import SingleFlight
+from .csvstream import CSVStream
+from .download import iter_chunks, save
+from .exceptions import CallFireError, DeadlineExceeded
+from .loader import BatchLoader
+from .multipart import MultipartBody
+from .pagination import Paginator
+from .ratelimit import parse_retry_after
+from .recipients import RecipientLoader
+from .scan import WindowScanner
+from .response import Response, StreamedResponse
+from .timeout import Deadline, Timeout, call_within
+from .transport import HTTPTransport, Transport
 try:
     # py3
     from urllib.request import urlopen, Request
-    from urllib.parse import urlencode
+    from urllib.parse import quote_plus, urlencode
     from urllib.error import URLError
 except ImportError:
     # py2
-    from urllib import urlencode
+    from urllib import quote_plus, urlencode
     from urllib2 import urlopen, Request, URLError
 
 
 # set default logger handler
 logging.getLogger(__name__).addHandler(logging.NullHandler())
 
+#: Characters left as is by `quote_plus`
+URL_SAFE = re.compile(r'^[A-Za-z0-9_.~-]*\Z')
 
-class CallFireError(Exception):
-    """Exception wrapper."""
-    def __init__(self, wrapped_exc, *args, **kwargs):
-        self.wrapped_exc = wrapped_exc
-        super(CallFireError, self).__init__(*args, **kwargs)
+
+def encode_query(query):
+    """Encodes a query like `urlencode`, skipping quoting where possible.
+
+    Query keys and values are mostly plain ids and names, which do not need
+    to go through `quote_plus` at all.
+
+    :param query: query dictionary
+    """
+    parts = []
+    for key, value in six.iteritems(query):
+        if not isinstance(value, six.string_types + six.integer_types):
+            return urlencode(query)
+        key, value = str(key), str(value)
+        if not URL_SAFE.match(key):
+            key = quote_plus(key)
+        if not URL_SAFE.match(value):
+            value = quote_plus(value)
+        parts.append(key + '=' + value)
+    return '&'.join(parts)
+
+
+class MethodRequest(Request):
+    """urllib request sent with an explicit method."""
+
+    def __init__(self, url, data, headers, method):
+        Request.__init__(self, url, data, headers)
+        self.method = method
+
+    def get_method(self):
+        return self.method
 
 
 @six.add_metaclass(abc.ABCMeta)
 class BaseRequest(object):
     """Class for preparing a customized request."""
 
+    #: Headers sent on top of the request type ones, e.g. `Range`
+    extra_headers = None
+
     def __init__(self, path, query=None, body=None, **kwargs):
         self.path = path
         self.query = query
@@ -50,6 +104,27 @@ class BaseRequest(object):
         underlying body to be useful with this kind of request.
         """
 
+    def get_url(self, base_url):
+        """Get the full request url including the encoded query.
+
+        :param base_url: API base url
+        """
+        url = '{}{}'.format(base_url, self.path)
+        if self.query:
+            url += '?' + encode_query(self.query)
+        return url
+
+    def get_headers(self, auth_header):
+        """Get all headers to be sent with this request.
+
+        :param auth_header: authorization header value
+        """
+        headers = {'Authorization': auth_header}
+        headers.update(self.additional_headers)
+        if self.extra_headers:
+            headers.update(self.extra_headers)
+        return headers
+
     def prepare(self, base_url, auth_header, method):
         """Prepare the underlying request
 
@@ -59,17 +134,9 @@ class BaseRequest(object):
         :param method: The method with which this request is going to be used
         :returns: An instance of urllib.Request.
         """
-
-        url = '{}{}'.format(base_url, self.path)
-        if self.query:
-            url += '?{}'.format(urlencode(self.query))
-
-        headers = {'Authorization': auth_header}
-        headers.update(self.additional_headers)
-
-        request = Request(url, self.prepared_body, headers)
-        request.get_method = lambda: method
-        return request
+        return MethodRequest(
+            self.get_url(base_url), self.prepared_body,
+            self.get_headers(auth_header), method)
 
 
 class JSONRequest(BaseRequest):
@@ -77,14 +144,30 @@ class JSONRequest(BaseRequest):
 
     additional_headers = {'Content-Type': 'application/json'}
 
+    def __init__(self, *args, **kwargs):
+        super(JSONRequest, self).__init__(*args, **kwargs)
+        self._prepared_body = None
+
+    def get_headers(self, auth_header):
+        headers = {'Authorization': auth_header,
+                   'Content-Type': 'application/json'}
+        if self.extra_headers:
+            headers.update(self.extra_headers)
+        return headers
+
     @property
     def prepared_body(self):
-        if self.body:
-            return json.dumps(self.body).encode('utf-8')
+        if self._prepared_body is None and self.body:
+            self._prepared_body = json.dumps(self.body).encode('utf-8')
+        return self._prepared_body
 
 
 class MultipartRequest(BaseRequest):
-    """Request which can be used for multipart form posting."""
+    """Request which can be used for multipart form posting.
+
+    The payload is a file object, a file path or an iterable of bytes, it
+    is streamed in chunks as the request is sent.
+    """
 
     def __init__(self, *args, **kwargs):
         super(MultipartRequest, self).__init__(*args, **kwargs)
@@ -93,50 +176,122 @@ class MultipartRequest(BaseRequest):
 
     @property
     def additional_headers(self):
+        body = self.prepared_body
+        if body.length is None:
+            return {'Content-type': body.content_type,
+                    'Transfer-Encoding': 'chunked'}
         return {
-            'Content-type': 'multipart/form-data; boundary=boundary',
-            'Content-Length': len(self.prepared_body),
+            'Content-type': body.content_type,
+            'Content-Length': body.length,
         }
 
     @staticmethod
-    def generate_multipart(file_stream):
-        boundary = b'boundary'
-        part_boundary = b'--' + boundary
-
-        parts = [
-            part_boundary,
-            b'Content-Disposition: form-data; name="file"; filename="file"'
-            b'\r\n',
-            file_stream.read(),
-            b'--' + boundary + b'--',
-            b'',
-        ]
-        return b'\r\n'.join(parts)
+    def generate_multipart(file_stream, boundary=None):
+        """Returns the whole multipart body of a file as bytes.
+
+        :param file_stream: file object
+        :param boundary: boundary bytes, random by default
+        """
+        return MultipartBody(file_stream, boundary=boundary).read()
 
     @property
     def prepared_body(self):
-        if self._prepared_body:
-            return self._prepared_body
-
-        self._prepared_body = self.generate_multipart(self._payload)
+        if self._prepared_body is None:
+            self._prepared_body = MultipartBody(self._payload)
         return self._prepared_body
 
 
+class UrllibTransport(Transport):
+    """Transport opening a new connection per request with urlopen.
+
+    urlopen has a single socket timeout, the longer of both is used. On
+    Python 2 it cannot send bodies of unknown length, e.g. generated on the
+    fly, those need `HTTPTransport`.
+    """
+
+    def open(self, request, base_url, auth_header, method, stream=False,
+             timeout=None):
+        body = getattr(request, 'prepared_body', None)
+        if six.PY2 and getattr(body, 'length', 0) is None:
+            # urllib2 insists on a Content-Length
+            raise ValueError(
+                'Bodies of unknown length cannot be sent with urllib on '
+                'Python 2, pass pool_size to use HTTPTransport')
+        prepared = request.prepare(
+            base_url=base_url,
+            auth_header=auth_header,
+            method=method)
+        try:
+            if timeout is not None and timeout.total is not None:
+                raw = urlopen(prepared, timeout=timeout.total)
+            else:
+                raw = urlopen(prepared)
+            if stream:
+                return StreamedResponse.from_raw(raw)
+            return Response.from_raw(raw)
+        except URLError:
+            raise
+        except (socket.error, http_client.HTTPException) as exc:
+            # urlopen leaves errors reading the response, e.g. timeouts,
+            # unwrapped
+            raise URLError(exc)
+
+
 class BaseAPI(object):
     #: Base API url
     BASE_URL = None
     #: Logger
     logger = logging.getLogger(__name__)
+    #: Credentials and the authorization header computed from them
+    _auth_header = (None, None)
 
-    def __init__(self, username, password, debug=False):
+    def __init__(self, username, password, debug=False, pool_size=None,
+                 transport=None, cache=None, coalesce=False,
+                 rate_limiter=None, retry_policy=None, circuit_breaker=None,
+                 timeout=None, hedge_policy=None):
         """API base.
 
         :param username: API username
         :param password: API password
         :param debug: enable debug logger
+        :param pool_size: reuse up to that many keep-alive connections per
+        host instead of opening a new connection for every request
+        :param transport: `Transport` instance sending the requests, takes
+        precedence over `pool_size`
+        :param cache: `Cache` instance GET responses are kept in, PUT, POST
+        and DELETE requests drop responses of the paths they change
+        :param coalesce: make concurrent identical GET requests wait for the
+        one in flight and share its response, counted in `single_flight`
+        :param rate_limiter: `RateLimiter` requests wait for before being
+        sent, it is told about 429 responses and resends those requests
+        :param retry_policy: `RetryPolicy` deciding which failed requests
+        are sent again
+        :param circuit_breaker: `CircuitBreaker` failing requests fast
+        while the API is failing
+        :param timeout: timeout of every request in seconds, or a (connect,
+        read) pair
+        :param hedge_policy: `HedgePolicy` sending a duplicate of slow GET
+        requests
         """
         self.username = username
         self.password = password
+        self.cache = cache
+        self.single_flight = SingleFlight() if coalesce else None
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.circuit_breaker = circuit_breaker
+        self.timeout = Timeout.coerce(timeout)
+        self.hedge_policy = hedge_policy
+        self._loaders = {}
+        self._loaders_lock = threading.Lock()
+        if transport is None:
+            if pool_size:
+                transport = HTTPTransport(pool_size=pool_size)
+            else:
+                transport = UrllibTransport()
+        self.transport = transport
+        # per-thread options of the calls being made
+        self._context = threading.local()
         if debug:
             self._add_stderr_logger()
 
@@ -155,6 +310,283 @@ class BaseAPI(object):
         logger.setLevel(level)
         logger.debug('Enabled stderr debug logging at %s', __name__)
 
+    def close(self):
+        """Releases connections held by the transport."""
+        self.transport.close()
+
+    @contextlib.contextmanager
+    def streaming(self):
+        """Makes calls within the block return a `StreamedResponse`.
+
+        The body stays on the connection until read, which allows
+        decoding large pages with `iter_items()` or saving binary data
+        without holding it in memory. Applies to the current thread only.
+
+            >>> with api.streaming():
+            ...     response = api.get_call_recording_mp3(id)
+            >>> with response:
+            ...     chunk = response.read(8192)
+        """
+        previous = getattr(self._context, 'stream', False)
+        self._context.stream = True
+        try:
+            yield
+        finally:
+            self._context.stream = previous
+
+    @contextlib.contextmanager
+    def with_headers(self, headers):
+        """Sends extra headers with calls made within the block.
+
+        Applies to the current thread only.
+
+            >>> with api.with_headers({'Range': 'bytes=1024-'}):
+            ...     response = api.get_call_recording_mp3(id)
+
+        :param headers: headers dictionary
+        """
+        previous = getattr(self._context, 'headers', None)
+        self._context.headers = dict(previous or {}, **headers)
+        try:
+            yield
+        finally:
+            self._context.headers = previous
+
+    @contextlib.contextmanager
+    def with_timeout(self, timeout):
+        """Overrides the client timeout for calls made within the block.
+
+        Applies to the current thread only.
+
+            >>> with api.with_timeout((3.05, 30)):
+            ...     response = api.find_calls(query={'limit': 1000})
+
+        :param timeout: timeout in seconds, or a (connect, read) pair
+        """
+        previous = getattr(self._context, 'timeout', None)
+        self._context.timeout = Timeout.coerce(timeout)
+        try:
+            yield
+        finally:
+            self._context.timeout = previous
+
+    @staticmethod
+    def deadline(seconds):
+        """Returns a `Deadline` for the calls made within its block.
+
+        Every request gets its timeouts shortened to the time left and
+        fails with `DeadlineExceeded` once it has passed, including the
+        requests `batch`, `map`, `paginate` and `scan` make from other
+        threads.
+
+            >>> with api.deadline(30):
+            ...     calls = list(api.iter_calls(prefetch=8))
+
+        :param seconds: seconds from now
+        """
+        return Deadline(seconds)
+
+    def batch(self, calls, concurrency=8, ordered=True, deadline=None):
+        """Runs API calls concurrently on a bounded thread pool.
+
+        A `CallFireError` raised by a call is captured in its result and
+        does not abort the rest of the batch.
+
+        :param calls: iterable of (method, args) or (method, args, kwargs),
+        method is either a bound API method or its name
+        :param concurrency: maximum number of calls in flight
+        :param ordered: yield results in input order instead of as they
+        complete
+        :param deadline: seconds or `Deadline` the whole batch is due in,
+        defaults to the deadline the batch is started within
+        :returns iterator of `BatchResult`
+        """
+        calls = (
+            (getattr(self, call[0]) if isinstance(call[0], six.string_types)
+             else call[0],) + tuple(call[1:])
+            for call in calls
+        )
+        return BatchExecutor(concurrency, ordered, deadline=deadline).run(
+            calls)
+
+    def map(self, method, args, concurrency=8, ordered=True, deadline=None):
+        """Runs a single API method over many arguments concurrently.
+
+            >>> for result in api.map('get_call', call_ids):
+            ...     print(result.args, result.response.json())
+
+        :param method: bound API method or its name
+        :param args: iterable of argument tuples, anything else is passed as
+        the only argument
+        :param concurrency: maximum number of calls in flight
+        :param ordered: yield results in input order instead of as they
+        complete
+        :param deadline: seconds or `Deadline` the whole batch is due in
+        :returns iterator of `BatchResult`
+        """
+        calls = (
+            (method, arg if isinstance(arg, tuple) else (arg,))
+            for arg in args
+        )
+        return self.batch(calls, concurrency=concurrency, ordered=ordered,
+                          deadline=deadline)
+
+    def paginate(self, method, *args, **kwargs):
+        """Iterates over the items of a paged endpoint.
+
+            >>> for call in api.paginate('find_calls', query={'label': 'x'}):
+            ...     print(call['id'])
+
+        :param method: bound API method or its name
+        :param args: positional args of the method, e.g. resource id
+        :param kwargs: `query` and `Paginator` options
+        :returns `Paginator`
+        """
+        if isinstance(method, six.string_types):
+            method = getattr(self, method)
+        return Paginator(method, args, **kwargs)
+
+    def scan(self, method, begin, end, **kwargs):
+        """Scans a time range of `find_calls`/`find_texts` in sub-windows.
+
+            >>> for text in api.scan('find_texts', begin, end, concurrency=8):
+            ...     export(text)
+
+        :param method: bound API method or its name
+        :param begin: scan start in Unix time milliseconds, inclusive
+        :param end: scan end in Unix time milliseconds, exclusive
+        :param kwargs: `query` and `WindowScanner` options
+        :returns `WindowScanner`
+        """
+        if isinstance(method, six.string_types):
+            method = getattr(self, method)
+        return WindowScanner(method, begin, end, **kwargs)
+
+    def download(self, method, *args, **kwargs):
+        """Streams a binary endpoint, e.g. a recording, without buffering it.
+
+        The body is copied through a fixed-size buffer. Downloads saved to
+        `dest` reuse a buffer kept per thread, chunk iterators get their own.
+
+            >>> api.download('get_call_recording_mp3', id, dest='call.mp3')
+
+        :param method: bound API method or its name
+        :param args: positional args of the method
+        :param dest: file path or binary file object to save the body to,
+        without it an iterator of memoryview chunks valid until the next
+        chunk is read is returned
+        :param buffer_size: size of the default buffer
+        :param buffer: `bytearray` to read into instead of the default one
+        :returns number of bytes saved, or the chunk iterator
+        """
+        if isinstance(method, six.string_types):
+            method = getattr(self, method)
+        dest = kwargs.pop('dest', None)
+        buffer_size = kwargs.pop('buffer_size', 64 * 1024)
+        buffer = kwargs.pop('buffer', None)
+
+        with self.streaming():
+            response = method(*args, **kwargs)
+        if dest is None:
+            return iter_chunks(response, buffer or bytearray(buffer_size))
+
+        if buffer is None:
+            buffer = getattr(self._context, 'buffer', None)
+            if buffer is None or len(buffer) != buffer_size:
+                buffer = self._context.buffer = bytearray(buffer_size)
+        return save(response, dest, buffer)
+
+    def loader(self, method, **kwargs):
+        """Returns the `BatchLoader` of a `find_*` method.
+
+        Loaders are kept per method name, so lookups made through the same
+        loader from different threads end up in the same batches. Options
+        only apply when the loader is created.
+
+            >>> api.loader('find_calls').get(call_id)
+
+        :param method: `find_calls`, `find_texts`, `find_contacts` or any
+        other `find_*` method filtering by an `id` list, bound or its name
+        :param kwargs: `BatchLoader` options
+        :returns `BatchLoader`
+        """
+        if not isinstance(method, six.string_types):
+            method = method.__name__
+        with self._loaders_lock:
+            loader = self._loaders.get(method)
+            if loader is None:
+                loader = self._loaders[method] = BatchLoader(
+                    getattr(self, method), **kwargs)
+            return loader
+
+    def bulk(self, method, items, *args, **kwargs):
+        """Sends a stream of items in chunks over concurrent requests.
+
+            >>> recipients = ({'phoneNumber': n} for n in numbers)
+            >>> for result in api.bulk('send_texts', recipients):
+            ...     print(result.ok, len(result.created()))
+
+        :param method: `send_texts`, `send_calls` or any other method taking
+        an array `body`, bound or its name
+        :param items: iterable of items
+        :param args: positional args of the method, e.g. resource id
+        :param kwargs: `query` and `BulkSender` options
+        :returns `BulkSender`
+        """
+        if isinstance(method, six.string_types):
+            method = getattr(self, method)
+        return BulkSender(method, items, args, **kwargs)
+
+    def load_recipients(self, method, id, recipients, **kwargs):
+        """Uploads recipients to a broadcast or contact list in batches.
+
+            >>> loader = api.load_recipients(
+            ...     'add_call_broadcast_recipients', broadcast_id,
+            ...     read_csv('recipients.csv'), checkpoint='load.json')
+            >>> results = list(loader)
+
+        :param method: `add_call_broadcast_recipients`,
+        `add_text_broadcast_recipients`, `add_call_broadcast_batch` or
+        `add_contact_list_items`, bound or its name
+        :param id: id of the broadcast or contact list
+        :param recipients: iterable of recipients
+        :param kwargs: `RecipientLoader` options
+        :returns `RecipientLoader`
+        """
+        if isinstance(method, six.string_types):
+            method = getattr(self, method)
+        return RecipientLoader(method, id, recipients, **kwargs)
+
+    def upload_contact_list(self, rows, fieldnames=None, **kwargs):
+        """Creates a contact list from rows encoded to CSV on the fly.
+
+        The CSV is streamed as it is encoded, so memory use does not grow
+        with the number of rows. Contacts can also be created in chunks of
+        JSON with `bulk('create_contacts', contacts)`.
+
+            >>> rows = ({'firstName': f, 'homePhone': p} for f, p in cursor)
+            >>> api.upload_contact_list(rows).json()
+
+        :param rows: iterable of dictionaries or sequences
+        :param fieldnames: header row, defaults to the keys of the first row
+        :param kwargs: `CSVStream` options
+        """
+        return self.create_contact_list_from_file(
+            payload=CSVStream(rows, fieldnames, **kwargs))
+
+    def archive_recordings(self, broadcast_id, directory, **kwargs):
+        """Downloads every recording of a call broadcast into a directory.
+
+            >>> for result in api.archive_recordings(id, 'archive/'):
+            ...     print(result.status, result.path)
+
+        :param broadcast_id: id of the call broadcast
+        :param directory: directory the recordings are saved to
+        :param kwargs: `RecordingArchiver` options
+        :returns `RecordingArchiver`
+        """
+        return RecordingArchiver(self, broadcast_id, directory, **kwargs)
+
     def _post(self, request):
         """Sends a single POST request.
 
@@ -188,41 +620,206 @@ class BaseAPI(object):
 
         :returns auth header
         """
-        return 'Basic {}'.format(base64.b64encode(
-            '{}:{}'.format(self.username, self.password).encode()
-        ).strip().decode())
+        credentials = (self.username, self.password)
+        if self._auth_header[0] != credentials:
+            self._auth_header = (credentials, 'Basic {}'.format(
+                base64.b64encode(
+                    '{}:{}'.format(self.username, self.password).encode()
+                ).strip().decode()))
+        return self._auth_header[1]
 
     def _open_request(self, request, method):
-        """Sends a single API request.
+        """Sends a single API request, going through the cache if any.
 
-        :param path: request path
-        :param query: request query
-        :param body: request body
+        GET requests without extra headers are looked up in the cache and,
+        with coalescing on, share the response of an identical request
+        already in flight; with a hedge policy slow ones are sent twice.
+
+        :param request: request object
         :param method: request method
         """
-        prepared = request.prepare(
-            base_url=self.BASE_URL,
-            auth_header=self._get_auth_header(),
-            method=method)
-        try:
-            response = urlopen(prepared)
-            response.json = types.MethodType(
-                lambda r: json.loads(r.read().decode('utf-8')), response)
-            return response
-        except URLError as wrapped_exc:
-            wrapped_exp_body = 'None'
-            if hasattr(wrapped_exc, 'fp') and wrapped_exc.fp:
-                wrapped_exp_body = wrapped_exc.fp.read()
-
-            wrapped_exc_repr = '{}: {}'.format(wrapped_exc, wrapped_exp_body)
-
-            self.logger.debug(
-                "Error '%s' in context of method '%s %s' query '%s' body '%s' "
-                "response body: '%s'",
-                repr(wrapped_exc), method, request.path,
-                request.query, request.body, wrapped_exc_repr)
-
-            _, _, traceback = sys.exc_info()
-            exception_wrapper = CallFireError(wrapped_exc, wrapped_exc_repr)
-
-            six.reraise(CallFireError, exception_wrapper, traceback)
+        cache = self.cache
+        if method != 'GET':
+            if cache is None:
+                return self._send(request, method)
+            try:
+                return self._send(request, method)
+            finally:
+                cache.invalidate(request.path)
+
+        if (getattr(self._context, 'stream', False) or
+                getattr(self._context, 'headers', None)):
+            return self._send(request, method)
+
+        send = self._send
+        hedge = self.hedge_policy
+        if hedge is not None and hedge.applies(request.path):
+            send = self._send_hedged
+        if cache is None and self.single_flight is None:
+            return send(request, method)
+
+        key = cache_key(self.username, method, request.path, request.query)
+        ttl = cache.ttl_for(request.path) if cache is not None else 0
+        if ttl:
+            response = cache.get(key)
+            if response is not None:
+                return response
+
+        if self.single_flight is None:
+            response = send(request, method)
+        else:
+            response, shared = self.single_flight.do(
+                key, lambda: send(request, method))
+            if shared:
+                return response.copy()
+        if ttl:
+            cache.set(key, request.path, response, ttl)
+        return response
+
+    def _send_hedged(self, request, method):
+        """Sends a GET request through the hedge policy.
+
+        The attempts run on other threads, so they are given the timeout
+        and deadline of the calling one.
+
+        :param request: request object
+        :param method: request method
+        """
+        timeout = getattr(self._context, 'timeout', None)
+        deadline = Deadline.current()
+
+        def send():
+            self._context.timeout = timeout
+            return call_within(deadline, self._send, request, method)
+
+        return self.hedge_policy.run(send)
+
+    def _send(self, request, method):
+        """Sends a single API request over the transport.
+
+        :param request: request object
+        :param method: request method
+        """
+        stream = getattr(self._context, 'stream', False)
+        headers = getattr(self._context, 'headers', None)
+        if headers:
+            request.extra_headers = headers
+        timeout = getattr(self._context, 'timeout', None) or self.timeout
+        deadline = Deadline.current()
+        limiter, policy = self.rate_limiter, self.retry_policy
+        breaker = self.circuit_breaker
+        if policy is not None:
+            policy.budget.deposit()
+        attempts = throttled = 0
+        while True:
+            if breaker is not None:
+                breaker.before_request()
+            try:
+                if limiter is not None:
+                    max_wait = deadline.check() if deadline else None
+                    if not limiter.acquire(request.path, max_wait):
+                        raise DeadlineExceeded(
+                            'Deadline too close to wait for the rate limit')
+                kwargs = {}
+                if deadline is not None:
+                    kwargs['timeout'] = (timeout or Timeout(None, None)).cap(
+                        deadline.check())
+                elif timeout is not None:
+                    kwargs['timeout'] = timeout
+                started = time.time()
+                attempts += 1
+                response = self.transport.open(
+                    request, self.BASE_URL, self._get_auth_header(), method,
+                    stream=stream, **kwargs)
+            except URLError as wrapped_exc:
+                if breaker is not None:
+                    breaker.record(time.time() - started, wrapped_exc)
+                throttled_now = limiter is not None and getattr(
+                    wrapped_exc, 'code', None) == 429
+                if throttled_now:
+                    # the limiter pauses the group, nothing else to wait for
+                    limiter.rate_limited(request.path, parse_retry_after(
+                        wrapped_exc.info().get('Retry-After')))
+                max_delay = None
+                if deadline is not None:
+                    max_delay = deadline.remaining()
+                    if limiter is not None:
+                        # e.g. the pause after a 429
+                        max_delay -= limiter.wait_time(request.path)
+                body = getattr(request, 'prepared_body', None)
+                if not getattr(body, 'rewindable', True):
+                    # a body generated on the fly is gone once sent
+                    self._reraise(wrapped_exc, request, method)
+                if max_delay is not None and max_delay <= 0:
+                    # no time left for another attempt
+                    self._reraise(wrapped_exc, request, method)
+
+                delay = None
+                if throttled_now:
+                    if throttled < limiter.retries:
+                        # not an attempt as far as the retry policy goes
+                        throttled, attempts, delay = (
+                            throttled + 1, attempts - 1, 0)
+                elif policy is not None:
+                    # checked last, so hooks and the budget only see the
+                    # retries actually sent
+                    delay = policy.retry_delay(
+                        request, method, wrapped_exc, attempts, max_delay)
+                if delay is None:
+                    self._reraise(wrapped_exc, request, method)
+
+                if hasattr(body, 'rewind'):
+                    body.rewind()
+                if delay:
+                    time.sleep(delay)
+                continue
+            except Exception:
+                if breaker is not None:
+                    breaker.release()
+                raise
+            if breaker is not None:
+                breaker.record(time.time() - started)
+            if limiter is not None:
+                limiter.succeeded(request.path)
+            return self._track(response, request, started)
+
+    @staticmethod
+    def _track(response, request, started):
+        """Records timing and request size on a response.
+
+        :param response: `Response` or `StreamedResponse`
+        :param request: request object
+        :param started: time the request was started at
+        """
+        response.elapsed = time.time() - started
+        body = getattr(request, 'prepared_body', None)
+        if getattr(body, 'length', 0) is None:
+            # generated on the fly, its size is only known once sent
+            response.bytes_sent = body.bytes_read
+        else:
+            response.bytes_sent = len(body) if body else 0
+        return response
+
+    def _reraise(self, wrapped_exc, request, method):
+        """Re-raises the exception being handled as `CallFireError`.
+
+        :param wrapped_exc: original exception
+        :param request: request object
+        :param method: request method
+        """
+        wrapped_exp_body = 'None'
+        if hasattr(wrapped_exc, 'fp') and wrapped_exc.fp:
+            wrapped_exp_body = wrapped_exc.fp.read()
+
+        wrapped_exc_repr = '{}: {}'.format(wrapped_exc, wrapped_exp_body)
+
+        self.logger.debug(
+            "Error '%s' in context of method '%s %s' query '%s' body '%s' "
+            "response body: '%s'",
+            repr(wrapped_exc), method, request.path,
+            request.query, request.body, wrapped_exc_repr)
+
+        _, _, traceback = sys.exc_info()
+        exception_wrapper = CallFireError(wrapped_exc, wrapped_exc_repr)
+
+        six.reraise(CallFireError, exception_wrapper, traceback)
@@ -0,0 +1,84 @@
+import collections
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .exceptions import CallFireError
+from .timeout import Deadline, call_within
+
+
+class BatchResult(collections.namedtuple(
+        'BatchResult', 'index method args kwargs response error')):
+    """Outcome of a single call in a batch."""
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def result(self):
+        """Returns the response or raises the captured error."""
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+
+class BatchExecutor(object):
+    """Runs calls on a bounded thread pool."""
+
+    def __init__(self, concurrency=8, ordered=True, deadline=None):
+        """Batch executor.
+
+        :param concurrency: maximum number of calls in flight
+        :param ordered: yield results in input order instead of as they
+        complete
+        :param deadline: seconds or `Deadline` the whole batch is due in,
+        calls left once it has passed fail with `DeadlineExceeded`
+        """
+        self.concurrency = concurrency
+        self.ordered = ordered
+        self.deadline = Deadline.coerce(deadline)
+
+    @staticmethod
+    def _call(index, method, args=(), kwargs=None):
+        """Invokes a single call capturing `CallFireError`."""
+        kwargs = kwargs or {}
+        try:
+            response, error = method(*args, **kwargs), None
+        except CallFireError as exc:
+            response, error = None, exc
+        return BatchResult(index, method, args, kwargs, response, error)
+
+    def run(self, calls):
+        """Runs calls, never submitting more than `concurrency` at once.
+
+        The input is consumed lazily, so it can be a generator of any size.
+
+        :param calls: iterable of (method, args) or (method, args, kwargs)
+        :returns iterator of `BatchResult`
+        """
+        # worker threads do not see the deadline of the calling one
+        deadline = self.deadline or Deadline.current()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            pending = collections.deque()
+            for index, call in enumerate(calls):
+                if len(pending) >= self.concurrency:
+                    for result in self._drain(pending):
+                        yield result
+                pending.append(executor.submit(
+                    call_within, deadline, self._call, index, *call))
+
+            while pending:
+                for result in self._drain(pending):
+                    yield result
+
+    def _drain(self, pending):
+        """Waits for in-flight calls to free at least one slot.
+
+        :param pending: deque of futures in submission order
+        :returns list of finished results
+        """
+        if self.ordered:
+            return [pending.popleft().result()]
+
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.remove(future)
+        return [future.result() for future in done]
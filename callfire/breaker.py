@@ -0,0 +1,174 @@
+import collections
+import threading
+
+from .exceptions import CircuitOpenError
+from .ratelimit import _clock
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half-open'
+
+
+class CircuitBreaker(object):
+    """Fails requests fast while the API keeps failing.
+
+    Outcomes are counted over the last `window` seconds. Once at least
+    `minimum_requests` were made and the share of failures, connection
+    errors and 5xx responses, reaches `failure_threshold`, or the share of
+    calls slower than `slow_call_duration` reaches `slow_call_threshold`,
+    the circuit opens and requests raise `CircuitOpenError` without being
+    sent. After `reset_timeout` seconds it goes half-open and lets
+    `half_open_probes` requests through: if they all succeed the circuit
+    closes, a single failure opens it again.
+
+        >>> breaker = CircuitBreaker(failure_threshold=0.5, reset_timeout=30)
+        >>> api = CallFireAPI(username, password, circuit_breaker=breaker)
+        >>> breaker.state, breaker.failure_rate, breaker.rejected
+    """
+
+    def __init__(self, failure_threshold=0.5, minimum_requests=20,
+                 window=10, slow_call_duration=None, slow_call_threshold=0.5,
+                 reset_timeout=30.0, half_open_probes=1):
+        """Circuit breaker.
+
+        :param failure_threshold: share of failed requests opening the
+        circuit
+        :param minimum_requests: number of requests in the window before
+        the circuit can open
+        :param window: seconds outcomes are counted over
+        :param slow_call_duration: seconds a request may take before it
+        counts as slow, slow requests are not tracked by default
+        :param slow_call_threshold: share of slow requests opening the
+        circuit
+        :param reset_timeout: seconds the circuit stays open
+        :param half_open_probes: requests let through when half-open
+        """
+        self.failure_threshold = failure_threshold
+        self.minimum_requests = minimum_requests
+        self.window = int(window)
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_threshold = slow_call_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self.state = CLOSED
+        self.opened = 0
+        self.rejected = 0
+        self.opened_at = None
+        # [second, requests, failures, slow calls]
+        self._buckets = collections.deque()
+        self._probes = 0
+        self._probes_passed = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_failure(error):
+        """Tells whether an error says the API is unhealthy.
+
+        :param error: `HTTPError` or `URLError` raised by the transport,
+        None for a successful request
+        """
+        if error is None:
+            return False
+        code = getattr(error, 'code', None)
+        return code is None or code >= 500
+
+    def _counts(self, now):
+        """Returns (requests, failures, slow calls) in the window."""
+        while self._buckets and self._buckets[0][0] <= now - self.window:
+            self._buckets.popleft()
+        requests = failures = slow = 0
+        for _, bucket_requests, bucket_failures, bucket_slow in self._buckets:
+            requests += bucket_requests
+            failures += bucket_failures
+            slow += bucket_slow
+        return requests, failures, slow
+
+    @property
+    def failure_rate(self):
+        """Share of failed requests in the window."""
+        with self._lock:
+            requests, failures, _ = self._counts(_clock())
+        return float(failures) / requests if requests else 0.0
+
+    @property
+    def slow_call_rate(self):
+        """Share of slow requests in the window."""
+        with self._lock:
+            requests, _, slow = self._counts(_clock())
+        return float(slow) / requests if requests else 0.0
+
+    def _open(self, now):
+        self.state = OPEN
+        self.opened_at = now
+        self.opened += 1
+        self._buckets.clear()
+
+    def before_request(self):
+        """Lets a request through or raises `CircuitOpenError`."""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            now = _clock()
+            if self.state == OPEN:
+                retry_in = self.opened_at + self.reset_timeout - now
+                if retry_in > 0:
+                    self.rejected += 1
+                    raise CircuitOpenError(
+                        retry_in, 'Circuit open, retry in {:.1f}s'.format(
+                            retry_in))
+                self.state = HALF_OPEN
+                self._probes = self._probes_passed = 0
+            if self._probes >= self.half_open_probes:
+                self.rejected += 1
+                raise CircuitOpenError(
+                    0, 'Circuit half-open, waiting for probes')
+            self._probes += 1
+
+    def release(self):
+        """Gives back the probe of a request that was never answered.
+
+        Requests aborted before or while being sent, e.g. past their
+        deadline, say nothing about the API, but would keep a half-open
+        circuit waiting for their probe forever.
+        """
+        with self._lock:
+            if self.state == HALF_OPEN and self._probes:
+                self._probes -= 1
+
+    def record(self, elapsed, error=None):
+        """Records the outcome of a request let through.
+
+        :param elapsed: seconds the request took
+        :param error: error raised by the transport, if any
+        """
+        failed = self.is_failure(error)
+        slow = (self.slow_call_duration is not None and
+                elapsed >= self.slow_call_duration)
+        with self._lock:
+            now = _clock()
+            if self.state == HALF_OPEN:
+                if failed or slow:
+                    self._open(now)
+                    return
+                self._probes_passed += 1
+                if self._probes_passed >= self.half_open_probes:
+                    self.state = CLOSED
+                return
+            if self.state == OPEN:
+                # answered after the circuit opened
+                return
+
+            second = int(now)
+            if not self._buckets or self._buckets[-1][0] != second:
+                self._buckets.append([second, 0, 0, 0])
+            bucket = self._buckets[-1]
+            bucket[1] += 1
+            bucket[2] += failed
+            bucket[3] += slow
+
+            requests, failures, slow_calls = self._counts(now)
+            if requests < self.minimum_requests:
+                return
+            if (float(failures) / requests >= self.failure_threshold or
+                    (self.slow_call_duration is not None and
+                     float(slow_calls) / requests >=
+                     self.slow_call_threshold)):
+                self._open(now)
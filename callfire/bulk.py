@@ -0,0 +1,174 @@
+import collections
+import itertools
+import threading
+
+from .batch import BatchExecutor
+from .exceptions import CallFireError
+from .timeout import Deadline
+
+
+def chunked(items, size):
+    """Splits an iterable into lists of up to `size` items.
+
+    :param items: iterable of any size
+    :param size: chunk size
+    """
+    items = iter(items)
+    while True:
+        chunk = list(itertools.islice(items, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+class BulkResult(collections.namedtuple(
+        'BulkResult', 'index offset items response error attempts')):
+    """Outcome of sending a single chunk.
+
+    `offset` is the position of the first item of the chunk in the input
+    and `attempts` the number of times the chunk was sent.
+    """
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def created(self):
+        """Returns the resources created for the chunk, e.g. texts or calls.
+        """
+        if self.response is None:
+            return []
+        return self.response.json().get('items') or []
+
+
+class BulkSender(object):
+    """Sends a stream of items in chunks over concurrent POST requests.
+
+    The input is consumed lazily, so recipients can come from a generator
+    of any size, and at most `concurrency` chunks are in flight. Requests
+    go through the rate limiter and retry policy of the API like any
+    other. A chunk failing with one of `retry_statuses`, refused by the
+    server without being processed, is put aside and sent again once the
+    input is exhausted, so it does not hold back the others; any other
+    failure is reported right away as sending it twice could duplicate
+    texts or calls.
+
+        >>> sender = BulkSender(api.send_texts, recipients, chunk_size=500)
+        >>> for result in sender:
+        ...     if not result.ok:
+        ...         print(result.offset, len(result.items), result.error)
+        >>> sender.items_sent, sender.chunks_failed
+    """
+
+    def __init__(self, method, items, args=(), query=None, chunk_size=500,
+                 concurrency=4, ordered=False, retries=2,
+                 retry_statuses=(429, 503), deadline=None):
+        """Bulk sender.
+
+        :param method: bound API method taking the chunk as `body`
+        :param items: iterable of items, e.g. `TextRecipient` dictionaries
+        :param args: positional args of the method, e.g. resource id
+        :param query: query params sent with every chunk
+        :param chunk_size: maximum number of items per request
+        :param concurrency: maximum number of requests in flight, best kept
+        within the connection pool size
+        :param ordered: yield results in input order instead of as they
+        complete, retried chunks always come last
+        :param retries: number of times a refused chunk is sent again
+        :param retry_statuses: HTTP statuses meaning a chunk was not
+        processed and is safe to send again
+        :param deadline: seconds or `Deadline` sending is due in
+        """
+        self.method = method
+        self.items = items
+        self.args = tuple(args)
+        self.query = query
+        self.chunk_size = chunk_size
+        self.concurrency = concurrency
+        self.ordered = ordered
+        self.retries = retries
+        self.retry_statuses = frozenset(retry_statuses)
+        self.deadline = Deadline.coerce(deadline)
+        self.chunks_sent = 0
+        self.chunks_retried = 0
+        self.chunks_failed = 0
+        self.items_sent = 0
+        self._lock = threading.Lock()
+
+    def chunks(self):
+        """Splits the input into chunks.
+
+        :returns iterator of (index, offset, items)
+        """
+        for index, chunk in enumerate(chunked(self.items, self.chunk_size)):
+            yield index, index * self.chunk_size, chunk
+
+    def body(self, index, items):
+        """Returns the request body of a chunk, the list of its items.
+
+        :param index: chunk number
+        :param items: list of items
+        """
+        return items
+
+    def send(self, index, offset, items, attempt=1):
+        """Sends a single chunk.
+
+        :param index: chunk number
+        :param offset: position of the first item in the input
+        :param items: list of items
+        :param attempt: number of the attempt
+        :returns `BulkResult`
+        """
+        kwargs = {'body': self.body(index, items)}
+        if self.query is not None:
+            kwargs['query'] = self.query
+        try:
+            response, error = self.method(*self.args, **kwargs), None
+        except CallFireError as exc:
+            response, error = None, exc
+        return BulkResult(index, offset, items, response, error, attempt)
+
+    def is_retryable(self, result):
+        """Tells whether a failed chunk can be sent again.
+
+        :param result: `BulkResult`
+        """
+        code = getattr(result.error.wrapped_exc, 'code', None)
+        return (result.attempts <= self.retries and
+                code in self.retry_statuses)
+
+    def _record(self, result):
+        with self._lock:
+            if result.ok:
+                self.chunks_sent += 1
+                self.items_sent += len(result.items)
+            else:
+                self.chunks_failed += 1
+
+    def _run(self, calls, deadline):
+        executor = BatchExecutor(self.concurrency, self.ordered,
+                                 deadline=deadline)
+        for outcome in executor.run(calls):
+            yield outcome.result()
+
+    def __iter__(self):
+        # a single deadline covers the retries too
+        deadline = self.deadline or Deadline.current()
+        chunks = ((self.send, chunk) for chunk in self.chunks())
+        while chunks is not None:
+            refused = []
+            for result in self._run(chunks, deadline):
+                if not result.ok and self.is_retryable(result):
+                    refused.append(result)
+                    continue
+                self._record(result)
+                yield result
+
+            with self._lock:
+                self.chunks_retried += len(refused)
+            chunks = [
+                (self.send, (result.index, result.offset, result.items,
+                             result.attempts + 1))
+                for result in refused
+            ] or None
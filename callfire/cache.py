@@ -0,0 +1,323 @@
+import abc
+import collections
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import six
+
+from .response import Response
+
+
+def cache_key(namespace, method, path, query=None):
+    """Returns the cache key of a request.
+
+    :param namespace: keeps apart entries of different accounts, e.g. the
+    API username
+    :param method: request method
+    :param path: request path
+    :param query: query params
+    """
+    key = '{} {} {}'.format(namespace, method, path)
+    if query:
+        key += '?' + json.dumps(query, sort_keys=True, default=str)
+    return key
+
+
+def is_affected(path, changed_path):
+    """Tells whether a change to `changed_path` makes `path` stale.
+
+    That is the changed resource itself, anything below it, e.g. its items
+    or `.mp3` data, and the collections above it.
+
+    :param path: path of a cached response
+    :param changed_path: path of a PUT, POST or DELETE request
+    """
+    if path == changed_path or changed_path.startswith(path + '/'):
+        return True
+    return path.startswith(changed_path + '/') or path.startswith(
+        changed_path + '.')
+
+
+@six.add_metaclass(abc.ABCMeta)
+class Cache(object):
+    """Cache of GET responses.
+
+    The time to live is looked up per path, the longest matching prefix in
+    `ttls` wins over the default `ttl`; paths with a zero ttl are not
+    cached at all. `hits`, `misses`, `evictions` and `invalidations` count
+    what the cache did.
+    """
+
+    def __init__(self, ttl=60, ttls=None):
+        """Cache.
+
+        :param ttl: seconds responses are kept for by default
+        :param ttls: dictionary of path prefix to ttl, e.g.
+        `{'/me/account': 3600, '/calls/broadcasts': 0}`
+        """
+        self.ttl = ttl
+        # longest prefixes first
+        self.ttls = sorted(
+            (ttls or {}).items(), key=lambda item: len(item[0]), reverse=True)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def ttl_for(self, path):
+        """Returns the number of seconds responses of a path are kept for.
+
+        :param path: request path
+        """
+        for prefix, ttl in self.ttls:
+            if path == prefix or path.startswith(prefix.rstrip('/') + '/'):
+                return ttl
+        return self.ttl
+
+    @abc.abstractmethod
+    def get(self, key):
+        """Returns a fresh `Response` for a key or None if not cached.
+
+        :param key: cache key
+        """
+
+    @abc.abstractmethod
+    def set(self, key, path, response, ttl):
+        """Stores a response.
+
+        :param key: cache key
+        :param path: request path, used for invalidation
+        :param response: `Response` read to the end
+        :param ttl: seconds to keep the response for
+        """
+
+    @abc.abstractmethod
+    def invalidate(self, path):
+        """Drops responses made stale by a change to a path.
+
+        :param path: path of a PUT, POST or DELETE request
+        """
+
+    @abc.abstractmethod
+    def clear(self):
+        """Drops all responses."""
+
+    def close(self):
+        """Releases any resources held by the cache."""
+
+
+_Entry = collections.namedtuple(
+    '_Entry', 'expires path url status reason headers body')
+
+
+class MemoryCache(Cache):
+    """Thread-safe in-process LRU cache.
+
+    Hits are new `Response` objects sharing the cached body bytes, so they
+    can be read and parsed independently.
+    """
+
+    def __init__(self, maxsize=1024, ttl=60, ttls=None):
+        """Memory cache.
+
+        :param maxsize: maximum number of responses kept, the least recently
+        used ones are evicted first
+        :param ttl: seconds responses are kept for by default
+        :param ttls: dictionary of path prefix to ttl
+        """
+        super(MemoryCache, self).__init__(ttl=ttl, ttls=ttls)
+        self.maxsize = maxsize
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires <= time.time():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            # move to the most recently used end
+            del self._entries[key]
+            self._entries[key] = entry
+        return Response(entry.url, entry.status, entry.reason,
+                        entry.headers, entry.body)
+
+    def set(self, key, path, response, ttl):
+        entry = _Entry(time.time() + ttl, path, response.url,
+                       response.status, response.reason, response.headers,
+                       response.body)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = entry
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, path):
+        with self._lock:
+            stale = [key for key, entry in self._entries.items()
+                     if is_affected(entry.path, path)]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteCache(Cache):
+    """Cache in an SQLite database shared by threads and processes.
+
+    The database runs in WAL mode, so readers do not block the writer and
+    any number of workers can share one file; entries survive restarts.
+    Every thread and process opens its own connection. Once the bodies
+    take more than `max_bytes`, expired and then least recently used
+    responses are evicted. Hits have their headers restored as a plain
+    dictionary. Counters are kept per cache instance.
+    """
+
+    SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS responses ('
+        'key TEXT PRIMARY KEY, path TEXT NOT NULL, url TEXT, status INTEGER, '
+        'reason TEXT, headers TEXT, body BLOB, size INTEGER NOT NULL, '
+        'expires REAL NOT NULL, accessed REAL NOT NULL)',
+        'CREATE INDEX IF NOT EXISTS responses_path ON responses (path)',
+        'CREATE INDEX IF NOT EXISTS responses_accessed '
+        'ON responses (accessed)',
+    )
+
+    def __init__(self, path, max_bytes=64 * 1024 * 1024, ttl=60, ttls=None,
+                 timeout=30):
+        """SQLite cache.
+
+        :param path: database file, created if missing
+        :param max_bytes: maximum total size of the cached bodies
+        :param ttl: seconds responses are kept for by default
+        :param ttls: dictionary of path prefix to ttl
+        :param timeout: seconds to wait for a lock held by another writer
+        """
+        super(SQLiteCache, self).__init__(ttl=ttl, ttls=ttls)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        with self._connection() as conn:
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+
+    def _connection(self):
+        """Returns the connection of the current thread and process."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            # connections must not be carried over into a forked process
+            conn = sqlite3.connect(self.path, timeout=self.timeout)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _count(self, name, count=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + count)
+
+    def __len__(self):
+        return self._connection().execute(
+            'SELECT COUNT(*) FROM responses').fetchone()[0]
+
+    def get(self, key):
+        now = time.time()
+        conn = self._connection()
+        row = conn.execute(
+            'SELECT url, status, reason, headers, body, expires, accessed '
+            'FROM responses WHERE key = ?', (key,)).fetchone()
+        if row is None or row[5] <= now:
+            self._count('misses')
+            return None
+
+        self._count('hits')
+        if now - row[6] > 1:
+            # recency only needs to be roughly right, spare most writes
+            with conn:
+                conn.execute('UPDATE responses SET accessed = ? '
+                             'WHERE key = ?', (now, key))
+        url, status, reason, headers, body = row[:5]
+        return Response(url, status, reason, dict(json.loads(headers)),
+                        bytes(body))
+
+    def set(self, key, path, response, ttl):
+        now = time.time()
+        headers = response.headers
+        if hasattr(headers, 'items'):
+            headers = list(headers.items())
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO responses VALUES '
+                '(?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (key, path, response.url, response.status, response.reason,
+                 json.dumps(headers or []), sqlite3.Binary(response.body),
+                 len(response.body), now + ttl, now))
+            self._evict(conn, now)
+
+    def _evict(self, conn, now):
+        """Drops expired and least recently used entries over `max_bytes`.
+
+        :param conn: connection within a transaction
+        :param now: current time
+        """
+        total = conn.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = conn.execute(
+            'DELETE FROM responses WHERE expires <= ?', (now,)).rowcount
+        total = conn.execute(
+            'SELECT COALESCE(SUM(size), 0) FROM responses').fetchone()[0]
+        rows = conn.execute(
+            'SELECT key, size FROM responses ORDER BY accessed, rowid')
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        conn.executemany('DELETE FROM responses WHERE key = ?', stale)
+        self._count('evictions', evicted + len(stale))
+
+    def invalidate(self, path):
+        parts = path.split('/')
+        ancestors = ['/'.join(parts[:i]) for i in range(2, len(parts))]
+        conn = self._connection()
+        with conn:
+            invalidated = conn.execute(
+                'DELETE FROM responses WHERE path = ? '
+                'OR substr(path, 1, ?) IN (?, ?) '
+                'OR path IN ({})'.format(','.join('?' * len(ancestors))),
+                [path, len(path) + 1, path + '/', path + '.'] + ancestors
+            ).rowcount
+        self._count('invalidations', invalidated)
+
+    def clear(self):
+        conn = self._connection()
+        with conn:
+            conn.execute('DELETE FROM responses')
+
+    def close(self):
+        """Closes the connection of the current thread."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
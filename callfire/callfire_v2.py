@@ -44,6 +44,14 @@ class CallFireAPIVersion2(BaseAPI):
         """
         return self._get(JSONRequest('/calls', query=query))
 
+    def iter_calls(self, query=None, **kwargs):
+        """Iterate over find_calls items.
+
+        Fetches pages lazily and yields single items, see `find_calls` for the
+        query params and `Paginator` for the options.
+        """
+        return self.paginate(self.find_calls, query=query, **kwargs)
+
     def send_calls(self, query=None, body=None):
         """Send calls.
 
@@ -96,6 +104,15 @@ class CallFireAPIVersion2(BaseAPI):
         """
         return self._get(JSONRequest('/calls/broadcasts', query=query))
 
+    def iter_call_broadcasts(self, query=None, **kwargs):
+        """Iterate over find_call_broadcasts items.
+
+        Fetches pages lazily and yields single items, see
+        `find_call_broadcasts` for the query params and `Paginator` for the
+        options.
+        """
+        return self.paginate(self.find_call_broadcasts, query=query, **kwargs)
+
     def create_call_broadcast(self, query=None, body=None):
         """Create a call broadcast.
 
@@ -212,6 +229,16 @@ class CallFireAPIVersion2(BaseAPI):
                         query=query)
         )
 
+    def iter_call_broadcast_batches(self, id, query=None, **kwargs):
+        """Iterate over get_call_broadcast_batches items.
+
+        Fetches pages lazily and yields single items, see
+        `get_call_broadcast_batches` for the query params and `Paginator` for
+        the options.
+        """
+        return self.paginate(
+            self.get_call_broadcast_batches, id, query=query, **kwargs)
+
     def add_call_broadcast_batch(self, id, body=None):
         """Add batches to a call broadcast.
 
@@ -255,6 +282,16 @@ class CallFireAPIVersion2(BaseAPI):
                         query=query)
         )
 
+    def iter_call_broadcast_calls(self, id, query=None, **kwargs):
+        """Iterate over get_call_broadcast_calls items.
+
+        Fetches pages lazily and yields single items, see
+        `get_call_broadcast_calls` for the query params and `Paginator` for the
+        options.
+        """
+        return self.paginate(
+            self.get_call_broadcast_calls, id, query=query, **kwargs)
+
     def add_call_broadcast_recipients(self, id, query=None, body=None):
         """Add recipients to a call broadcast.
 
@@ -342,6 +379,15 @@ class CallFireAPIVersion2(BaseAPI):
             JSONRequest('/calls/recordings/{id}.mp3'.format(id=id))
         )
 
+    def download_call_recording_mp3(self, id, dest=None, **kwargs):
+        """Stream get_call_recording_mp3 data.
+
+        Saves the body to `dest`, a file path or file object, or returns an
+        iterator of chunks without it, see `download` for the options.
+        """
+        return self.download(
+            self.get_call_recording_mp3, id, dest=dest, **kwargs)
+
     def get_call(self, id, query=None):
         """Find a specific call.
 
@@ -399,6 +445,17 @@ class CallFireAPIVersion2(BaseAPI):
                         .format(id=id, name=name))
         )
 
+    def download_call_recording_mp3_by_name(self, id, name, dest=None,
+                                            **kwargs):
+        """Stream get_call_recording_mp3_by_name data.
+
+        Saves the body to `dest`, a file path or file object, or returns an
+        iterator of chunks without it, see `download` for the options.
+        """
+        return self.download(
+            self.get_call_recording_mp3_by_name, id, name, dest=dest,
+            **kwargs)
+
     def get_campaign_batch(self, id, query=None):
         """Find a specific batch.
 
@@ -451,6 +508,15 @@ class CallFireAPIVersion2(BaseAPI):
         """
         return self._get(JSONRequest('/campaigns/sounds', query=query))
 
+    def iter_campaign_sounds(self, query=None, **kwargs):
+        """Iterate over find_campaign_sounds items.
+
+        Fetches pages lazily and yields single items, see
+        `find_campaign_sounds` for the query params and `Paginator` for the
+        options.
+        """
+        return self.paginate(self.find_campaign_sounds, query=query, **kwargs)
+
     def post_call_campaign_sound(self, query=None, body=None):
         """Add sound via call.
 
@@ -533,6 +599,15 @@ class CallFireAPIVersion2(BaseAPI):
             JSONRequest('/campaigns/sounds/{id}.mp3'.format(id=id))
         )
 
+    def download_campaign_sound_data_mp3(self, id, dest=None, **kwargs):
+        """Stream get_campaign_sound_data_mp3 data.
+
+        Saves the body to `dest`, a file path or file object, or returns an
+        iterator of chunks without it, see `download` for the options.
+        """
+        return self.download(
+            self.get_campaign_sound_data_mp3, id, dest=dest, **kwargs)
+
     def get_campaign_sound_data_wav(self, id):
         """Download a WAV sound.
 
@@ -545,6 +620,15 @@ class CallFireAPIVersion2(BaseAPI):
             JSONRequest('/campaigns/sounds/{id}.wav'.format(id=id))
         )
 
+    def download_campaign_sound_data_wav(self, id, dest=None, **kwargs):
+        """Stream get_campaign_sound_data_wav data.
+
+        Saves the body to `dest`, a file path or file object, or returns an
+        iterator of chunks without it, see `download` for the options.
+        """
+        return self.download(
+            self.get_campaign_sound_data_wav, id, dest=dest, **kwargs)
+
     def find_contacts(self, query=None):
         """Find contacts.
 
@@ -567,6 +651,14 @@ class CallFireAPIVersion2(BaseAPI):
         """
         return self._get(JSONRequest('/contacts', query=query))
 
+    def iter_contacts(self, query=None, **kwargs):
+        """Iterate over find_contacts items.
+
+        Fetches pages lazily and yields single items, see `find_contacts` for
+        the query params and `Paginator` for the options.
+        """
+        return self.paginate(self.find_contacts, query=query, **kwargs)
+
     def create_contacts(self, body=None):
         """Create contacts.
 
@@ -613,6 +705,14 @@ class CallFireAPIVersion2(BaseAPI):
         """
         return self._get(JSONRequest('/contacts/dncs', query=query))
 
+    def iter_dnc_contacts(self, query=None, **kwargs):
+        """Iterate over find_dnc_contacts items.
+
+        Fetches pages lazily and yields single items, see `find_dnc_contacts`
+        for the query params and `Paginator` for the options.
+        """
+        return self.paginate(self.find_dnc_contacts, query=query, **kwargs)
+
     def update_dnc_number(self, body=None):
         """Update a DNC.
 
@@ -643,6 +743,14 @@ class CallFireAPIVersion2(BaseAPI):
         """
         return self._get(JSONRequest('/contacts/lists', query=query))
 
+    def iter_contact_lists(self, query=None, **kwargs):
+        """Iterate over find_contact_lists items.
+
+        Fetches pages lazily and yields single items, see `find_contact_lists`
+        for the query params and `Paginator` for the options.
+        """
+        return self.paginate(self.find_contact_lists, query=query, **kwargs)
+
     def create_contact_list(self, body=None):
         """Create contact lists.
 
@@ -757,6 +865,16 @@ class CallFireAPIVersion2(BaseAPI):
             )
         )
 
+    def iter_contact_list_items(self, id, query=None, **kwargs):
+        """Iterate over get_contact_list_items items.
+
+        Fetches pages lazily and yields single items, see
+        `get_contact_list_items` for the query params and `Paginator` for the
+        options.
+        """
+        return self.paginate(
+            self.get_contact_list_items, id, query=query, **kwargs)
+
     def add_contact_list_items(self, id, body=None):
         """Add contacts to a contact list.
 
@@ -862,6 +980,15 @@ class CallFireAPIVersion2(BaseAPI):
             JSONRequest('/contacts/{id}/history'.format(id=id), query=query)
         )
 
+    def iter_contact_history(self, id, query=None, **kwargs):
+        """Iterate over get_contact_history items.
+
+        Fetches pages lazily and yields single items, see `get_contact_history`
+        for the query params and `Paginator` for the options.
+        """
+        return self.paginate(
+            self.get_contact_history, id, query=query, **kwargs)
+
     def find_keywords(self, query=None):
         """Find keywords.
 
@@ -889,6 +1016,14 @@ class CallFireAPIVersion2(BaseAPI):
         """
         return self._get(JSONRequest('/keywords/leases', query=query))
 
+    def iter_keyword_leases(self, query=None, **kwargs):
+        """Iterate over find_keyword_leases items.
+
+        Fetches pages lazily and yields single items, see `find_keyword_leases`
+        for the query params and `Paginator` for the options.
+        """
+        return self.paginate(self.find_keyword_leases, query=query, **kwargs)
+
     def get_keyword_lease(self, keyword, query=None):
         """Find a specific lease.
 
@@ -968,6 +1103,15 @@ class CallFireAPIVersion2(BaseAPI):
         """
         return self._get(JSONRequest('/me/api/credentials', query=query))
 
+    def iter_api_credentials(self, query=None, **kwargs):
+        """Iterate over find_api_credentials items.
+
+        Fetches pages lazily and yields single items, see
+        `find_api_credentials` for the query params and `Paginator` for the
+        options.
+        """
+        return self.paginate(self.find_api_credentials, query=query, **kwargs)
+
     def create_api_credential(self, body=None):
         """Create api credentials.
 
@@ -1091,6 +1235,15 @@ class CallFireAPIVersion2(BaseAPI):
             )
         )
 
+    def download_media_data_by_key(self, key, extension, dest=None, **kwargs):
+        """Stream get_media_data_by_key data.
+
+        Saves the body to `dest`, a file path or file object, or returns an
+        iterator of chunks without it, see `download` for the options.
+        """
+        return self.download(
+            self.get_media_data_by_key, key, extension, dest=dest, **kwargs)
+
     def get_media(self, id, query=None):
         """Get a specific media.
 
@@ -1120,6 +1273,15 @@ class CallFireAPIVersion2(BaseAPI):
             )
         )
 
+    def download_media_data(self, id, extension, dest=None, **kwargs):
+        """Stream get_media_data data.
+
+        Saves the body to `dest`, a file path or file object, or returns an
+        iterator of chunks without it, see `download` for the options.
+        """
+        return self.download(
+            self.get_media_data, id, extension, dest=dest, **kwargs)
+
     def get_media_data_binary(self, id):
         """Download a MP3 media.
 
@@ -1129,6 +1291,15 @@ class CallFireAPIVersion2(BaseAPI):
         """
         return self._get(JSONRequest('/media/{id}/file'.format(id=id)))
 
+    def download_media_data_binary(self, id, dest=None, **kwargs):
+        """Stream get_media_data_binary data.
+
+        Saves the body to `dest`, a file path or file object, or returns an
+        iterator of chunks without it, see `download` for the options.
+        """
+        return self.download(
+            self.get_media_data_binary, id, dest=dest, **kwargs)
+
     def find_number_leases(self, query=None):
         """Find leases.
 
@@ -1152,6 +1323,14 @@ class CallFireAPIVersion2(BaseAPI):
         """
         return self._get(JSONRequest('/numbers/leases', query=query))
 
+    def iter_number_leases(self, query=None, **kwargs):
+        """Iterate over find_number_leases items.
+
+        Fetches pages lazily and yields single items, see `find_number_leases`
+        for the query params and `Paginator` for the options.
+        """
+        return self.paginate(self.find_number_leases, query=query, **kwargs)
+
     def find_number_lease_configs(self, query=None):
         """Find lease configs.
 
@@ -1174,6 +1353,16 @@ class CallFireAPIVersion2(BaseAPI):
         """
         return self._get(JSONRequest('/numbers/leases/configs', query=query))
 
+    def iter_number_lease_configs(self, query=None, **kwargs):
+        """Iterate over find_number_lease_configs items.
+
+        Fetches pages lazily and yields single items, see
+        `find_number_lease_configs` for the query params and `Paginator` for
+        the options.
+        """
+        return self.paginate(
+            self.find_number_lease_configs, query=query, **kwargs)
+
     def get_number_lease_config(self, number, query=None):
         """Find a specific lease config.
 
@@ -1299,6 +1488,14 @@ class CallFireAPIVersion2(BaseAPI):
         """
         return self._get(JSONRequest('/numbers/regions', query=query))
 
+    def iter_number_regions(self, query=None, **kwargs):
+        """Iterate over find_number_regions items.
+
+        Fetches pages lazily and yields single items, see `find_number_regions`
+        for the query params and `Paginator` for the options.
+        """
+        return self.paginate(self.find_number_regions, query=query, **kwargs)
+
     def find_numbers_tollfree(self, query=None):
         """Find tollfree numbers.
 
@@ -1401,6 +1598,14 @@ class CallFireAPIVersion2(BaseAPI):
         """
         return self._get(JSONRequest('/texts', query=query))
 
+    def iter_texts(self, query=None, **kwargs):
+        """Iterate over find_texts items.
+
+        Fetches pages lazily and yields single items, see `find_texts` for the
+        query params and `Paginator` for the options.
+        """
+        return self.paginate(self.find_texts, query=query, **kwargs)
+
     def send_texts(self, query=None, body=None):
         """Send texts.
 
@@ -1438,6 +1643,15 @@ class CallFireAPIVersion2(BaseAPI):
         """
         return self._get(JSONRequest('/texts/auto-replys', query=query))
 
+    def iter_text_auto_replys(self, query=None, **kwargs):
+        """Iterate over find_text_auto_replys items.
+
+        Fetches pages lazily and yields single items, see
+        `find_text_auto_replys` for the query params and `Paginator` for the
+        options.
+        """
+        return self.paginate(self.find_text_auto_replys, query=query, **kwargs)
+
     def create_text_auto_reply(self, body=None):
         """Create an auto reply.
 
@@ -1501,6 +1715,15 @@ class CallFireAPIVersion2(BaseAPI):
         """
         return self._get(JSONRequest('/texts/broadcasts', query=query))
 
+    def iter_text_broadcasts(self, query=None, **kwargs):
+        """Iterate over find_text_broadcasts items.
+
+        Fetches pages lazily and yields single items, see
+        `find_text_broadcasts` for the query params and `Paginator` for the
+        options.
+        """
+        return self.paginate(self.find_text_broadcasts, query=query, **kwargs)
+
     def create_text_broadcast(self, query=None, body=None):
         """Create a text broadcast.
 
@@ -1613,6 +1836,16 @@ class CallFireAPIVersion2(BaseAPI):
             )
         )
 
+    def iter_text_broadcast_batches(self, id, query=None, **kwargs):
+        """Iterate over get_text_broadcast_batches items.
+
+        Fetches pages lazily and yields single items, see
+        `get_text_broadcast_batches` for the query params and `Paginator` for
+        the options.
+        """
+        return self.paginate(
+            self.get_text_broadcast_batches, id, query=query, **kwargs)
+
     def add_text_broadcast_batch(self, id, body=None):
         """Add batches to a text broadcast.
 
@@ -1726,6 +1959,16 @@ class CallFireAPIVersion2(BaseAPI):
                 query=query)
         )
 
+    def iter_text_broadcast_texts(self, id, query=None, **kwargs):
+        """Iterate over get_text_broadcast_texts items.
+
+        Fetches pages lazily and yields single items, see
+        `get_text_broadcast_texts` for the query params and `Paginator` for the
+        options.
+        """
+        return self.paginate(
+            self.get_text_broadcast_texts, id, query=query, **kwargs)
+
     def get_text(self, id, query=None):
         """Find a specific text.
 
@@ -1760,6 +2003,14 @@ class CallFireAPIVersion2(BaseAPI):
         """
         return self._get(JSONRequest('/webhooks', query=query))
 
+    def iter_webhooks(self, query=None, **kwargs):
+        """Iterate over find_webhooks items.
+
+        Fetches pages lazily and yields single items, see `find_webhooks` for
+        the query params and `Paginator` for the options.
+        """
+        return self.paginate(self.find_webhooks, query=query, **kwargs)
+
     def create_webhook(self, body=None):
         """Create a webhook.
 
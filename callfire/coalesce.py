@@ -0,0 +1,63 @@
+import threading
+
+
+class _Flight(object):
+    """A call in progress and the callers waiting for it."""
+
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """Runs at most one call per key at a time.
+
+    Callers asking for a key while a call for it is in progress wait for
+    that call and share its outcome instead of making their own. `calls`
+    counts the calls actually made and `coalesced` the callers served by
+    someone else's call.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.coalesced = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """Calls `func` unless a call for the same key is in progress.
+
+        :param key: hashable call key
+        :param func: callable without arguments
+        :returns (result, shared) pair, `shared` tells whether the result
+        came from another caller's call
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                self.calls += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, True
+
+        try:
+            flight.result = func()
+            return flight.result, False
+        except Exception as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
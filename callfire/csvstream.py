@@ -0,0 +1,75 @@
+import csv
+import io
+import itertools
+
+import six
+
+
+class CSVStream(object):
+    """CSV file encoded on the fly from rows, as an iterable of bytes.
+
+    Rows are consumed lazily and encoded in blocks of about `block_size`
+    bytes, so rows of a database query of any size can be uploaded without
+    a temporary file. Used as the payload of a multipart request, the body
+    is sent with chunked transfer encoding.
+
+        >>> rows = ({'firstName': f, 'homePhone': p} for f, p in cursor)
+        >>> api.create_contact_list_from_file(payload=CSVStream(rows))
+    """
+
+    def __init__(self, rows, fieldnames=None, name='contacts.csv',
+                 encoding='utf-8', block_size=64 * 1024):
+        """CSV stream.
+
+        :param rows: iterable of dictionaries or sequences
+        :param fieldnames: header row, defaults to the keys of the first row
+        if it is a dictionary, no header otherwise; dictionary rows are
+        written in this order, missing keys as empty values
+        :param name: file name sent to the server
+        :param encoding: text encoding
+        :param block_size: number of bytes encoded at once
+        """
+        self.rows = rows
+        self.fieldnames = fieldnames
+        self.name = name
+        self.encoding = encoding
+        self.block_size = block_size
+        self.rows_written = 0
+
+    def _encode(self, row):
+        if not six.PY2:
+            return row
+        return [value.encode(self.encoding)
+                if isinstance(value, six.text_type) else value
+                for value in row]
+
+    def __iter__(self):
+        rows = iter(self.rows)
+        fieldnames = self.fieldnames
+        if fieldnames is None:
+            first = next(rows, None)
+            if first is None:
+                return
+            if isinstance(first, dict):
+                fieldnames = list(first)
+            rows = itertools.chain([first], rows)
+
+        buffer = io.BytesIO() if six.PY2 else io.StringIO()
+        writer = csv.writer(buffer)
+
+        def flush():
+            data = buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            return data if six.PY2 else data.encode(self.encoding)
+
+        if fieldnames:
+            writer.writerow(self._encode(fieldnames))
+        for row in rows:
+            if isinstance(row, dict):
+                row = [row.get(name) for name in fieldnames]
+            writer.writerow(self._encode(row))
+            self.rows_written += 1
+            if buffer.tell() >= self.block_size:
+                yield flush()
+        yield flush()
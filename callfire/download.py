@@ -0,0 +1,49 @@
+import six
+
+
+def iter_chunks(response, buffer):
+    """Yields the body of a streamed response in chunks.
+
+    Every chunk is a memoryview over the same buffer, valid only until the
+    next one is read; copy it with `bytes()` to keep it. The response is
+    closed once the body is exhausted.
+
+    :param response: `StreamedResponse`
+    :param buffer: preallocated `bytearray` reused for every chunk
+    """
+    view = memoryview(buffer)
+    with response:
+        while True:
+            size = response.readinto(buffer)
+            if not size:
+                return
+            yield view[:size]
+
+
+def copy_stream(response, dest, buffer):
+    """Copies the body of a streamed response into a file object.
+
+    :param response: `StreamedResponse`
+    :param dest: file object opened for binary writing
+    :param buffer: preallocated `bytearray` reused for every chunk
+    :returns number of bytes copied
+    """
+    copied = 0
+    for chunk in iter_chunks(response, buffer):
+        dest.write(chunk)
+        copied += len(chunk)
+    return copied
+
+
+def save(response, dest, buffer):
+    """Saves the body of a streamed response to a path or a file object.
+
+    :param response: `StreamedResponse`
+    :param dest: file path or file object opened for binary writing
+    :param buffer: preallocated `bytearray` reused for every chunk
+    :returns number of bytes saved
+    """
+    if isinstance(dest, six.string_types):
+        with open(dest, 'wb') as stream:
+            return copy_stream(response, stream, buffer)
+    return copy_stream(response, dest, buffer)
@@ -0,0 +1,18 @@
+class CallFireError(Exception):
+    """Exception wrapper."""
+    def __init__(self, wrapped_exc, *args, **kwargs):
+        self.wrapped_exc = wrapped_exc
+        super(CallFireError, self).__init__(*args, **kwargs)
+
+
+class CircuitOpenError(CallFireError):
+    """Raised without sending the request while the circuit is open."""
+    def __init__(self, retry_in, *args, **kwargs):
+        self.retry_in = retry_in
+        super(CircuitOpenError, self).__init__(None, *args, **kwargs)
+
+
+class DeadlineExceeded(CallFireError):
+    """Raised without sending the request once the deadline has passed."""
+    def __init__(self, *args, **kwargs):
+        super(DeadlineExceeded, self).__init__(None, *args, **kwargs)
@@ -0,0 +1,130 @@
+import collections
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .ratelimit import _clock
+from .retry import RetryBudget
+
+
+class HedgePolicy(object):
+    """Sends a second copy of slow GET requests and takes the first answer.
+
+    A request not answered within the `percentile` of the latencies seen
+    recently gets a duplicate, whichever answers first wins and the other
+    one is abandoned, its connection is released when it completes. The
+    `budget` caps duplicates to a share of the requests, 5% by default, so
+    hedging cannot add more load than that.
+
+    Requests run on a thread pool owned by the policy, large enough not to
+    queue requests of the threads calling the API.
+
+        >>> hedge = HedgePolicy(percentile=95, paths=['/texts', '/calls'])
+        >>> api = CallFireAPI(username, password, hedge_policy=hedge)
+        >>> hedge.hedged, hedge.wins
+    """
+
+    def __init__(self, percentile=95, initial_delay=0.5, min_delay=0.01,
+                 samples=1000, min_samples=20, budget=None, paths=None,
+                 max_workers=64):
+        """Hedge policy.
+
+        :param percentile: latency percentile after which a duplicate is sent
+        :param initial_delay: delay used until `min_samples` latencies are
+        known
+        :param min_delay: shortest delay ever used
+        :param samples: number of recent latencies the percentile is taken
+        over
+        :param min_samples: number of latencies needed to use the percentile
+        :param budget: `RetryBudget` capping duplicates, 5% of the requests
+        by default
+        :param paths: path prefixes of the GET requests to hedge, all of
+        them by default
+        :param max_workers: size of the thread pool requests are sent from
+        """
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.min_samples = min_samples
+        self.budget = budget or RetryBudget(ratio=0.05, reserve=5)
+        self.paths = tuple(paths) if paths else None
+        self.max_workers = max_workers
+        self.requests = 0
+        self.hedged = 0
+        self.wins = 0
+        self._latencies = collections.deque(maxlen=samples)
+        self._delay = None
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def applies(self, path):
+        """Tells whether GET requests to a path are hedged.
+
+        :param path: request path
+        """
+        return self.paths is None or any(
+            path == prefix or path.startswith(prefix.rstrip('/') + '/')
+            for prefix in self.paths)
+
+    def delay(self):
+        """Returns seconds to wait before sending a duplicate."""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return self.initial_delay
+            if self._delay is None:
+                # recomputed after every `min_samples` new latencies
+                latencies = sorted(self._latencies)
+                index = int(len(latencies) * self.percentile / 100.0)
+                self._delay = max(
+                    self.min_delay, latencies[min(index, len(latencies) - 1)])
+            return self._delay
+
+    def _record(self, latency):
+        with self._lock:
+            self._latencies.append(latency)
+            if len(self._latencies) % self.min_samples == 0:
+                self._delay = None
+
+    def _timed(self, send):
+        started = _clock()
+        response = send()
+        self._record(_clock() - started)
+        return response
+
+    def run(self, send):
+        """Calls `send`, and again if it is slow, returning the first result.
+
+        :param send: callable sending the request
+        :returns response of the first attempt to succeed
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.max_workers)
+            executor = self._executor
+            self.requests += 1
+        self.budget.deposit()
+
+        primary = executor.submit(self._timed, send)
+        done, _ = wait([primary], timeout=self.delay())
+        if done or not self.budget.withdraw():
+            return primary.result()
+
+        with self._lock:
+            self.hedged += 1
+        hedge = executor.submit(self._timed, send)
+        pending = [primary, hedge]
+        while True:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.remove(future)
+                if future.exception() is None or not pending:
+                    if future is hedge and future.exception() is None:
+                        with self._lock:
+                            self.wins += 1
+                    return future.result()
+
+    def close(self):
+        """Shuts the thread pool down once requests in flight complete."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
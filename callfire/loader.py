@@ -0,0 +1,106 @@
+import threading
+from concurrent.futures import Future
+
+
+class BatchLoader(object):
+    """Collects single lookups by id into bulk `find_*` calls.
+
+    Ids requested from any thread within `wait` seconds of the first one,
+    or until `max_batch_size` of them are collected, are fetched with one
+    `find_calls`/`find_texts`/`find_contacts` call filtered by `id`, and
+    every caller gets its own item, or None if the id was not found.
+
+        >>> calls = BatchLoader(api.find_calls)
+        >>> call = calls.get(call_id)  # from many threads at once
+        >>> calls.get_many(call_ids)
+    """
+
+    def __init__(self, method, max_batch_size=100, wait=0.005, query=None):
+        """Batch loader.
+
+        :param method: bound `find_*` API method accepting an `id` list
+        :param max_batch_size: maximum number of ids fetched at once
+        :param wait: seconds to wait for more ids before fetching
+        :param query: other query params, e.g. `fields`, which has to
+        include `id`
+        """
+        self.method = method
+        self.max_batch_size = max_batch_size
+        self.wait = wait
+        self.query = dict(query or {})
+        self.loads = 0
+        self.batches = 0
+        self._batch = None
+        self._lock = threading.Lock()
+
+    def load(self, id):
+        """Schedules the lookup of an id.
+
+        :param id: resource id
+        :returns `Future` of the item
+        """
+        with self._lock:
+            self.loads += 1
+            batch = self._batch
+            if batch is None:
+                batch = self._batch = {}
+                timer = threading.Timer(self.wait, self._flush, (batch,))
+                timer.daemon = True
+                timer.start()
+
+            futures = batch.setdefault(str(id), [])
+            future = Future()
+            futures.append(future)
+            full = len(batch) >= self.max_batch_size
+            if full:
+                self._batch = None
+
+        if full:
+            self._dispatch(batch)
+        return future
+
+    def get(self, id):
+        """Returns the item of an id, or None if not found.
+
+        :param id: resource id
+        """
+        return self.load(id).result()
+
+    def get_many(self, ids):
+        """Returns the items of ids in the same order, None if not found.
+
+        :param ids: iterable of resource ids
+        """
+        futures = [self.load(id) for id in ids]
+        return [future.result() for future in futures]
+
+    def _flush(self, batch):
+        """Dispatches a batch unless it was dispatched when full."""
+        with self._lock:
+            if self._batch is not batch:
+                return
+            self._batch = None
+        self._dispatch(batch)
+
+    def _dispatch(self, batch):
+        """Fetches the items of a batch and resolves its futures.
+
+        :param batch: dictionary of id to the futures waiting for it
+        """
+        query = dict(self.query, id=','.join(batch), limit=len(batch))
+        with self._lock:
+            self.batches += 1
+        try:
+            items = self.method(query=query).json().get('items') or []
+        except Exception as exc:
+            # anything left unresolved would block its callers forever,
+            # e.g. a page that is not JSON
+            for futures in batch.values():
+                for future in futures:
+                    future.set_exception(exc)
+            return
+
+        found = dict((str(item.get('id')), item) for item in items)
+        for id, futures in batch.items():
+            for future in futures:
+                future.set_result(found.get(id))
@@ -0,0 +1,199 @@
+import binascii
+import os
+
+import six
+
+
+class MultipartBody(object):
+    """Multipart form body generated chunk by chunk from a single file.
+
+    The body is a file-like object, transports read it in blocks, so the
+    file never has to be held in memory. The boundary is random, so it
+    cannot collide with the file content. The length of a file is known up
+    front, a payload given as an iterable of byte chunks, e.g. generated
+    on the fly, or as a file object which cannot seek, e.g. a pipe, has an
+    unknown `length` and is sent with chunked transfer encoding; it can be
+    sent only once.
+    """
+
+    def __init__(self, payload, boundary=None, name='file', filename=None,
+                 chunk_size=64 * 1024):
+        """Multipart body.
+
+        :param payload: file object opened in binary mode, a file path or
+        an iterable of bytes
+        :param boundary: boundary bytes, random by default
+        :param name: form field name
+        :param filename: file name sent to the server, defaults to the base
+        name of the path or file object, or `file`
+        :param chunk_size: number of bytes read from the payload at once
+        """
+        self.boundary = boundary or binascii.hexlify(os.urandom(16))
+        self.chunk_size = chunk_size
+        self._path = None
+        self._file = None
+        self._iterable = None
+        if isinstance(payload, six.string_types):
+            self._path = payload
+        elif hasattr(payload, 'read'):
+            self._file = payload
+        else:
+            self._iterable = payload
+
+        self._start = 0
+        if self._file is not None:
+            try:
+                self._start = self._file.tell()
+                seekable = getattr(self._file, 'seekable', lambda: True)()
+            except (AttributeError, IOError, OSError, ValueError):
+                seekable = False
+            if not seekable:
+                # pipes, sockets or responses, read through to the end
+                self._iterable = iter(
+                    lambda: payload.read(chunk_size), b'')
+                self._file = None
+
+        source_name = self._path or getattr(payload, 'name', None)
+        if filename is None and isinstance(source_name, six.string_types):
+            filename = os.path.basename(source_name)
+        filename = filename or 'file'
+
+        self._head = (
+            b'--' + self.boundary + b'\r\n' +
+            'Content-Disposition: form-data; name="{}"; filename="{}"'.format(
+                name, filename).encode('utf-8') +
+            b'\r\n\r\n')
+        self._tail = b'\r\n--' + self.boundary + b'--\r\n'
+        self.length = None
+        if self._iterable is None:
+            self.length = (
+                len(self._head) + self._payload_size() + len(self._tail))
+        self._chunks = None
+        self._buffer = b''
+        self.bytes_read = 0
+
+    @property
+    def content_type(self):
+        return 'multipart/form-data; boundary={}'.format(
+            self.boundary.decode('ascii'))
+
+    def _payload_size(self):
+        """Returns the number of payload bytes left to send."""
+        if self._path is not None:
+            return os.path.getsize(self._path)
+        try:
+            return os.fstat(self._file.fileno()).st_size - self._start
+        except (AttributeError, OSError, IOError, ValueError):
+            # in-memory streams
+            self._file.seek(0, os.SEEK_END)
+            size = self._file.tell() - self._start
+            self._file.seek(self._start)
+            return size
+
+    @property
+    def rewindable(self):
+        """Tells whether the body can be sent again."""
+        return self._iterable is None or self._chunks is None
+
+    def __len__(self):
+        if self.length is None:
+            raise TypeError('length of a streamed body is unknown')
+        return self.length
+
+    def __bool__(self):
+        return True
+
+    __nonzero__ = __bool__
+
+    def __iter__(self):
+        yield self._head
+        if self._iterable is not None:
+            for chunk in self._iterable:
+                # an empty chunk would end the reads early
+                if chunk:
+                    yield chunk
+        elif self._path is not None:
+            with open(self._path, 'rb') as stream:
+                for chunk in iter(lambda: stream.read(self.chunk_size), b''):
+                    yield chunk
+        else:
+            for chunk in iter(lambda: self._file.read(self.chunk_size), b''):
+                yield chunk
+        yield self._tail
+
+    def read(self, size=-1):
+        """Reads the next `size` bytes of the body, all of it by default."""
+        if self._chunks is None:
+            self._chunks = iter(self)
+
+        parts, length = [self._buffer], len(self._buffer)
+        while size is None or size < 0 or length < size:
+            chunk = next(self._chunks, b'')
+            if not chunk:
+                break
+            parts.append(chunk)
+            length += len(chunk)
+
+        data = b''.join(parts)
+        if size is None or size < 0:
+            self._buffer = b''
+        else:
+            data, self._buffer = data[:size], data[size:]
+        self.bytes_read += len(data)
+        return data
+
+    def rewind(self):
+        """Starts the body over, e.g. to send it again."""
+        if not self.rewindable:
+            raise ValueError('a streamed body can be sent only once')
+        if self._file is not None:
+            self._file.seek(self._start)
+        self._chunks = None
+        self._buffer = b''
+        self.bytes_read = 0
+
+
+class ChunkedBody(object):
+    """File-like view of a body framed with chunked transfer encoding.
+
+    Each read returns one chunk of the underlying body with its size line,
+    the last one is the terminating zero-size chunk.
+    """
+
+    def __init__(self, body, chunk_size=64 * 1024):
+        """Chunked body.
+
+        :param body: file-like body
+        :param chunk_size: maximum number of body bytes per chunk
+        """
+        self.body = body
+        self.chunk_size = chunk_size
+        self._done = False
+
+    @property
+    def rewindable(self):
+        return getattr(self.body, 'rewindable', True)
+
+    def read(self, size=-1):
+        """Reads the next chunk, `size` is a hint only."""
+        if self._done:
+            return b''
+        data = self.body.read(self.chunk_size)
+        if not data:
+            self._done = True
+            return b'0\r\n\r\n'
+        return '{:x}\r\n'.format(len(data)).encode('ascii') + data + b'\r\n'
+
+    def rewind(self):
+        self.body.rewind()
+        self._done = False
+
+
+def is_chunked(headers):
+    """Tells whether headers ask for chunked transfer encoding.
+
+    :param headers: dictionary of request headers
+    """
+    return any(name.lower() == 'transfer-encoding' and
+               'chunked' in str(value).lower()
+               for name, value in (headers or {}).items())
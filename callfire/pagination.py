@@ -0,0 +1,160 @@
+import collections
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .timeout import Deadline, call_within
+
+
+class Paginator(object):
+    """Iterates over the items of a paged endpoint.
+
+    Pages are fetched lazily with `limit`/`offset` and only one page is held
+    in memory at a time. `total_count` and `pages_fetched` are updated as
+    iteration goes.
+
+    With `prefetch` set, the offsets left after the first page are known
+    from its `totalCount` and up to `prefetch` pages are fetched in
+    parallel, items are still yielded in offset order. Servers capping
+    `limit` below `page_size` are followed, pages are stepped by the
+    number of items actually received.
+
+        >>> calls = Paginator(api.find_calls, query={'states': 'FINISHED'})
+        >>> for call in calls:
+        ...     print(call['id'])
+    """
+
+    def __init__(self, method, args=(), query=None, page_size=100,
+                 prefetch=0, deadline=None):
+        """Paginator.
+
+        :param method: bound API method of a paged endpoint
+        :param args: positional args of the method, e.g. resource id
+        :param query: query params, `offset` is used as the starting point
+        and `limit` overrides `page_size`
+        :param page_size: number of items requested per page
+        :param prefetch: number of pages fetched in parallel, which is also
+        the number of pages held in memory
+        :param deadline: seconds or `Deadline` the whole iteration is due
+        in, defaults to the deadline pages are fetched within
+        """
+        self.method = method
+        self.args = tuple(args)
+        self.query = dict(query or {})
+        self.page_size = int(self.query.pop('limit', page_size))
+        self.offset = int(self.query.pop('offset', 0))
+        self.prefetch = prefetch
+        self.deadline = Deadline.coerce(deadline)
+        self.total_count = None
+        self.pages_fetched = 0
+        self._lock = threading.Lock()
+
+    def fetch_page(self, offset, limit=None):
+        """Fetches a single page.
+
+        :param offset: page offset
+        :param limit: number of items requested, `page_size` by default
+        :returns list of page items
+        """
+        query = dict(self.query, limit=limit or self.page_size,
+                     offset=offset)
+        page = call_within(
+            self.deadline, self.method, *self.args, query=query).json()
+        with self._lock:
+            self.pages_fetched += 1
+            if page.get('totalCount') is not None:
+                self.total_count = page['totalCount']
+        return page.get('items') or []
+
+    def is_last_page(self, offset, items):
+        """Tells whether there is nothing to fetch after this page.
+
+        :param offset: page offset
+        :param items: page items
+        """
+        if not items:
+            return True
+        if self.total_count is not None:
+            # a short page may only mean the server caps the page size
+            return offset + len(items) >= self.total_count
+        return len(items) < self.page_size
+
+    def _iter_pages(self, offset):
+        """Fetches pages one by one starting at offset."""
+        while True:
+            items = self.fetch_page(offset)
+            yield items
+
+            if self.is_last_page(offset, items):
+                return
+            offset += len(items)
+            # drop the page before fetching the next one
+            items = None
+
+    def _fill(self, offset, items, end):
+        """Fetches the items a short page left out before `end`.
+
+        :param offset: page offset
+        :param items: page items
+        :param end: offset the page was expected to reach
+        """
+        offset += len(items)
+        while offset < end:
+            more = self.fetch_page(offset, end - offset)
+            if not more:
+                break
+            items.extend(more[:end - offset])
+            offset += len(more)
+        return items
+
+    def _iter_prefetched_pages(self, offset, step):
+        """Fetches pages from offset up to `total_count` in parallel.
+
+        Futures are kept in offset order, so the head of the queue is the
+        next page to yield while later pages keep downloading.
+
+        :param offset: offset of the first page
+        :param step: number of items per page the server returns
+        """
+        total = self.total_count
+        offsets = iter(range(offset, total, step))
+        deadline = self.deadline or Deadline.current()
+        with ThreadPoolExecutor(max_workers=self.prefetch) as executor:
+            pending = collections.deque()
+
+            def next_page():
+                offset, future = pending.popleft()
+                return self._fill(offset, future.result(),
+                                  min(offset + step, total))
+
+            try:
+                for offset in offsets:
+                    pending.append((offset, executor.submit(
+                        call_within, deadline, self.fetch_page, offset,
+                        step)))
+                    if len(pending) >= self.prefetch:
+                        yield next_page()
+
+                while pending:
+                    yield next_page()
+            finally:
+                for _, future in pending:
+                    future.cancel()
+
+    def __iter__(self):
+        items = self.fetch_page(self.offset)
+        for item in items:
+            yield item
+
+        if self.is_last_page(self.offset, items):
+            return
+        offset, step = self.offset + len(items), len(items)
+        items = None
+
+        if self.prefetch and self.total_count is not None:
+            pages = self._iter_prefetched_pages(offset, step)
+        else:
+            pages = self._iter_pages(offset)
+
+        for items in pages:
+            for item in items:
+                yield item
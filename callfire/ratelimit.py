@@ -0,0 +1,207 @@
+import email.utils
+import threading
+import time
+
+#: Clock not affected by system time changes, where available
+_clock = getattr(time, 'monotonic', time.time)
+
+
+def parse_retry_after(value):
+    """Returns seconds to wait from a `Retry-After` header value.
+
+    :param value: delay in seconds or an HTTP date
+    :returns seconds, None if the value is missing or malformed
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    parsed = email.utils.parsedate_tz(value)
+    if parsed is None:
+        return None
+    return max(0.0, email.utils.mktime_tz(parsed) - time.time())
+
+
+class TokenBucket(object):
+    """Thread-safe token bucket.
+
+    Implemented as a virtual schedule: every token taken moves the time the
+    next one is available by `1 / rate`, with up to `burst` tokens available
+    at once. Waiting happens outside the lock, callers are served in the
+    order they asked.
+    """
+
+    def __init__(self, rate, burst=1):
+        """Token bucket.
+
+        :param rate: tokens per second
+        :param burst: number of tokens that can be taken at once
+        """
+        self.rate = float(rate)
+        self.burst = burst
+        self._next = _clock()
+        self._lock = threading.Lock()
+
+    def wait_time(self):
+        """Returns seconds until a token is available, without taking it.
+        """
+        with self._lock:
+            interval = 1.0 / self.rate
+            return max(0.0,
+                       self._next - (self.burst - 1) * interval - _clock())
+
+    def reserve(self, max_wait=None):
+        """Takes a token.
+
+        :param max_wait: take it only if available within that many seconds
+        :returns seconds to wait before using it, None if not taken
+        """
+        with self._lock:
+            interval = 1.0 / self.rate
+            now = _clock()
+            scheduled = max(self._next, now)
+            delay = max(0.0, scheduled - (self.burst - 1) * interval - now)
+            if max_wait is not None and delay > max_wait:
+                return None
+            self._next = scheduled + interval
+            return delay
+
+    def acquire(self, max_wait=None):
+        """Waits for a token.
+
+        :param max_wait: give up right away if the wait would be longer
+        :returns seconds waited, None if no token was taken
+        """
+        delay = self.reserve(max_wait)
+        if delay:
+            time.sleep(delay)
+        return delay
+
+    def pause(self, seconds):
+        """Hands out no tokens for the given number of seconds.
+
+        :param seconds: pause length
+        """
+        with self._lock:
+            interval = 1.0 / self.rate
+            resume = _clock() + seconds + (self.burst - 1) * interval
+            self._next = max(self._next, resume)
+
+
+class RateLimiter(object):
+    """Client-side rate limiter with one bucket per endpoint group.
+
+    The group of a request is the first segment of its path, e.g. `texts`,
+    `calls` or `contacts`. Rates adapt with AIMD: a 429 response multiplies
+    the group rate by `decrease`, at most once a second, and pauses the
+    group for `Retry-After`, or one second without the header; then every
+    second without 429s adds `increase` back up to the configured rate. A
+    limiter can be shared by threads and API instances.
+
+        >>> limiter = RateLimiter(rate=20, rates={'texts': 5})
+        >>> api = CallFireAPI(username, password, rate_limiter=limiter)
+    """
+
+    def __init__(self, rate=10, burst=1, rates=None, min_rate=0.5,
+                 increase=1.0, decrease=0.5, retries=3):
+        """Rate limiter.
+
+        :param rate: requests per second of groups not listed in `rates`
+        :param burst: requests that can be sent at once
+        :param rates: dictionary of group to requests per second
+        :param min_rate: rate a group is never slowed down below
+        :param increase: requests per second added per second without 429s
+        :param decrease: factor the rate is multiplied by on a 429
+        :param retries: number of times a request answered with 429 is sent
+        again once the group resumes
+        """
+        self.rate = rate
+        self.burst = burst
+        self.rates = dict(rates or {})
+        self.min_rate = min_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.retries = retries
+        self.throttled = 0
+        self.waited = 0.0
+        self._buckets = {}
+        self._adjusted = {}
+        self._decreased = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def group(path):
+        """Returns the endpoint group of a path.
+
+        :param path: request path
+        """
+        return path.lstrip('/').split('/', 1)[0].split('.', 1)[0]
+
+    def bucket(self, path):
+        """Returns the bucket of the group of a path, creating it if needed.
+
+        :param path: request path
+        """
+        group = self.group(path)
+        with self._lock:
+            bucket = self._buckets.get(group)
+            if bucket is None:
+                bucket = self._buckets[group] = TokenBucket(
+                    self.rates.get(group, self.rate), self.burst)
+                self._adjusted[group] = _clock()
+            return bucket
+
+    def acquire(self, path, max_wait=None):
+        """Waits until a request to a path can be sent.
+
+        :param path: request path
+        :param max_wait: give up right away if the wait would be longer
+        :returns whether the request can be sent
+        """
+        waited = self.bucket(path).acquire(max_wait)
+        if waited:
+            with self._lock:
+                self.waited += waited
+        return waited is not None
+
+    def wait_time(self, path):
+        """Returns seconds until a request to a path can be sent.
+
+        :param path: request path
+        """
+        return self.bucket(path).wait_time()
+
+    def succeeded(self, path):
+        """Additively raises the rate of a group after a success.
+
+        :param path: request path
+        """
+        bucket, group = self.bucket(path), self.group(path)
+        ceiling = self.rates.get(group, self.rate)
+        with self._lock:
+            now = _clock()
+            if bucket.rate < ceiling:
+                elapsed = now - self._adjusted[group]
+                bucket.rate = min(ceiling,
+                                  bucket.rate + self.increase * elapsed)
+            self._adjusted[group] = now
+
+    def rate_limited(self, path, retry_after=None):
+        """Slows a group down after a 429 response.
+
+        :param path: request path
+        :param retry_after: seconds the server asked to wait, if any
+        """
+        bucket, group = self.bucket(path), self.group(path)
+        with self._lock:
+            self.throttled += 1
+            now = _clock()
+            # requests in flight get their 429 at about the same time,
+            # count them as a single congestion signal
+            if now - self._decreased.get(group, now - 1) >= 1:
+                bucket.rate = max(self.min_rate, bucket.rate * self.decrease)
+                self._decreased[group] = now
+            self._adjusted[group] = now
+        bucket.pause(1.0 if retry_after is None else retry_after)
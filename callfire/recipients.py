@@ -0,0 +1,195 @@
+import csv
+import io
+import json
+import logging
+import os
+import time
+
+import six
+
+from .bulk import BulkSender
+
+
+logger = logging.getLogger(__name__)
+
+
+def read_csv(path, attributes=(), encoding='utf-8'):
+    """Reads recipients from a CSV file with a header row, one at a time.
+
+    Columns become recipient fields, e.g. `phoneNumber`, `contactId` or
+    `message`, except the `attributes` ones collected into the
+    `attributes` map. Empty values are left out.
+
+        >>> recipients = read_csv('recipients.csv', attributes=['name'])
+
+    :param path: file path
+    :param attributes: names of the columns holding recipient attributes
+    :param encoding: file encoding
+    """
+    if six.PY2:
+        stream = open(path, 'rb')
+    else:
+        stream = io.open(path, newline='', encoding=encoding)
+    with stream:
+        for row in csv.DictReader(stream):
+            recipient, extra = {}, {}
+            for name, value in row.items():
+                if six.PY2:
+                    name, value = name.decode(encoding), value.decode(encoding)
+                if value:
+                    target = extra if name in attributes else recipient
+                    target[name] = value
+            if extra:
+                recipient['attributes'] = extra
+            yield recipient
+
+
+class RecipientLoader(BulkSender):
+    """Loads recipients into a broadcast or a contact list.
+
+    Recipients are read lazily, batched and uploaded with several requests
+    in flight through `add_call_broadcast_recipients`,
+    `add_text_broadcast_recipients`, `add_call_broadcast_batch` or
+    `add_contact_list_items`. With a `checkpoint` file the batches uploaded
+    are recorded as they complete: a load started again with the same
+    input and checkpoint skips them and uploads the others only, failed
+    batches included.
+
+        >>> loader = RecipientLoader(
+        ...     api.add_text_broadcast_recipients, broadcast_id,
+        ...     read_csv('recipients.csv'), checkpoint='load.json')
+        >>> for result in loader:
+        ...     if not result.ok:
+        ...         print(result.offset, result.error)
+        >>> loader.items_sent, loader.rate
+    """
+
+    def __init__(self, method, id, recipients, batch_size=1000,
+                 concurrency=4, checkpoint=None, name=None,
+                 scrub_duplicates=False, report=None, report_interval=10.0,
+                 **kwargs):
+        """Recipient loader.
+
+        :param method: bound `add_*` API method
+        :param id: id of the broadcast or contact list
+        :param recipients: iterable of recipient dictionaries, contact ids
+        or numbers for contact lists
+        :param batch_size: number of recipients per request
+        :param concurrency: maximum number of requests in flight
+        :param checkpoint: path of the file progress is saved to
+        :param name: prefix of the names of the batches created by
+        `add_call_broadcast_batch`, numbered from 1
+        :param scrub_duplicates: let `add_call_broadcast_batch` drop
+        duplicate recipients
+        :param report: callable receiving the loader every
+        `report_interval` seconds and once when done, progress is logged
+        at info level by default
+        :param report_interval: seconds between progress reports
+        :param kwargs: other `BulkSender` options
+        """
+        super(RecipientLoader, self).__init__(
+            method, recipients, args=(id,), chunk_size=batch_size,
+            concurrency=concurrency, ordered=False, **kwargs)
+        self.id = id
+        self.checkpoint = checkpoint
+        self.name = name or 'batch'
+        self.scrub_duplicates = scrub_duplicates
+        self.report = report or self.log_progress
+        self.report_interval = report_interval
+        self.items_skipped = 0
+        self.started = None
+        self.finished = None
+        self._done = set()
+
+    @property
+    def elapsed(self):
+        """Seconds spent loading so far."""
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    @property
+    def rate(self):
+        """Recipients uploaded per second."""
+        elapsed = self.elapsed
+        return self.items_sent / elapsed if elapsed else 0.0
+
+    @staticmethod
+    def log_progress(loader):
+        logger.info(
+            '%s %s: %d recipients uploaded, %d skipped, %d batches failed, '
+            '%.1f recipients/s', loader.method.__name__, loader.id,
+            loader.items_sent, loader.items_skipped, loader.chunks_failed,
+            loader.rate)
+
+    def body(self, index, items):
+        """Wraps a batch of recipients into the body of the method.
+
+        :param index: batch number
+        :param items: list of recipients
+        """
+        name = self.method.__name__
+        if name == 'add_call_broadcast_batch':
+            return {'name': '{}-{}'.format(self.name, index + 1),
+                    'recipients': items,
+                    'scrubDuplicates': self.scrub_duplicates}
+        if name == 'add_contact_list_items':
+            if isinstance(items[0], dict):
+                return {'contacts': items}
+            if isinstance(items[0], six.integer_types):
+                return {'contactIds': items}
+            return {'contactNumbers': items}
+        return items
+
+    def load_checkpoint(self):
+        """Reads the batches uploaded by a previous run, if any."""
+        if not self.checkpoint or not os.path.exists(self.checkpoint):
+            return
+        with open(self.checkpoint) as stream:
+            state = json.load(stream)
+        if state['batch_size'] != self.chunk_size:
+            raise ValueError(
+                'Checkpoint {} was saved with batch size {}'.format(
+                    self.checkpoint, state['batch_size']))
+        self._done = set(state['done'])
+
+    def save_checkpoint(self):
+        """Records the batches uploaded so far, replacing the file at once.
+        """
+        if not self.checkpoint:
+            return
+        partial = self.checkpoint + '.part'
+        with open(partial, 'w') as stream:
+            json.dump({'batch_size': self.chunk_size,
+                       'done': sorted(self._done)}, stream)
+        if hasattr(os, 'replace'):
+            os.replace(partial, self.checkpoint)
+        else:
+            if os.path.exists(self.checkpoint):
+                os.remove(self.checkpoint)
+            os.rename(partial, self.checkpoint)
+
+    def chunks(self):
+        for chunk in super(RecipientLoader, self).chunks():
+            index, _, items = chunk
+            if index in self._done:
+                self.items_skipped += len(items)
+                continue
+            yield chunk
+
+    def __iter__(self):
+        self.load_checkpoint()
+        self.started, self.finished = time.time(), None
+        reported = self.started
+        for result in super(RecipientLoader, self).__iter__():
+            if result.ok:
+                self._done.add(result.index)
+                self.save_checkpoint()
+            yield result
+
+            if time.time() - reported >= self.report_interval:
+                reported = time.time()
+                self.report(self)
+
+        self.finished = time.time()
+        self.report(self)
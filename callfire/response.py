@@ -0,0 +1,198 @@
+import json
+
+import six
+
+from .streaming import JSONItemStream
+
+
+def _raw_attrs(raw):
+    """Returns (url, status, reason, headers) of a urlopen-like response."""
+    url = raw.geturl() if hasattr(raw, 'geturl') else None
+    status = getattr(raw, 'status', None) or getattr(raw, 'code', None)
+    reason = getattr(raw, 'reason', None) or getattr(raw, 'msg', None)
+    headers = getattr(raw, 'headers', None)
+    return url, status, reason, headers
+
+
+class Response(object):
+    """API response with the body read once and kept in memory.
+
+    The connection is released as soon as the body is read. The body can be
+    read any number of times and `json()` is parsed only once.
+    """
+
+    __slots__ = ('url', 'status', 'reason', 'headers', 'body', 'elapsed',
+                 'bytes_sent', '_json', '_pos')
+
+    def __init__(self, url, status, reason, headers, body, elapsed=None,
+                 bytes_sent=None):
+        """Response.
+
+        :param url: request url
+        :param status: HTTP status code
+        :param reason: HTTP reason phrase
+        :param headers: response headers
+        :param body: response body bytes
+        :param elapsed: seconds the request took
+        :param bytes_sent: size of the request body
+        """
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.body = body
+        self.elapsed = elapsed
+        self.bytes_sent = bytes_sent
+        self._json = None
+        self._pos = 0
+
+    @classmethod
+    def from_raw(cls, raw):
+        """Reads a urlopen-like response to the end and closes it.
+
+        :param raw: response object with `read()`
+        """
+        try:
+            body = raw.read()
+        finally:
+            if hasattr(raw, 'close'):
+                raw.close()
+        url, status, reason, headers = _raw_attrs(raw)
+        return cls(url, status, reason, headers, body)
+
+    @property
+    def bytes_received(self):
+        return len(self.body)
+
+    def copy(self):
+        """Returns a new response sharing the body bytes."""
+        return Response(self.url, self.status, self.reason, self.headers,
+                        self.body, self.elapsed, self.bytes_sent)
+
+    def read(self, amt=None):
+        """Returns the whole body, or its next `amt` bytes.
+
+        :param amt: read the body in parts, from where the last partial read
+        stopped
+        """
+        if amt is None:
+            return self.body
+        data = self.body[self._pos:self._pos + amt]
+        self._pos += len(data)
+        return data
+
+    def json(self):
+        """Returns the parsed JSON body."""
+        if self._json is None:
+            self._json = json.loads(self.body.decode('utf-8'))
+        return self._json
+
+    def iter_items(self, key='items', chunk_size=64 * 1024):
+        """Returns a `JSONItemStream` over the `key` array of the body."""
+        return JSONItemStream(
+            six.BytesIO(self.body), key=key, chunk_size=chunk_size)
+
+    def getcode(self):
+        return self.status
+
+    def info(self):
+        return self.headers
+
+    def geturl(self):
+        return self.url
+
+    def close(self):
+        pass
+
+
+class StreamedResponse(object):
+    """API response whose body is read from the connection on demand.
+
+    Returned by calls made within `BaseAPI.streaming()`. The connection is
+    held until the body is read to the end or the response is closed.
+    """
+
+    __slots__ = ('url', 'status', 'reason', 'headers', 'elapsed',
+                 'bytes_sent', 'bytes_received', '_raw', '_json')
+
+    def __init__(self, url, status, reason, headers, raw, elapsed=None,
+                 bytes_sent=None):
+        """Streamed response.
+
+        :param url: request url
+        :param status: HTTP status code
+        :param reason: HTTP reason phrase
+        :param headers: response headers
+        :param raw: body file object with `read()` and `close()`
+        :param elapsed: seconds until the response headers arrived
+        :param bytes_sent: size of the request body
+        """
+        self.url = url
+        self.status = status
+        self.reason = reason
+        self.headers = headers
+        self.elapsed = elapsed
+        self.bytes_sent = bytes_sent
+        self.bytes_received = 0
+        self._raw = raw
+        self._json = None
+
+    @classmethod
+    def from_raw(cls, raw):
+        """Wraps a urlopen-like response without reading it.
+
+        :param raw: response object with `read()`
+        """
+        url, status, reason, headers = _raw_attrs(raw)
+        return cls(url, status, reason, headers, raw)
+
+    def read(self, amt=None):
+        """Reads the rest of the body, or at most `amt` bytes of it."""
+        data = self._raw.read() if amt is None else self._raw.read(amt)
+        self.bytes_received += len(data)
+        return data
+
+    def readinto(self, buffer):
+        """Reads body bytes into a preallocated writable buffer.
+
+        :param buffer: e.g. a `bytearray`
+        :returns number of bytes read, 0 at the end of the body
+        """
+        if hasattr(self._raw, 'readinto'):
+            size = self._raw.readinto(buffer)
+        else:
+            data = self._raw.read(len(buffer))
+            size = len(data)
+            buffer[:size] = data
+        self.bytes_received += size
+        return size
+
+    def json(self):
+        """Reads the rest of the body and returns it parsed."""
+        if self._json is None:
+            with self:
+                self._json = json.loads(self.read().decode('utf-8'))
+        return self._json
+
+    def iter_items(self, key='items', chunk_size=64 * 1024):
+        """Returns a `JSONItemStream` decoding the body as it arrives."""
+        return JSONItemStream(self, key=key, chunk_size=chunk_size)
+
+    def getcode(self):
+        return self.status
+
+    def info(self):
+        return self.headers
+
+    def geturl(self):
+        return self.url
+
+    def close(self):
+        """Releases the connection."""
+        self._raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,141 @@
+import random
+import threading
+
+from .ratelimit import parse_retry_after
+
+
+class RetryBudget(object):
+    """Caps retries to a share of the requests made.
+
+    Every request deposits `ratio` of a retry and every retry withdraws a
+    whole one, with at most `reserve` retries saved up. While the API is
+    down this keeps retries from multiplying the load on it.
+    """
+
+    def __init__(self, ratio=0.2, reserve=10):
+        """Retry budget.
+
+        :param ratio: retries allowed per request in the long run
+        :param reserve: retries allowed in a burst, also the initial balance
+        """
+        self.ratio = ratio
+        self.reserve = reserve
+        self.balance = float(reserve)
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        """Records a request."""
+        with self._lock:
+            self.balance = min(self.reserve, self.balance + self.ratio)
+
+    def withdraw(self):
+        """Takes a retry out of the budget.
+
+        :returns whether there was one left
+        """
+        with self._lock:
+            if self.balance < 1:
+                return False
+            self.balance -= 1
+            return True
+
+
+class RetryPolicy(object):
+    """Decides whether and when failed requests are sent again.
+
+    Connection errors and the `statuses` responses are retried up to
+    `attempts` times in total with exponential backoff and full jitter, or
+    after `Retry-After` when the server sends it. GET, PUT and DELETE
+    requests are idempotent and retried by default, POST requests only with
+    `retry_post`; a 429 means the request was not processed, so it is
+    retried whatever the method. Hooks are called before every retry with
+    (request, method, error, attempt, delay).
+
+        >>> policy = RetryPolicy(attempts=5, hooks=[log_retry])
+        >>> api = CallFireAPI(username, password, retry_policy=policy)
+    """
+
+    IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'PUT', 'DELETE'])
+
+    def __init__(self, attempts=3, backoff=0.1, max_backoff=10.0,
+                 statuses=(429, 500, 502, 503, 504), retry_post=False,
+                 budget=None, hooks=()):
+        """Retry policy.
+
+        :param attempts: maximum number of times a request is sent
+        :param backoff: delay before the first retry, doubled with every
+        next one
+        :param max_backoff: maximum delay between two attempts
+        :param statuses: HTTP statuses worth a retry
+        :param retry_post: retry POST requests as well, only safe for
+        endpoints that do not create anything twice
+        :param budget: `RetryBudget`, by default retries are capped at 20%
+        of the requests
+        :param hooks: callables run before every retry
+        """
+        self.attempts = attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.statuses = frozenset(statuses)
+        self.retry_post = retry_post
+        self.budget = budget or RetryBudget()
+        self.hooks = list(hooks)
+        self.retries = 0
+        self.exhausted = 0
+        self._lock = threading.Lock()
+
+    def is_retryable(self, method, error):
+        """Tells whether a request failed in a way worth another attempt.
+
+        :param method: request method
+        :param error: `HTTPError` or `URLError` raised by the transport
+        """
+        code = getattr(error, 'code', None)
+        if code == 429:
+            return 429 in self.statuses
+        if code is not None and code not in self.statuses:
+            return False
+        return method in self.IDEMPOTENT_METHODS or self.retry_post
+
+    def backoff_delay(self, attempt):
+        """Returns a random delay before a retry.
+
+        :param attempt: number of attempts made so far
+        """
+        ceiling = min(self.max_backoff, self.backoff * 2 ** (attempt - 1))
+        return random.uniform(0, ceiling)
+
+    def retry_delay(self, request, method, error, attempt, max_delay=None):
+        """Returns the delay before the next attempt, or None to give up.
+
+        Hooks, counters and the budget are only touched when the request is
+        actually retried.
+
+        :param request: request object
+        :param method: request method
+        :param error: `HTTPError` or `URLError` raised by the transport
+        :param attempt: number of attempts made so far
+        :param max_delay: longest the caller can wait, e.g. until a
+        deadline, giving up when the retry would be due later
+        """
+        if attempt >= self.attempts or not self.is_retryable(method, error):
+            return None
+
+        delay = self.backoff_delay(attempt)
+        if hasattr(error, 'info'):
+            retry_after = parse_retry_after(
+                error.info().get('Retry-After'))
+            if retry_after is not None:
+                delay = min(self.max_backoff, retry_after)
+        if max_delay is not None and delay >= max_delay:
+            return None
+
+        if not self.budget.withdraw():
+            with self._lock:
+                self.exhausted += 1
+            return None
+        with self._lock:
+            self.retries += 1
+        for hook in self.hooks:
+            hook(request, method, error, attempt, delay)
+        return delay
@@ -0,0 +1,134 @@
+import collections
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from .pagination import Paginator
+from .timeout import Deadline, call_within
+
+
+class Window(collections.namedtuple('Window', 'begin end')):
+    """Time window `[begin, end)` in Unix time milliseconds."""
+
+    def bisect(self):
+        middle = self.begin + (self.end - self.begin) // 2
+        return Window(self.begin, middle), Window(middle, self.end)
+
+
+class WindowScanner(object):
+    """Scans a time range of `find_calls`/`find_texts` in sub-windows.
+
+    The range is split into windows queried with `intervalBegin` and
+    `intervalEnd`; a window holding more than `threshold` records is bisected
+    until each one is shallow enough to page through. Windows are scanned
+    concurrently and yielded in time order, `checkpoint` is the end of the
+    last fully yielded window, pass it as `begin` to resume a scan.
+
+        >>> scanner = WindowScanner(api.find_calls, begin, end)
+        >>> for call in scanner:
+        ...     export(call)
+    """
+
+    def __init__(self, method, begin, end, query=None, threshold=10000,
+                 partitions=None, concurrency=4, page_size=1000,
+                 deadline=None):
+        """Window scanner.
+
+        :param method: bound `find_calls` or `find_texts` API method
+        :param begin: scan start in Unix time milliseconds, inclusive
+        :param end: scan end in Unix time milliseconds, exclusive
+        :param query: other query params
+        :param threshold: maximum number of records paged through in one
+        window before it gets bisected
+        :param partitions: number of windows the range is split into up
+        front, defaults to `concurrency`
+        :param concurrency: number of windows scanned in parallel
+        :param page_size: number of items requested per page
+        :param deadline: seconds or `Deadline` the whole scan is due in,
+        defaults to the deadline the scan is started within
+        """
+        self.method = method
+        self.begin = begin
+        self.end = end
+        self.query = dict(query or {})
+        self.threshold = threshold
+        self.partitions = partitions or concurrency
+        self.concurrency = concurrency
+        self.page_size = page_size
+        self.deadline = Deadline.coerce(deadline)
+        self.checkpoint = begin
+        self.windows_scanned = 0
+        self.windows_split = 0
+
+    def initial_windows(self):
+        """Splits the range into `partitions` equal windows."""
+        span = max(1, -(-(self.end - self.begin) // self.partitions))
+        return collections.deque(
+            Window(begin, min(begin + span, self.end))
+            for begin in range(self.begin, self.end, span))
+
+    def scan_window(self, window):
+        """Fetches all items of a window unless it has to be bisected.
+
+        :param window: `Window`
+        :returns (halves, None) if the window is too large, else
+        (None, items)
+        """
+        # intervalEnd is inclusive, the windows must not overlap
+        query = dict(self.query, intervalBegin=window.begin,
+                     intervalEnd=window.end - 1)
+        paginator = Paginator(self.method, query=query,
+                              page_size=self.page_size)
+        items = paginator.fetch_page(0)
+
+        too_large = (paginator.total_count or 0) > self.threshold
+        if too_large and window.end - window.begin > 1:
+            return window.bisect(), None
+
+        if not paginator.is_last_page(0, items):
+            query['offset'] = len(items)
+            items.extend(Paginator(self.method, query=query,
+                                   page_size=self.page_size))
+        return None, items
+
+    def __iter__(self):
+        windows = self.initial_windows()
+        deadline = self.deadline or Deadline.current()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            def submit(window):
+                return window, executor.submit(
+                    call_within, deadline, self.scan_window, window)
+
+            # (window, future) pairs in time order
+            entries = []
+            try:
+                while entries or windows:
+                    while windows and len(entries) < self.concurrency:
+                        entries.append(submit(windows.popleft()))
+
+                    expanded = []
+                    for window, future in entries:
+                        halves = future.done() and future.result()[0]
+                        if not halves:
+                            expanded.append((window, future))
+                            continue
+                        self.windows_split += 1
+                        expanded.extend(submit(half) for half in halves)
+                    entries = expanded
+
+                    while entries and entries[0][1].done():
+                        window, future = entries.pop(0)
+                        halves, items = future.result()
+                        if halves:
+                            # bisected meanwhile, expand on the next round
+                            entries.insert(0, (window, future))
+                            break
+                        for item in items:
+                            yield item
+                        self.windows_scanned += 1
+                        self.checkpoint = window.end
+
+                    not_done = [f for _, f in entries if not f.done()]
+                    if not_done and not entries[0][1].done():
+                        wait(not_done, return_when=FIRST_COMPLETED)
+            finally:
+                for _, future in entries:
+                    future.cancel()
@@ -0,0 +1,125 @@
+import codecs
+import json
+import re
+
+
+#: JSON whitespace
+WHITESPACE = re.compile(r'[ \t\n\r]*')
+#: Characters a JSON number starts with
+NUMBER_START = '-0123456789'
+#: Characters a JSON number can go on with after a shorter valid number
+NUMBER_PARTS = '.eE+-0123456789'
+
+
+class JSONItemStream(object):
+    """Incrementally decodes a JSON list response from a file object.
+
+    The stream is read in chunks and elements of the `key` array are yielded
+    one by one as soon as they are parsed, so only the current chunk and
+    item are held in memory. The other top-level members end up in
+    `metadata` as they are read, `totalCount` and friends usually follow
+    the items and are available once iteration is over. A top-level array
+    is streamed as is.
+
+        >>> stream = JSONItemStream(api.find_calls(query={'limit': 1000}))
+        >>> for call in stream:
+        ...     print(call['id'])
+        >>> stream.metadata['totalCount']
+    """
+
+    _decoder = json.JSONDecoder()
+
+    def __init__(self, fp, key='items', chunk_size=64 * 1024):
+        """JSON item stream.
+
+        :param fp: file object returning utf-8 encoded bytes
+        :param key: name of the array to stream
+        :param chunk_size: number of bytes read at once
+        """
+        self.key = key
+        self.chunk_size = chunk_size
+        self.metadata = {}
+        self._fp = fp
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self):
+        """Reads the next chunk, dropping the consumed part of the buffer."""
+        chunk = self._fp.read(self.chunk_size)
+        self._eof = not chunk
+        self._buffer = (self._buffer[self._pos:] +
+                        self._text.decode(chunk, final=self._eof))
+        self._pos = 0
+
+    def _peek(self):
+        """Returns the next non-whitespace character without consuming it."""
+        while True:
+            self._pos = WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if self._eof:
+                return ''
+            self._fill()
+
+    def _expect(self, chars):
+        """Consumes the next character, which must be one of `chars`."""
+        char = self._peek()
+        if not char or char not in chars:
+            raise ValueError('Expecting {!r} at {!r}'.format(
+                chars, self._buffer[self._pos:self._pos + 20]))
+        self._pos += 1
+        return char
+
+    def _decode_value(self):
+        """Decodes the next complete JSON value."""
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(
+                    self._buffer, self._pos)
+            except ValueError:
+                if self._eof:
+                    raise
+            else:
+                # a number could go on in the next chunk, e.g. `12` read
+                # so far of `12.5`
+                cut = end == len(self._buffer) or (
+                    self._buffer[self._pos] in NUMBER_START and
+                    self._buffer[end] in NUMBER_PARTS)
+                if self._eof or not cut:
+                    self._pos = end
+                    return value
+            self._fill()
+
+    def _iter_array(self):
+        """Yields elements of the array at the current position."""
+        self._expect('[')
+        if self._peek() == ']':
+            self._pos += 1
+            return
+        while True:
+            yield self._decode_value()
+            if self._expect(',]') == ']':
+                return
+
+    def __iter__(self):
+        if self._peek() == '[':
+            for item in self._iter_array():
+                yield item
+            return
+
+        self._expect('{')
+        if self._peek() == '}':
+            return
+        while True:
+            key = self._decode_value()
+            self._expect(':')
+            if key == self.key:
+                for item in self._iter_array():
+                    yield item
+            else:
+                self.metadata[key] = self._decode_value()
+            if self._expect(',}') == '}':
+                return
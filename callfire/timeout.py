@@ -0,0 +1,118 @@
+import collections
+import threading
+
+from .exceptions import DeadlineExceeded
+from .ratelimit import _clock
+
+_local = threading.local()
+
+
+class Timeout(collections.namedtuple('Timeout', 'connect read')):
+    """Connect and read timeouts in seconds, None for no timeout."""
+
+    @classmethod
+    def coerce(cls, value):
+        """Returns a `Timeout` from a number, a (connect, read) pair or None.
+
+        :param value: timeout value
+        """
+        if value is None or isinstance(value, cls):
+            return value
+        if isinstance(value, tuple):
+            return cls(*value)
+        return cls(value, value)
+
+    @property
+    def total(self):
+        """The longer of both timeouts, for clients with a single one."""
+        values = [value for value in self if value is not None]
+        return max(values) if values else None
+
+    def cap(self, seconds):
+        """Returns the timeouts shortened to at most `seconds`.
+
+        :param seconds: time left
+        """
+        return Timeout(*(seconds if value is None else min(value, seconds)
+                         for value in self))
+
+
+class Deadline(object):
+    """Point in time by which an operation, with all its requests, is due.
+
+    Within its block every request made by the current thread gets its
+    timeouts shortened to the time left and fails with `DeadlineExceeded`
+    once it has passed; nested deadlines can only make it sooner. Composite
+    operations carry the deadline over to the threads they start.
+
+        >>> with Deadline(30):
+        ...     contacts = list(api.iter_contacts(prefetch=4))
+    """
+
+    def __init__(self, seconds):
+        """Deadline.
+
+        :param seconds: seconds from now
+        """
+        self.expires = _clock() + seconds
+
+    @classmethod
+    def coerce(cls, value):
+        """Returns a `Deadline` from seconds, a `Deadline` or None.
+
+        :param value: deadline value
+        """
+        if value is None or isinstance(value, cls):
+            return value
+        return cls(value)
+
+    @staticmethod
+    def current():
+        """Returns the deadline the current thread is within, if any."""
+        return getattr(_local, 'deadline', None)
+
+    def remaining(self):
+        """Returns the seconds left, negative once expired."""
+        return self.expires - _clock()
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+    def check(self):
+        """Raises `DeadlineExceeded` if the deadline has passed.
+
+        :returns seconds left
+        """
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise DeadlineExceeded(
+                'Deadline exceeded by {:.3f}s'.format(-remaining))
+        return remaining
+
+    def __enter__(self):
+        # the same deadline is entered by worker threads at once, what to
+        # restore is kept per thread
+        previous = self.current()
+        stack = getattr(_local, 'previous', None)
+        if stack is None:
+            stack = _local.previous = []
+        stack.append(previous)
+        if previous is None or self.expires < previous.expires:
+            _local.deadline = self
+        return self
+
+    def __exit__(self, *exc_info):
+        _local.deadline = _local.previous.pop()
+
+
+def call_within(deadline, func, *args, **kwargs):
+    """Calls a function within a deadline, if there is one.
+
+    :param deadline: `Deadline` or None
+    :param func: callable
+    """
+    if deadline is None:
+        return func(*args, **kwargs)
+    with deadline:
+        return func(*args, **kwargs)
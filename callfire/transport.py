@@ -0,0 +1,391 @@
+import abc
+import select
+import socket
+import threading
+
+import six
+from six.moves import http_client, queue
+
+from .multipart import ChunkedBody, is_chunked
+from .response import Response, StreamedResponse
+from .retry import RetryPolicy
+from .timeout import Timeout
+try:
+    # py3
+    from urllib.parse import urlsplit
+    from urllib.error import HTTPError, URLError
+except ImportError:
+    # py2
+    from urlparse import urlsplit
+    from urllib2 import HTTPError, URLError
+
+
+@six.add_metaclass(abc.ABCMeta)
+class Transport(object):
+    """Sends prepared API requests over the wire.
+
+    Implementations raise `HTTPError` for error statuses and `URLError` for
+    connection problems, like urlopen does, so `BaseAPI` can wrap them.
+    """
+
+    @abc.abstractmethod
+    def open(self, request, base_url, auth_header, method, stream=False,
+             timeout=None):
+        """Sends a single request.
+
+        :param request: `BaseRequest` instance
+        :param base_url: API base url
+        :param auth_header: authorization header value
+        :param method: request method
+        :param stream: leave the body on the connection
+        :param timeout: `Timeout` of this request, only passed when set
+        :returns `Response`, or `StreamedResponse` when streaming
+        """
+
+    def close(self):
+        """Releases any connections held by the transport."""
+
+
+class _PooledBody(object):
+    """Response body stream handing its connection back to the pool."""
+
+    def __init__(self, raw, pool, conn, url):
+        self.url = url
+        self.status = raw.status
+        self.reason = raw.reason
+        self.headers = raw.msg
+        self._raw = raw
+        self._pool = pool
+        self._conn = conn
+
+    def geturl(self):
+        return self.url
+
+    def _release_at_eof(self):
+        # http.client closes the response once it is read to the end
+        if self._conn is not None and self._raw.isclosed():
+            self._pool._release(self._conn, self._raw)
+            self._conn = None
+
+    def read(self, amt=None):
+        data = self._raw.read() if amt is None else self._raw.read(amt)
+        self._release_at_eof()
+        return data
+
+    def readinto(self, buffer):
+        if hasattr(self._raw, 'readinto'):
+            size = self._raw.readinto(buffer)
+        else:
+            # py2 responses can only read
+            data = self._raw.read(len(buffer))
+            size = len(data)
+            buffer[:size] = data
+        self._release_at_eof()
+        return size
+
+    def close(self):
+        self._release_at_eof()
+        if self._conn is not None:
+            # an unread body makes the connection unusable
+            self._conn.close()
+            self._conn = None
+        self._raw.close()
+
+
+class HTTPConnectionPool(object):
+    """Thread-safe pool of keep-alive connections to a single host."""
+
+    def __init__(self, scheme, host, port=None, maxsize=10, timeout=None):
+        """Connection pool.
+
+        :param scheme: `http` or `https`
+        :param host: host name
+        :param port: port, defaults to the scheme default
+        :param maxsize: maximum number of idle connections kept alive
+        :param timeout: default timeout in seconds, or a (connect, read)
+        pair
+        """
+        self.scheme = scheme
+        self.host = host
+        self.port = port
+        self.maxsize = maxsize
+        self.timeout = Timeout.coerce(timeout)
+        self.num_connections = 0
+        self.num_requests = 0
+        self._pool = queue.LifoQueue(maxsize)
+        self._lock = threading.Lock()
+
+    def _new_conn(self):
+        """Opens a new connection to the pool host."""
+        with self._lock:
+            self.num_connections += 1
+
+        connection_class = http_client.HTTPConnection
+        if self.scheme == 'https':
+            connection_class = http_client.HTTPSConnection
+        return connection_class(self.host, self.port)
+
+    def _set_timeout(self, conn, timeout):
+        """Applies the timeouts of the next request to a connection.
+
+        A new connection is opened here, so it can be given the connect
+        timeout and the socket the read timeout afterwards.
+
+        :param conn: connection
+        :param timeout: `Timeout` of the request, or None for the default
+        """
+        timeout = timeout or self.timeout or Timeout(None, None)
+        if conn.sock is None:
+            conn.timeout = timeout.connect
+            if conn.timeout is None:
+                conn.timeout = socket.getdefaulttimeout()
+            conn.connect()
+        conn.sock.settimeout(
+            socket.getdefaulttimeout() if timeout.read is None
+            else timeout.read)
+
+    @staticmethod
+    def _is_dropped(conn):
+        """Tells whether the server closed an idle connection.
+
+        An idle connection has nothing to read, so a readable socket means
+        the server closed it or sent something unexpected.
+
+        :param conn: idle connection
+        """
+        if conn.sock is None:
+            return False
+        try:
+            readable, _, _ = select.select([conn.sock], [], [], 0)
+        except (select.error, ValueError):
+            return True
+        return bool(readable)
+
+    def _get_conn(self):
+        """Returns an idle connection or a new one if none is available.
+
+        :returns (connection, reused) pair
+        """
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                return self._new_conn(), False
+            if not self._is_dropped(conn):
+                return conn, True
+            conn.close()
+
+    def _put_conn(self, conn):
+        """Returns a connection to the pool, closing it if the pool is full.
+
+        :param conn: connection
+        """
+        try:
+            self._pool.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+    def _release(self, conn, raw):
+        """Returns the connection of a fully read response to the pool.
+
+        :param conn: connection
+        :param raw: response read to the end
+        """
+        if raw.will_close:
+            conn.close()
+        else:
+            self._put_conn(conn)
+
+    def urlopen(self, method, url, body=None, headers=None, preload=True,
+                timeout=None):
+        """Sends a request over a pooled connection.
+
+        With `preload` the response body is drained, so the connection goes
+        back to the pool before the response is returned. Otherwise it goes
+        back once the streamed body is read to the end.
+
+        :param method: request method
+        :param url: full request url, used for error reporting
+        :param body: request body
+        :param headers: request headers
+        :param preload: read the whole body up front
+        :param timeout: `Timeout` overriding the pool default
+        :returns `Response` or `StreamedResponse` if not preloading
+        """
+        parts = urlsplit(url)
+        path = parts.path or '/'
+        if parts.query:
+            path += '?' + parts.query
+        if hasattr(body, 'read') and is_chunked(headers):
+            body = ChunkedBody(body)
+
+        with self._lock:
+            self.num_requests += 1
+
+        conn, reused = self._get_conn()
+        try:
+            sent = False
+            try:
+                self._set_timeout(conn, timeout)
+                conn.request(method, path, body, headers or {})
+                sent = True
+                raw = conn.getresponse()
+            except socket.timeout:
+                raise
+            except (socket.error, http_client.HTTPException):
+                conn.close()
+                if not reused or not getattr(body, 'rewindable', True):
+                    raise
+                # once sent, the server may have processed the request, so
+                # only an idempotent one is safe to send again
+                if sent and method not in RetryPolicy.IDEMPOTENT_METHODS:
+                    raise
+                # the server may have dropped an idle keep-alive connection,
+                # give it one more go over a fresh one
+                if hasattr(body, 'rewind'):
+                    body.rewind()
+                conn, reused = self._new_conn(), False
+                self._set_timeout(conn, timeout)
+                conn.request(method, path, body, headers or {})
+                raw = conn.getresponse()
+
+            if not preload and raw.status < 400:
+                return StreamedResponse.from_raw(
+                    _PooledBody(raw, self, conn, url))
+
+            data = raw.read()
+        except (socket.error, http_client.HTTPException) as exc:
+            conn.close()
+            raise URLError(exc)
+
+        self._release(conn, raw)
+
+        if raw.status >= 400:
+            raise HTTPError(url, raw.status, raw.reason, raw.msg,
+                            six.BytesIO(data))
+
+        return Response(url, raw.status, raw.reason, raw.msg, data)
+
+    def close(self):
+        """Closes all idle connections."""
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+class PoolManager(object):
+    """Keeps one connection pool per scheme, host and port."""
+
+    def __init__(self, maxsize=10, timeout=None):
+        """Pool manager.
+
+        :param maxsize: maximum number of idle connections kept per host
+        :param timeout: default timeout in seconds, or a (connect, read)
+        pair
+        """
+        self.maxsize = maxsize
+        self.timeout = timeout
+        self.pools = {}
+        self._lock = threading.Lock()
+
+    def connection_pool(self, scheme, host, port=None):
+        """Returns the pool for a given host, creating it on first use.
+
+        :param scheme: `http` or `https`
+        :param host: host name
+        :param port: port
+        """
+        key = (scheme, host, port)
+        with self._lock:
+            pool = self.pools.get(key)
+            if pool is None:
+                pool = HTTPConnectionPool(
+                    scheme, host, port,
+                    maxsize=self.maxsize, timeout=self.timeout)
+                self.pools[key] = pool
+            return pool
+
+    def urlopen(self, method, url, body=None, headers=None, preload=True,
+                timeout=None):
+        """Sends a request over the pool for the url host.
+
+        :param method: request method
+        :param url: full request url
+        :param body: request body
+        :param headers: request headers
+        :param preload: read the whole body up front
+        :param timeout: `Timeout` overriding the pool default
+        :returns `Response` or `StreamedResponse` if not preloading
+        """
+        parts = urlsplit(url)
+        pool = self.connection_pool(parts.scheme, parts.hostname, parts.port)
+        return pool.urlopen(method, url, body, headers, preload=preload,
+                            timeout=timeout)
+
+    def close(self):
+        """Closes idle connections of all pools."""
+        with self._lock:
+            for pool in self.pools.values():
+                pool.close()
+
+
+class HTTPTransport(Transport):
+    """Transport reusing keep-alive connections from a `PoolManager`."""
+
+    def __init__(self, pool_size=10, timeout=None):
+        """HTTP transport.
+
+        :param pool_size: maximum number of idle connections kept per host
+        :param timeout: default timeout in seconds, or a (connect, read)
+        pair
+        """
+        self.pool_manager = PoolManager(maxsize=pool_size, timeout=timeout)
+
+    def open(self, request, base_url, auth_header, method, stream=False,
+             timeout=None):
+        return self.pool_manager.urlopen(
+            method, request.get_url(base_url), request.prepared_body,
+            request.get_headers(auth_header), preload=not stream,
+            timeout=timeout)
+
+    def close(self):
+        self.pool_manager.close()
+
+
+class MemoryTransport(Transport):
+    """Transport answering from memory, for tests and benchmarks.
+
+    Sent requests are recorded in `requests` as
+    (method, url, headers, body) tuples.
+    """
+
+    def __init__(self, handler=None):
+        """Memory transport.
+
+        :param handler: callable receiving (method, url, headers, body) and
+        returning a (status, headers, body) tuple, by default every request
+        gets `200 {}`
+        """
+        self.handler = handler or (lambda *args: (200, {}, b'{}'))
+        self.requests = []
+
+    def open(self, request, base_url, auth_header, method, stream=False,
+             timeout=None):
+        url = request.get_url(base_url)
+        headers = request.get_headers(auth_header)
+        body = request.prepared_body
+        self.requests.append((method, url, headers, body))
+
+        status, response_headers, data = self.handler(
+            method, url, headers, body)
+        if status >= 400:
+            raise HTTPError(url, status, http_client.responses.get(status),
+                            response_headers, six.BytesIO(data))
+
+        reason = http_client.responses.get(status)
+        if stream:
+            return StreamedResponse(
+                url, status, reason, response_headers, six.BytesIO(data))
+        return Response(url, status, reason, response_headers, data)
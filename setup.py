@@ -14,7 +14,7 @@ setup(
     license='MIT',
     author='iMedicare Team',
     author_email='devops@imedicare.com',
-    install_requires=['six'],
+    install_requires=['six', 'futures; python_version < "3"'],
     tests_require=['nose', 'flexmock'],
     test_suite='tests',
     packages=find_packages(exclude=('tests', 'swagger', '.travis.yml')),
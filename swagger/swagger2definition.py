@@ -230,6 +230,93 @@ class Swagger2Definition(object):
 
         return '\n'.join(lines)
 
+    def _generate_iter_method(self, http_method, schema):
+        """Generates iterator method code for a paged leaf.
+
+        :param http_method: http method
+        :param schema: method leaf in object tree
+        :returns iterator method code or None if the leaf is not paged
+        """
+        query_params = [
+            p['name'] for p in schema['parameters'] if p['in'] == 'query']
+        if http_method != 'get' or 'offset' not in query_params:
+            return None
+
+        lines = []
+
+        # header
+        method_name = self._camel_to_underscore(schema['operationId'])
+        iter_name = 'iter_{}'.format(re.sub(r'^(find|get)_', '', method_name))
+        path_args = self._get_method_args(schema['parameters'])
+        method_args = ['self'] + path_args + ['query=None', '**kwargs']
+        lines.append('def {method_name}({args_and_kwargs}):'.format(
+            method_name=iter_name, args_and_kwargs=', '.join(method_args)))
+
+        # docstring
+        lines.append(self._add_line(
+            '"""Iterate over {} items.'.format(method_name), 1))
+        lines.append(self._add_line('', 1))
+        description = (
+            'Fetches pages lazily and yields single items, see `{}` for the '
+            'query params and `Paginator` for the options.'
+        ).format(method_name)
+        for line in self._wrap_lines(description, 79 - 4 * 2):
+            lines.append(self._add_line(line, 1))
+        lines.append(self._add_line('"""', 1))
+
+        # body
+        paginate_args = ['self.{}'.format(method_name)] + path_args
+        paginate_args.extend(['query=query', '**kwargs'])
+        lines.append(self._add_line('return self.paginate({})'.format(
+            ', '.join(paginate_args)), 1))
+        lines.append(self._add_line('', 1))
+
+        return '\n'.join(lines)
+
+    def _generate_download_method(self, http_method, schema):
+        """Generates download method code for a binary data leaf.
+
+        :param http_method: http method
+        :param schema: method leaf in object tree
+        :returns download method code or None if the leaf returns JSON
+        """
+        produces = schema.get('produces') or ['application/json']
+        if http_method != 'get' or produces[0] == 'application/json':
+            return None
+
+        lines = []
+
+        # header
+        method_name = self._camel_to_underscore(schema['operationId'])
+        download_name = 'download_{}'.format(
+            re.sub(r'^get_', '', method_name))
+        path_args = self._get_method_args(schema['parameters'])
+        method_args = ['self'] + path_args + ['dest=None', '**kwargs']
+        lines.append('def {method_name}({args_and_kwargs}):'.format(
+            method_name=download_name,
+            args_and_kwargs=', '.join(method_args)))
+
+        # docstring
+        lines.append(self._add_line(
+            '"""Stream {} data.'.format(method_name), 1))
+        lines.append(self._add_line('', 1))
+        description = (
+            'Saves the body to `dest`, a file path or file object, or returns '
+            'an iterator of chunks without it, see `download` for the options.'
+        )
+        for line in self._wrap_lines(description, 79 - 4 * 2):
+            lines.append(self._add_line(line, 1))
+        lines.append(self._add_line('"""', 1))
+
+        # body
+        download_args = ['self.{}'.format(method_name)] + path_args
+        download_args.extend(['dest=dest', '**kwargs'])
+        lines.append(self._add_line('return self.download({})'.format(
+            ', '.join(download_args)), 1))
+        lines.append(self._add_line('', 1))
+
+        return '\n'.join(lines)
+
     def generate_code(self):
         """Generates code for a given schema.
 
@@ -241,6 +328,13 @@ class Swagger2Definition(object):
             for method in methods:
                 definition = data['paths'][path][method]
                 print(self._generate_method(path, method, definition))
+                iter_method = self._generate_iter_method(method, definition)
+                if iter_method:
+                    print(iter_method)
+                download_method = self._generate_download_method(
+                    method, definition)
+                if download_method:
+                    print(download_method)
 
 
 if __name__ == '__main__':
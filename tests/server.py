@@ -0,0 +1,91 @@
+import json
+import threading
+import time
+
+from six.moves import BaseHTTPServer, socketserver
+
+
+class ThreadingHTTPServer(socketserver.ThreadingMixIn,
+                          BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+
+
+class Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """Keep-alive handler answering with a canned JSON body.
+
+    Requests are recorded on the server as (method, path, headers, body),
+    with header names in `Title-Case` and chunked bodies decoded. A path
+    starting with `/status/<code>` answers with that status code, one
+    starting with `/sleep/<seconds>` answers after that many seconds and
+    one starting with `/drop` closes the connection without an answer.
+    """
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def _handle(self):
+        if 'chunked' in self.headers.get('Transfer-Encoding', ''):
+            body = self._read_chunks()
+        else:
+            length = int(self.headers.get('Content-Length') or 0)
+            body = self.rfile.read(length) if length else b''
+        # py2 lowercases header names, py3 keeps them as sent
+        headers = dict(
+            ('-'.join(part.capitalize() for part in name.split('-')), value)
+            for name, value in self.headers.items())
+        self.server.requests.append((self.command, self.path, headers, body))
+        if self.path.startswith('/drop'):
+            self.close_connection = True
+            return
+
+        status = 200
+        if self.path.startswith('/sleep/'):
+            time.sleep(float(self.path.split('/')[2].split('?')[0]))
+        if self.path.startswith('/status/'):
+            status = int(self.path.split('/')[2].split('?')[0])
+
+        payload = json.dumps(
+            self.server.payload or {'path': self.path}).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _read_chunks(self):
+        chunks = []
+        while True:
+            size = int(self.rfile.readline().split(b';')[0], 16)
+            if not size:
+                self.rfile.readline()
+                return b''.join(chunks)
+            chunks.append(self.rfile.read(size))
+            self.rfile.readline()
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+    def log_message(self, *args):
+        pass
+
+
+class LocalServer(object):
+    """Stand-in API server running in a background thread."""
+
+    def __init__(self, payload=None, handler=Handler):
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.httpd.requests = []
+        self.httpd.payload = payload
+        self.url = 'http://127.0.0.1:{}'.format(self.httpd.server_address[1])
+        self._thread = threading.Thread(target=self.httpd.serve_forever)
+        self._thread.daemon = True
+
+    @property
+    def requests(self):
+        return self.httpd.requests
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
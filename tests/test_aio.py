@@ -0,0 +1,90 @@
+import sys
+import unittest
+
+from . import callfire_base
+from .server import LocalServer
+
+if sys.version_info >= (3, 5):
+    import asyncio
+    from callfire.aio import AsyncCallFireAPI
+
+
+@unittest.skipIf(sys.version_info < (3, 5), 'asyncio client needs 3.5+')
+class AsyncCallFireAPITest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = LocalServer().__enter__()
+        self.addCleanup(self.server.__exit__)
+        self.loop = asyncio.new_event_loop()
+        self.addCleanup(self.loop.close)
+        asyncio.set_event_loop(self.loop)
+        self.addCleanup(asyncio.set_event_loop, None)
+        self.api = AsyncCallFireAPI('username', 'password', pool_size=4)
+        self.api.BASE_URL = self.server.url
+        self.addCleanup(self.run_until_complete, self.api.close())
+
+    def run_until_complete(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def test_concurrent_requests_share_pool(self):
+        responses = self.run_until_complete(asyncio.gather(
+            *[self.api.get_call(i) for i in range(50)]))
+
+        self.assertEqual(
+            [response.json() for response in responses],
+            [{'path': '/calls/{}'.format(i)} for i in range(50)])
+        pool, = self.api.transport.pools.values()
+        self.assertEqual(pool.num_requests, 50)
+        self.assertLessEqual(pool.num_connections, 4)
+
+    def test_post_body(self):
+        response = self.run_until_complete(
+            self.api.send_texts(body=[{'message': 'Hi!'}]))
+
+        self.assertEqual(response.status, 200)
+        method, path, headers, body = self.server.requests[0]
+        self.assertEqual((method, path), ('POST', '/texts'))
+        self.assertEqual(body, b'[{"message": "Hi!"}]')
+        self.assertEqual(
+            headers['Authorization'], self.api._get_auth_header())
+
+    def test_post_over_dropped_connection_not_resent(self):
+        self.run_until_complete(self.api.get_account())
+        self.api.BASE_URL = '{}/drop'.format(self.server.url)
+        with self.assertRaises(callfire_base.CallFireError):
+            self.run_until_complete(
+                self.api.send_texts(body=[{'message': 'Hi!'}]))
+
+        self.assertEqual(
+            [request[:2] for request in self.server.requests],
+            [('GET', '/me/account'), ('POST', '/drop/texts')])
+
+    def test_streamed_upload(self):
+        rows = ({'homePhone': '1213555{:04d}'.format(i)} for i in range(500))
+        self.run_until_complete(self.api.upload_contact_list(rows))
+
+        method, path, headers, body = self.server.requests[0]
+        self.assertEqual(headers['Transfer-Encoding'], 'chunked')
+        self.assertNotIn('Content-Length', headers)
+        self.assertIn(b'homePhone\r\n12135550000\r\n', body)
+        self.assertIn(b'\r\n12135550499\r\n', body)
+
+    def test_sync_helpers_not_available(self):
+        for call in (lambda: self.api.iter_calls(),
+                     lambda: self.api.map('get_call', [1]),
+                     lambda: self.api.download_call_recording_mp3(1),
+                     lambda: self.api.deadline(5)):
+            with self.assertRaises(NotImplementedError):
+                call()
+        self.assertEqual(self.server.requests, [])
+
+    def test_error_wrapped(self):
+        self.api.BASE_URL = '{}/status/404'.format(self.server.url)
+        with self.assertRaises(callfire_base.CallFireError) as cm:
+            self.run_until_complete(self.api.get_account())
+
+        self.assertEqual(cm.exception.wrapped_exc.code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import json
+import os
+import re
+import shutil
+import tempfile
+import unittest
+
+from . import callfire
+
+from callfire.transport import MemoryTransport
+
+
+class ArchiveTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.calls = [{'id': i} for i in range(1, 8)]
+        self.honour_range = True
+        self.transport = MemoryTransport(self.handler)
+        self.api = callfire.CallFireAPI(
+            'username', 'password', transport=self.transport)
+        self.reports = []
+
+    def recording(self, recording_id):
+        return 'recording {} '.format(recording_id).encode() * 1000
+
+    def handler(self, method, url, headers, body):
+        match = re.search(r'/calls/broadcasts/7/calls\?(.*)$', url)
+        if match:
+            query = dict(part.split('=') for part in match.group(1).split('&'))
+            offset, limit = int(query['offset']), int(query['limit'])
+            page = {'items': self.calls[offset:offset + limit],
+                    'totalCount': len(self.calls)}
+            return 200, {}, json.dumps(page).encode()
+
+        match = re.search(r'/calls/(\d+)/recordings$', url)
+        if match:
+            call_id = int(match.group(1))
+            if call_id == 5:
+                return 500, {}, b'{}'
+            items = [{'id': call_id * 10}, {'id': call_id * 10 + 1}]
+            return 200, {}, json.dumps({'items': items}).encode()
+
+        recording_id = int(re.search(r'/recordings/(\d+)\.mp3$', url).group(1))
+        if recording_id == 31:
+            return 404, {}, b'{}'
+        data = self.recording(recording_id)
+        if 'Range' in headers and self.honour_range:
+            start = int(headers['Range'][len('bytes='):-1])
+            return 206, {}, data[start:]
+        return 200, {}, data
+
+    def archive(self, **kwargs):
+        archiver = self.api.archive_recordings(
+            7, self.directory, page_size=3, concurrency=4,
+            report=self.reports.append, **kwargs)
+        return archiver, list(archiver)
+
+    def read(self, name):
+        with open(os.path.join(self.directory, name), 'rb') as stream:
+            return stream.read()
+
+    def test_archive_broadcast(self):
+        archiver, results = self.archive()
+
+        failed = sorted((r.call_id, r.recording_id)
+                        for r in results if not r.ok)
+        self.assertEqual(failed, [(3, 31), (5, None)])
+        self.assertEqual(archiver.calls_listed, 7)
+        self.assertEqual(archiver.recordings_saved, 11)
+        self.assertEqual(archiver.recordings_failed, 2)
+        self.assertEqual(
+            archiver.bytes_received,
+            sum(r.size for r in results))
+        self.assertGreater(archiver.throughput, 0)
+        self.assertIs(self.reports[-1], archiver)
+
+        self.assertEqual(len(os.listdir(self.directory)), 11)
+        self.assertEqual(self.read('6-61.mp3'), self.recording(61))
+        self.assertFalse(os.path.exists(
+            os.path.join(self.directory, '3-31.mp3.part')))
+
+    def test_skip_and_resume(self):
+        with open(os.path.join(self.directory, '1-10.mp3'), 'wb') as stream:
+            stream.write(b'archived')
+        with open(os.path.join(self.directory, '1-11.mp3.part'),
+                  'wb') as stream:
+            stream.write(self.recording(11)[:1234])
+        with open(os.path.join(self.directory, '2-20.mp3.part'),
+                  'wb') as stream:
+            stream.write(self.recording(20)[:7])
+
+        self.calls = self.calls[:2]
+        archiver, results = self.archive()
+
+        statuses = dict((r.recording_id, r.status) for r in results)
+        self.assertEqual(statuses, {
+            10: 'skipped', 11: 'resumed', 20: 'resumed', 21: 'saved'})
+        self.assertEqual(self.read('1-10.mp3'), b'archived')
+        self.assertEqual(self.read('1-11.mp3'), self.recording(11))
+        self.assertEqual(self.read('2-20.mp3'), self.recording(20))
+        ranges = [headers.get('Range')
+                  for _, url, headers, _ in self.transport.requests
+                  if url.endswith('/recordings/11.mp3')]
+        self.assertEqual(ranges, ['bytes=1234-'])
+        self.assertEqual(archiver.recordings_skipped, 1)
+        self.assertEqual(archiver.recordings_resumed, 2)
+
+    def test_range_ignored_rewrites_partial(self):
+        with open(os.path.join(self.directory, '1-10.mp3.part'),
+                  'wb') as stream:
+            stream.write(b'garbage')
+
+        self.honour_range = False
+        self.calls = self.calls[:1]
+        _, results = self.archive()
+
+        self.assertEqual([r.status for r in results], ['saved', 'saved'])
+        self.assertEqual(self.read('1-10.mp3'), self.recording(10))
+
+    def test_embedded_recordings(self):
+        self.calls = [{'id': 4, 'records': [
+            {'recordings': [{'id': 40}]}, {'recordings': [{'id': 41}]}]}]
+        _, results = self.archive()
+
+        self.assertEqual([r.recording_id for r in results], [40, 41])
+        self.assertFalse(any(url.endswith('/recordings')
+                             for _, url, _, _ in self.transport.requests))
+
+
+if __name__ == '__main__':
+    unittest.main()
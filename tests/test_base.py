@@ -22,7 +22,8 @@ class FakeResponse(object):
     def __init__(self, prepared):
         self._prepared = prepared
     def read(self):
-        return self._prepared.data
+        data = self._prepared.data
+        return data.read() if hasattr(data, 'read') else data
 
 
 class BaseTest(unittest.TestCase):
@@ -102,6 +103,38 @@ class BaseTest(unittest.TestCase):
         )
         self.assertEqual(self.base._get_auth_header(), expected_auth_header)
 
+    def test_auth_header_follows_credentials(self):
+        auth_header = self.base._get_auth_header()
+        self.assertIs(self.base._get_auth_header(), auth_header)
+
+        self.base.password = 'other'
+        self.assertNotEqual(self.base._get_auth_header(), auth_header)
+
+    def test_encode_query(self):
+        for query in ({'limit': 10, 'fields': 'id,name'},
+                      {'label': u'a b&c=d', 'running': True},
+                      {'id': [1, 2], 'name': 'x'},
+                      {'label': 'abc\n'},
+                      {}):
+            self.assertEqual(
+                callfire_base.encode_query(query),
+                callfire_base.urlencode(query))
+
+    def test_prepare(self):
+        request = callfire_base.JSONRequest(
+            path='/calls', query={'limit': 1}, body=[42])
+        prepared = request.prepare('http://base_url.com', 'Basic x', 'PUT')
+
+        self.assertEqual(prepared.get_method(), 'PUT')
+        self.assertEqual(
+            prepared.get_full_url(), 'http://base_url.com/calls?limit=1')
+        self.assertEqual(prepared.data, b'[42]')
+        self.assertEqual(prepared.get_header('Authorization'), 'Basic x')
+
+        request.get_headers('Basic x')['Authorization'] = 'changed'
+        self.assertEqual(
+            request.get_headers('Basic x')['Authorization'], 'Basic x')
+
     def test_json_request(self):
         request = callfire_base.JSONRequest(path="/test", body=[42])
 
@@ -126,9 +159,11 @@ class BaseTest(unittest.TestCase):
         content = response.read()
 
         with open(os.__file__, 'rb') as stream:
-            payload = callfire_base.MultipartRequest.generate_multipart(stream)
+            payload = callfire_base.MultipartRequest.generate_multipart(
+                stream, request.prepared_body.boundary)
 
         self.assertEqual(payload, content)
+        self.assertEqual(len(request.prepared_body), len(content))
 
 
 if __name__ == '__main__':
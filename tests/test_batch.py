@@ -0,0 +1,71 @@
+import threading
+import time
+import unittest
+
+from . import callfire
+
+from callfire.transport import MemoryTransport
+
+
+class BatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.in_flight = self.max_in_flight = 0
+        self.lock = threading.Lock()
+        self.contact_fetched = threading.Event()
+        self.hold_first_call = False
+        self.api = callfire.CallFireAPI(
+            'username', 'password', transport=MemoryTransport(self.handler))
+
+    def handler(self, method, url, headers, body):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        call_id = int(url.rsplit('/', 1)[1])
+        if '/contacts/' in url:
+            self.contact_fetched.set()
+        elif call_id == 1 and self.hold_first_call:
+            self.contact_fetched.wait(5)
+            time.sleep(0.05)
+        time.sleep(0.001)
+
+        with self.lock:
+            self.in_flight -= 1
+
+        if call_id % 3 == 0:
+            return 404, {}, b'{"error": "Not Found"}'
+        return 200, {}, '{{"id": {}}}'.format(call_id).encode()
+
+    def test_map_ordered(self):
+        results = list(self.api.map('get_call', range(1, 31), concurrency=4))
+
+        self.assertEqual([r.args for r in results],
+                         [(i,) for i in range(1, 31)])
+        self.assertLessEqual(self.max_in_flight, 4)
+        for result in results:
+            call_id, = result.args
+            if call_id % 3 == 0:
+                self.assertFalse(result.ok)
+                self.assertIsInstance(result.error, callfire.CallFireError)
+                with self.assertRaises(callfire.CallFireError):
+                    result.result()
+            else:
+                self.assertTrue(result.ok)
+                self.assertEqual(result.result().json(), {'id': call_id})
+
+    def test_batch_as_completed(self):
+        self.hold_first_call = True
+        calls = [(self.api.get_call, (i,)) for i in range(1, 5)]
+        calls.append(('get_contact', (), {'id': 7}))
+        results = list(self.api.batch(calls, concurrency=5, ordered=False))
+
+        indexes = [r.index for r in results]
+        self.assertEqual(sorted(indexes), list(range(5)))
+        # the first call waits for the contact, which finished earlier
+        self.assertLess(indexes.index(4), indexes.index(0))
+        self.assertEqual(results[indexes.index(4)].response.json(), {'id': 7})
+
+
+if __name__ == '__main__':
+    unittest.main()
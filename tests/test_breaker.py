@@ -0,0 +1,101 @@
+import time
+import unittest
+
+from . import callfire
+
+from callfire.transport import MemoryTransport
+
+
+class CircuitBreakerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.status = 200
+        self.delay = 0
+        self.transport = MemoryTransport(self.handler)
+        self.breaker = callfire.CircuitBreaker(
+            failure_threshold=0.5, minimum_requests=4, reset_timeout=0.05)
+        self.api = callfire.CallFireAPI(
+            'username', 'password', transport=self.transport,
+            circuit_breaker=self.breaker)
+
+    def handler(self, method, url, headers, body):
+        time.sleep(self.delay)
+        return self.status, {}, b'{}'
+
+    def call(self, times=1):
+        for _ in range(times):
+            try:
+                self.api.get_text(1)
+            except callfire.CallFireError as exc:
+                error = exc
+            else:
+                error = None
+        return error
+
+    def test_opens_on_failure_rate(self):
+        self.call(2)
+        self.status = 502
+        self.call(1)
+        self.assertEqual(self.breaker.state, 'closed')
+        self.call(1)
+        self.assertEqual(self.breaker.state, 'open')
+        self.assertEqual(self.breaker.opened, 1)
+
+        error = self.call(3)
+        self.assertIsInstance(error, callfire.CircuitOpenError)
+        self.assertGreater(error.retry_in, 0)
+        self.assertEqual(self.breaker.rejected, 3)
+        self.assertEqual(len(self.transport.requests), 4)
+
+    def test_client_errors_are_not_failures(self):
+        self.status = 404
+        self.call(10)
+        self.assertEqual(self.breaker.state, 'closed')
+        self.assertEqual(self.breaker.failure_rate, 0)
+
+    def test_half_open_probe(self):
+        self.status = 500
+        self.call(4)
+        self.assertEqual(self.breaker.state, 'open')
+
+        time.sleep(0.06)
+        self.call(1)
+        self.assertEqual(self.breaker.state, 'open')
+        self.assertEqual(self.breaker.opened, 2)
+
+        time.sleep(0.06)
+        self.status = 200
+        self.assertIsNone(self.call(1))
+        self.assertEqual(self.breaker.state, 'closed')
+        self.assertEqual(len(self.transport.requests), 6)
+
+    def test_aborted_probe_released(self):
+        self.status = 500
+        self.call(4)
+        time.sleep(0.06)
+
+        with self.api.deadline(-1):
+            with self.assertRaises(callfire.DeadlineExceeded):
+                self.api.get_text(1)
+        self.assertEqual(self.breaker.state, 'half-open')
+
+        self.status = 200
+        self.assertIsNone(self.call(1))
+        self.assertEqual(self.breaker.state, 'closed')
+
+    def test_half_open_limits_probes(self):
+        self.breaker.state = 'half-open'
+        self.breaker.before_request()
+        with self.assertRaises(callfire.CircuitOpenError):
+            self.breaker.before_request()
+
+    def test_opens_on_slow_calls(self):
+        self.breaker.slow_call_duration = 0.01
+        self.delay = 0.02
+        self.call(4)
+        self.assertEqual(self.breaker.state, 'open')
+        self.assertEqual(self.breaker.failure_rate, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import json
+import threading
+import unittest
+
+from . import callfire
+
+from callfire.bulk import chunked
+from callfire.transport import MemoryTransport
+
+
+class BulkSenderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.statuses = {}
+        self.lock = threading.Lock()
+        self.transport = MemoryTransport(self.handler)
+        self.api = callfire.CallFireAPI(
+            'username', 'password', transport=self.transport)
+
+    def handler(self, method, url, headers, body):
+        recipients = json.loads(body.decode('utf-8'))
+        first = recipients[0]['phoneNumber']
+        with self.lock:
+            statuses = self.statuses.get(first)
+            status = statuses.pop(0) if statuses else 200
+        if status != 200:
+            return status, {}, b'{}'
+        items = [{'id': int(recipient['phoneNumber'])}
+                 for recipient in recipients]
+        return status, {}, json.dumps({'items': items}).encode('utf-8')
+
+    def recipients(self, count):
+        for number in range(count):
+            yield {'phoneNumber': str(number), 'message': 'hi'}
+
+    def test_chunked(self):
+        self.assertEqual(list(chunked(range(5), 2)), [[0, 1], [2, 3], [4]])
+        self.assertEqual(list(chunked([], 2)), [])
+
+    def test_chunks_sent(self):
+        sender = self.api.bulk('send_texts', self.recipients(25),
+                               chunk_size=10, query={'campaignId': 1})
+        results = sorted(sender, key=lambda result: result.index)
+
+        self.assertEqual([(r.offset, len(r.items)) for r in results],
+                         [(0, 10), (10, 10), (20, 5)])
+        created = [text['id'] for r in results for text in r.created()]
+        self.assertEqual(created, list(range(25)))
+        self.assertEqual((sender.chunks_sent, sender.items_sent), (3, 25))
+        self.assertTrue(all(request[1].endswith('/texts?campaignId=1')
+                            for request in self.transport.requests))
+
+    def test_refused_chunks_retried_last(self):
+        self.statuses = {'0': [503], '20': [429, 429, 429]}
+        sender = self.api.bulk(self.api.send_calls, self.recipients(30),
+                               chunk_size=10, ordered=True)
+        results = list(sender)
+
+        self.assertEqual([(r.index, r.ok, r.attempts) for r in results],
+                         [(1, True, 1), (0, True, 2), (2, False, 3)])
+        self.assertEqual(results[-1].error.wrapped_exc.code, 429)
+        self.assertEqual(len(self.transport.requests), 6)
+        self.assertEqual(sender.chunks_retried, 3)
+        self.assertEqual(sender.chunks_failed, 1)
+        self.assertEqual(sender.items_sent, 20)
+
+    def test_other_failures_not_retried(self):
+        self.statuses = {'0': [500]}
+        results = list(self.api.bulk('send_texts', self.recipients(3)))
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0].error.wrapped_exc.code, 500)
+        self.assertEqual(results[0].created(), [])
+        self.assertEqual(len(self.transport.requests), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,203 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from flexmock import flexmock
+
+from . import callfire
+
+from callfire.cache import cache_key, is_affected
+from callfire.transport import MemoryTransport
+
+
+class MemoryCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = MemoryTransport(self.handler)
+        self.cache = callfire.MemoryCache(
+            maxsize=4, ttl=60, ttls={'/calls': 0, '/me/account': 0.05})
+        self.api = callfire.CallFireAPI(
+            'username', 'password', transport=self.transport,
+            cache=self.cache)
+
+    def handler(self, method, url, headers, body):
+        count = len(self.transport.requests)
+        return 200, {}, '{{"n": {}}}'.format(count).encode()
+
+    def test_hit(self):
+        first = self.api.get_contact_list(1)
+        second = self.api.get_contact_list(1)
+
+        self.assertEqual(len(self.transport.requests), 1)
+        self.assertIsNot(first, second)
+        self.assertIs(first.body, second.body)
+        self.assertEqual(second.json(), {'n': 1})
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 1))
+
+    def test_query_is_part_of_key(self):
+        self.api.get_contact_list(1, query={'fields': 'id', 'a': 1})
+        self.api.get_contact_list(1, query={'a': 1, 'fields': 'id'})
+        self.api.get_contact_list(1, query={'fields': 'name'})
+        self.assertEqual(len(self.transport.requests), 2)
+
+    def test_ttls(self):
+        self.api.get_call(1)
+        self.api.get_call(1)
+        self.assertEqual(len(self.transport.requests), 2)
+        self.assertEqual((self.cache.hits, self.cache.misses), (0, 0))
+
+        self.api.get_account()
+        self.api.get_account()
+        self.assertEqual(len(self.transport.requests), 3)
+        time.sleep(0.06)
+        self.api.get_account()
+        self.assertEqual(len(self.transport.requests), 4)
+
+    def test_lru_eviction(self):
+        for i in range(5):
+            self.api.get_contact_list(i)
+        self.api.get_contact_list(4)
+        self.api.get_contact_list(0)
+
+        self.assertEqual(len(self.cache), 4)
+        self.assertEqual(self.cache.evictions, 2)
+        self.assertEqual(len(self.transport.requests), 6)
+
+    def test_invalidation(self):
+        self.api.get_contact_list(5)
+        self.api.get_contact_list_items(5)
+        self.api.find_contact_lists()
+        self.api.get_contact_list(55)
+
+        self.api.update_contact_list(5, body={'name': 'x'})
+        self.assertEqual(self.cache.invalidations, 3)
+        self.assertEqual(len(self.cache), 1)
+
+        self.api.get_contact_list(5)
+        self.api.get_contact_list(55)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_streaming_bypasses_cache(self):
+        self.api.get_contact_list(1)
+        with self.api.streaming():
+            with self.api.get_contact_list(1) as response:
+                self.assertEqual(response.json(), {'n': 2})
+        self.assertEqual(self.cache.hits, 0)
+
+    def test_extra_headers_bypass_cache(self):
+        with self.api.with_headers({'Range': 'bytes=10-'}):
+            self.api.get_campaign_sound(1)
+        self.api.get_campaign_sound(1)
+        self.assertEqual(len(self.transport.requests), 2)
+        self.assertEqual(self.cache.misses, 1)
+
+    def test_cache_key(self):
+        self.assertNotEqual(cache_key('a', 'GET', '/me/account'),
+                            cache_key('b', 'GET', '/me/account'))
+        self.assertEqual(cache_key('a', 'GET', '/x', {'b': [1], 'a': 2}),
+                         cache_key('a', 'GET', '/x', {'a': 2, 'b': [1]}))
+
+    def test_is_affected(self):
+        self.assertTrue(is_affected('/campaigns/sounds/1.mp3',
+                                    '/campaigns/sounds/1'))
+        self.assertTrue(is_affected('/contacts/lists', '/contacts/lists/1'))
+        self.assertFalse(is_affected('/contacts/lists/12',
+                                     '/contacts/lists/1'))
+        self.assertFalse(is_affected('/contacts/lists/2/items',
+                                     '/contacts/lists/1'))
+
+
+class SQLiteCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'cache.db')
+        self.transport = MemoryTransport(
+            lambda *args: (200, {'X-Id': '1'}, b'{"id": 1}' + b' ' * 90))
+        self.cache = self.make_cache()
+
+    def make_cache(self, **kwargs):
+        kwargs.setdefault('ttls', {'/me/account': 0.05})
+        cache = callfire.SQLiteCache(self.path, **kwargs)
+        self.addCleanup(cache.close)
+        return cache
+
+    def make_api(self, cache):
+        return callfire.CallFireAPI(
+            'username', 'password', transport=self.transport, cache=cache)
+
+    def test_shared_between_caches(self):
+        self.make_api(self.cache).get_caller_ids()
+        other = self.make_cache()
+        response = self.make_api(other).get_caller_ids()
+
+        self.assertEqual(len(self.transport.requests), 1)
+        self.assertEqual(response.json(), {'id': 1})
+        self.assertEqual(response.headers, {'X-Id': '1'})
+        self.assertEqual((other.hits, other.misses), (1, 0))
+        self.assertEqual(len(other), 1)
+
+    def test_ttl(self):
+        api = self.make_api(self.cache)
+        api.get_account()
+        api.get_account()
+        time.sleep(0.06)
+        api.get_account()
+        self.assertEqual(len(self.transport.requests), 2)
+        self.assertEqual((self.cache.hits, self.cache.misses), (1, 2))
+
+    def test_size_bounded_eviction(self):
+        cache = self.make_cache(max_bytes=350)
+        api = self.make_api(cache)
+        for i in range(3):
+            api.get_campaign_sound(i)
+        api.get_campaign_sound(0)
+        # make the first sound the most recently used one
+        cache._connection().execute(
+            "UPDATE responses SET accessed = accessed + 10 "
+            "WHERE path = '/campaigns/sounds/0'")
+        api.get_campaign_sound(3)
+
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(len(cache), 3)
+        api.get_campaign_sound(0)
+        api.get_campaign_sound(1)
+        self.assertEqual(len(self.transport.requests), 5)
+
+    def test_invalidation(self):
+        api = self.make_api(self.cache)
+        api.get_contact_list(5)
+        api.get_contact_list_items(5)
+        api.find_contact_lists()
+        api.get_contact_list(55)
+        api.delete_contact_list(5)
+
+        self.assertEqual(self.cache.invalidations, 3)
+        self.assertEqual(len(self.cache), 1)
+
+    def test_connection_per_thread_and_process(self):
+        conn = self.cache._connection()
+        self.assertIs(self.cache._connection(), conn)
+
+        connections = []
+
+        def connect():
+            connections.append(self.cache._connection())
+            self.cache.close()
+
+        thread = threading.Thread(target=connect)
+        thread.start()
+        thread.join()
+        self.assertIsNot(connections[0], conn)
+
+        flexmock(os).should_receive('getpid').and_return(-1)
+        self.assertIsNot(self.cache._connection(), conn)
+        conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
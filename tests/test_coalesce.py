@@ -0,0 +1,83 @@
+import threading
+import unittest
+
+from . import callfire
+
+from callfire.transport import MemoryTransport
+
+
+class SingleFlightTest(unittest.TestCase):
+
+    def setUp(self):
+        self.release = threading.Event()
+        self.transport = MemoryTransport(self.handler)
+        self.api = callfire.CallFireAPI(
+            'username', 'password', transport=self.transport, coalesce=True)
+
+    def handler(self, method, url, headers, body):
+        self.release.wait(5)
+        if url.endswith('/404'):
+            return 404, {}, b'{}'
+        return 200, {}, '{{"url": "{}"}}'.format(url).encode()
+
+    def run_concurrently(self, func, count):
+        """Runs func in count threads once all of them are waiting."""
+        outcomes = [None] * count
+
+        def call(index):
+            try:
+                outcomes[index] = func()
+            except callfire.CallFireError as exc:
+                outcomes[index] = exc
+
+        threads = [threading.Thread(target=call, args=(i,))
+                   for i in range(count)]
+        for thread in threads:
+            thread.start()
+        while (self.api.single_flight.calls +
+               self.api.single_flight.coalesced) < count:
+            threading.Event().wait(0.001)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+        return outcomes
+
+    def test_identical_requests_coalesced(self):
+        responses = self.run_concurrently(
+            lambda: self.api.get_call_broadcast_stats(1), 10)
+
+        self.assertEqual(len(self.transport.requests), 1)
+        self.assertEqual(self.api.single_flight.calls, 1)
+        self.assertEqual(self.api.single_flight.coalesced, 9)
+        self.assertEqual(len(set(map(id, responses))), 10)
+        for response in responses:
+            self.assertEqual(response.json()['url'],
+                             'https://api.callfire.com/v2'
+                             '/calls/broadcasts/1/stats')
+        self.assertEqual(len(set(id(r.body) for r in responses)), 1)
+
+    def test_different_queries_not_coalesced(self):
+        self.run_concurrently(
+            lambda: self.api.get_contact(
+                1, query={'fields': threading.current_thread().name}), 4)
+
+        self.assertEqual(len(self.transport.requests), 4)
+        self.assertEqual(self.api.single_flight.coalesced, 0)
+
+    def test_error_shared(self):
+        errors = self.run_concurrently(lambda: self.api.get_contact(404), 3)
+
+        self.assertEqual(len(self.transport.requests), 1)
+        for error in errors:
+            self.assertIsInstance(error, callfire.CallFireError)
+
+    def test_writes_not_coalesced(self):
+        self.release.set()
+        self.api.delete_contact(1)
+        self.api.delete_contact(1)
+        self.assertEqual(len(self.transport.requests), 2)
+        self.assertEqual(self.api.single_flight.calls, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+import json
+import unittest
+
+import six
+
+from . import callfire
+from .server import LocalServer
+
+from callfire.multipart import ChunkedBody, MultipartBody
+from callfire.transport import MemoryTransport
+
+
+def rows(count):
+    for number in range(count):
+        yield {'firstName': u'Zoë {}'.format(number),
+               'homePhone': '1213555{:04d}'.format(number)}
+
+
+class CSVStreamTest(unittest.TestCase):
+
+    def test_encoding(self):
+        stream = callfire.CSVStream(rows(2), fieldnames=['homePhone',
+                                                         'firstName', 'x'])
+        self.assertEqual(b''.join(stream).decode('utf-8').splitlines(), [
+            u'homePhone,firstName,x',
+            u'12135550000,Zoë 0,',
+            u'12135550001,Zoë 1,'])
+        self.assertEqual(stream.rows_written, 2)
+
+        stream = callfire.CSVStream([[1, 'a,b'], [2, None]])
+        self.assertEqual(b''.join(stream), b'1,"a,b"\r\n2,\r\n')
+        self.assertEqual(list(callfire.CSVStream([])), [])
+
+    def test_blocks(self):
+        blocks = list(callfire.CSVStream(rows(1000), block_size=1000))
+        self.assertGreater(len(blocks), 10)
+        self.assertTrue(all(len(block) < 1100 for block in blocks))
+        self.assertEqual(b''.join(blocks).count(b'\r\n'), 1001)
+
+    def test_streamed_multipart_body(self):
+        body = MultipartBody(iter([b'a', b'', b'bc']), boundary=b'xyz')
+        self.assertIsNone(body.length)
+        self.assertTrue(body)
+        with self.assertRaises(TypeError):
+            len(body)
+        self.assertTrue(body.rewindable)
+        self.assertEqual(body.read(3), b'--x')
+        self.assertFalse(body.rewindable)
+        self.assertTrue(body.read().endswith(b'\r\n\r\nabc\r\n--xyz--\r\n'))
+        with self.assertRaises(ValueError):
+            body.rewind()
+
+    def test_chunked_body(self):
+        body = MultipartBody(iter([b'data']), boundary=b'xyz')
+        chunks = list(iter(ChunkedBody(body, chunk_size=40).read, b''))
+
+        self.assertEqual(chunks[-1], b'0\r\n\r\n')
+        decoded = b''
+        for chunk in chunks[:-1]:
+            size, data = chunk.split(b'\r\n', 1)
+            self.assertLessEqual(int(size, 16), 40)
+            self.assertEqual(len(data), int(size, 16) + 2)
+            decoded += data[:-2]
+        self.assertTrue(decoded.endswith(b'\r\n\r\ndata\r\n--xyz--\r\n'))
+        self.assertEqual(body.bytes_read, len(decoded))
+
+    def test_upload_contact_list(self):
+        with LocalServer() as server:
+            api = callfire.CallFireAPI('username', 'password', pool_size=1)
+            api.BASE_URL = server.url
+            self.addCleanup(api.close)
+            api.upload_contact_list(rows(5000), ['firstName', 'homePhone'],
+                                    block_size=4096)
+
+        method, path, headers, body = server.requests[0]
+        self.assertEqual(path, '/contacts/lists/upload')
+        self.assertEqual(headers['Transfer-Encoding'], 'chunked')
+        self.assertNotIn('Content-Length', headers)
+        self.assertIn(b'filename="contacts.csv"', body)
+        self.assertIn(u'Zoë 4999,12135554999\r\n'.encode('utf-8'), body)
+        self.assertEqual(body.count(b'\r\n'), 5001 + 5)
+
+    @unittest.skipIf(six.PY2, 'urllib2 cannot send chunked bodies')
+    def test_urllib_transport(self):
+        with LocalServer() as server:
+            api = callfire.CallFireAPI('username', 'password')
+            api.BASE_URL = server.url
+            api.upload_contact_list([{'homePhone': '12135551100'}])
+
+        method, path, headers, body = server.requests[0]
+        self.assertEqual(headers['Transfer-Encoding'], 'chunked')
+        self.assertIn(b'homePhone\r\n12135551100\r\n', body)
+
+    @unittest.skipIf(not six.PY2, 'urllib sends chunked bodies')
+    def test_urllib_transport_py2(self):
+        api = callfire.CallFireAPI('username', 'password')
+        with self.assertRaises(ValueError):
+            api.upload_contact_list(rows(1))
+
+    def test_streamed_upload_not_retried(self):
+        attempts = []
+
+        def handler(method, url, headers, body):
+            attempts.append(body.read())
+            return 503, {}, b'{}'
+
+        api = callfire.CallFireAPI(
+            'username', 'password', transport=MemoryTransport(handler),
+            retry_policy=callfire.RetryPolicy(retry_post=True))
+        with self.assertRaises(callfire.CallFireError):
+            api.upload_contact_list(rows(3))
+        self.assertEqual(len(attempts), 1)
+
+    def test_chunked_create_contacts(self):
+        bodies = []
+
+        def handler(method, url, headers, body):
+            bodies.append(json.loads(body.decode('utf-8')))
+            return 200, {}, b'{"items": []}'
+
+        api = callfire.CallFireAPI(
+            'username', 'password', transport=MemoryTransport(handler))
+        sender = api.bulk('create_contacts', rows(250), chunk_size=100)
+        self.assertTrue(all(result.ok for result in sender))
+        self.assertEqual(sorted(len(body) for body in bodies),
+                         [50, 100, 100])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import io
+import os
+import tempfile
+import unittest
+
+from . import callfire
+from .server import LocalServer
+
+from callfire.transport import MemoryTransport
+
+
+class DownloadTest(unittest.TestCase):
+
+    def setUp(self):
+        self.data = os.urandom(300000)
+        self.transport = MemoryTransport(lambda *args: (200, {}, self.data))
+        self.api = callfire.CallFireAPI(
+            'username', 'password', transport=self.transport)
+
+    def test_download_to_path(self):
+        fd, path = tempfile.mkstemp(suffix='.mp3')
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+
+        size = self.api.download_call_recording_mp3(42, dest=path)
+
+        self.assertEqual(size, len(self.data))
+        with open(path, 'rb') as stream:
+            self.assertEqual(stream.read(), self.data)
+        self.assertTrue(
+            self.transport.requests[0][1].endswith('/calls/recordings/42.mp3'))
+
+    def test_download_to_file_object_reuses_buffer(self):
+        dest = io.BytesIO()
+        self.api.download('get_campaign_sound_data_wav', 1, dest=dest)
+        buffer = self.api._context.buffer
+        self.api.download_media_data(1, 'png', dest=dest, buffer_size=1024)
+        self.api.download_media_data(2, 'png', dest=dest, buffer_size=1024)
+
+        self.assertEqual(dest.getvalue(), self.data * 3)
+        self.assertIsNot(self.api._context.buffer, buffer)
+        self.assertEqual(len(self.api._context.buffer), 1024)
+
+    def test_download_chunks(self):
+        buffer = bytearray(4096)
+        chunks = self.api.download_media_data_binary(1, buffer=buffer)
+
+        data = b''
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk), 4096)
+            # chunks are read into the shared buffer
+            self.assertEqual(chunk.tobytes(), bytes(buffer[:len(chunk)]))
+            data += chunk.tobytes()
+        self.assertEqual(data, self.data)
+
+    def test_download_releases_pooled_connection(self):
+        with LocalServer() as server:
+            api = callfire.CallFireAPI('username', 'password', pool_size=1)
+            api.BASE_URL = server.url
+            self.addCleanup(api.close)
+
+            for i in range(3):
+                dest = io.BytesIO()
+                api.download_campaign_sound_data_mp3(i, dest=dest)
+                expected = '{{"path": "/campaigns/sounds/{}.mp3"}}'.format(i)
+                self.assertEqual(dest.getvalue(), expected.encode())
+
+        pool, = api.transport.pool_manager.pools.values()
+        self.assertEqual(pool.num_connections, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
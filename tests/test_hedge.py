@@ -0,0 +1,89 @@
+import threading
+import time
+import unittest
+
+from . import callfire
+
+from callfire.transport import MemoryTransport
+
+
+class HedgePolicyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.delays = []
+        self.lock = threading.Lock()
+        self.transport = MemoryTransport(self.handler)
+        self.policy = callfire.HedgePolicy(
+            initial_delay=0.05, budget=callfire.RetryBudget(0.25, 1))
+        self.api = callfire.CallFireAPI(
+            'username', 'password', transport=self.transport,
+            hedge_policy=self.policy)
+
+    def tearDown(self):
+        self.policy.close()
+
+    def handler(self, method, url, headers, body):
+        with self.lock:
+            delay = self.delays.pop(0) if self.delays else 0
+            number = len(self.transport.requests)
+        time.sleep(delay)
+        return 200, {}, '{{"attempt": {}}}'.format(number).encode('utf-8')
+
+    def test_fast_request_not_hedged(self):
+        self.assertEqual(self.api.get_contact(1).json(), {'attempt': 1})
+        self.assertEqual(len(self.transport.requests), 1)
+        self.assertEqual(self.policy.hedged, 0)
+
+    def test_slow_request_hedged(self):
+        self.delays = [1]
+        started = time.time()
+        response = self.api.get_contact(1)
+        self.assertLess(time.time() - started, 0.5)
+        self.assertEqual(response.json(), {'attempt': 2})
+        self.assertEqual(len(self.transport.requests), 2)
+        self.assertEqual((self.policy.hedged, self.policy.wins), (1, 1))
+
+    def test_budget_caps_hedges(self):
+        self.delays = [0.2] * 10
+        for _ in range(5):
+            self.api.get_contact(1)
+        # the initial hedge, then one every four requests
+        self.assertEqual(self.policy.hedged, 2)
+        self.assertEqual(self.policy.requests, 5)
+
+    def test_writes_and_other_paths_not_hedged(self):
+        self.policy.paths = ('/calls',)
+        self.delays = [0.2, 0.2]
+        self.api.get_contact(1)
+        self.api.update_contact(1, body={})
+        self.assertEqual(len(self.transport.requests), 2)
+        self.assertEqual(self.policy.hedged, 0)
+
+    def test_applies(self):
+        self.policy.paths = ('/calls',)
+        self.assertTrue(self.policy.applies('/calls'))
+        self.assertTrue(self.policy.applies('/calls/1/recordings'))
+        self.assertFalse(self.policy.applies('/calls-broadcasts'))
+
+    def test_delay_follows_percentile(self):
+        self.policy.percentile = 90
+        for latency in range(1, 21):
+            self.policy._record(latency / 100.0)
+        self.assertEqual(self.policy.delay(), 0.19)
+
+    def test_timeout_applied_to_attempts(self):
+        timeouts = []
+        open = self.transport.open
+
+        def record(request, base_url, auth_header, method, **kwargs):
+            timeouts.append(kwargs.get('timeout'))
+            return open(request, base_url, auth_header, method, **kwargs)
+
+        self.transport.open = record
+        with self.api.with_timeout(5):
+            self.api.get_contact(1)
+        self.assertEqual(timeouts, [callfire.Timeout(5, 5)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import json
+import threading
+import unittest
+
+from . import callfire
+
+from callfire.transport import MemoryTransport
+
+try:
+    from urllib.parse import parse_qs, urlsplit
+except ImportError:
+    from urlparse import parse_qs, urlsplit
+
+
+class BatchLoaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = MemoryTransport(self.handler)
+        self.api = callfire.CallFireAPI(
+            'username', 'password', transport=self.transport)
+
+    def handler(self, method, url, headers, body):
+        query = parse_qs(urlsplit(url).query)
+        if query.get('fields') == ['broken']:
+            return 500, {}, b'{}'
+        if query.get('fields') == ['html']:
+            return 200, {}, b'<html>'
+        ids = [int(id) for id in query['id'][0].split(',')]
+        items = [{'id': id, 'limit': int(query['limit'][0])}
+                 for id in ids if id % 10]
+        return 200, {}, json.dumps({'items': items}).encode()
+
+    def test_get_many(self):
+        loader = self.api.loader('find_calls', max_batch_size=100)
+        items = loader.get_many(range(1, 251))
+
+        self.assertEqual([item and item['id'] for item in items],
+                         [i if i % 10 else None for i in range(1, 251)])
+        self.assertEqual(len(self.transport.requests), 3)
+        self.assertEqual((items[0]['limit'], items[-2]['limit']), (100, 50))
+        self.assertEqual((loader.loads, loader.batches), (250, 3))
+
+    def test_concurrent_lookups_batched_within_window(self):
+        loader = self.api.loader(self.api.find_contacts, wait=0.05)
+        self.assertIs(self.api.loader('find_contacts'), loader)
+
+        results = {}
+
+        def lookup(id):
+            results[id] = loader.get(id)
+
+        threads = [threading.Thread(target=lookup, args=(id % 5 + 1,))
+                   for id in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(self.transport.requests), 1)
+        self.assertIn('/contacts?', self.transport.requests[0][1])
+        self.assertEqual(
+            dict((id, item['id']) for id, item in results.items()),
+            dict((id, id) for id in range(1, 6)))
+
+    def test_error_shared_by_batch(self):
+        loader = callfire.BatchLoader(
+            self.api.find_texts, query={'fields': 'broken'})
+        futures = [loader.load(id) for id in (1, 2)]
+
+        for future in futures:
+            self.assertIsInstance(future.exception(5), callfire.CallFireError)
+        self.assertEqual(len(self.transport.requests), 1)
+
+    def test_unexpected_payload_resolves_futures(self):
+        loader = callfire.BatchLoader(
+            self.api.find_texts, query={'fields': 'html'})
+        futures = [loader.load(id) for id in (1, 2)]
+
+        for future in futures:
+            self.assertIsInstance(future.exception(5), ValueError)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+import io
+import os
+import tempfile
+import unittest
+
+from . import callfire
+from .server import LocalServer
+
+from callfire.multipart import MultipartBody
+
+
+class MultipartBodyTest(unittest.TestCase):
+
+    def test_layout(self):
+        body = MultipartBody(io.BytesIO(b'data'), boundary=b'xyz')
+
+        expected = (
+            b'--xyz\r\n'
+            b'Content-Disposition: form-data; name="file"; filename="file"'
+            b'\r\n\r\n'
+            b'data\r\n'
+            b'--xyz--\r\n')
+        self.assertEqual(len(body), len(expected))
+        self.assertEqual(body.read(), expected)
+        self.assertEqual(body.read(), b'')
+        self.assertEqual(body.content_type,
+                         'multipart/form-data; boundary=xyz')
+
+    def test_chunked_reads(self):
+        stream = io.BytesIO(b'skipped' + os.urandom(10000))
+        stream.seek(7)
+        body = MultipartBody(stream, chunk_size=100)
+        chunks = list(iter(lambda: body.read(333), b''))
+
+        self.assertTrue(all(len(chunk) == 333 for chunk in chunks[:-1]))
+        self.assertEqual(len(b''.join(chunks)), len(body))
+
+        body.rewind()
+        self.assertEqual(body.read(), b''.join(chunks))
+
+    def test_random_boundary(self):
+        boundaries = set(
+            MultipartBody(io.BytesIO(b'')).boundary for _ in range(10))
+        self.assertEqual(len(boundaries), 10)
+
+    def test_path_payload(self):
+        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as f:
+            f.write(b'ID3' * 1000)
+        self.addCleanup(os.remove, f.name)
+
+        body = MultipartBody(f.name)
+        data = body.read()
+
+        self.assertEqual(len(data), len(body))
+        self.assertIn('filename="{}"'.format(
+            os.path.basename(f.name)).encode(), data)
+        self.assertIn(b'ID3' * 1000, data)
+
+    def test_pipe_payload(self):
+        read_fd, write_fd = os.pipe()
+        with os.fdopen(write_fd, 'wb') as writer:
+            writer.write(b'data' * 1000)
+        reader = os.fdopen(read_fd, 'rb')
+        self.addCleanup(reader.close)
+
+        body = MultipartBody(reader, boundary=b'xyz', chunk_size=100)
+
+        self.assertIsNone(body.length)
+        self.assertTrue(body.rewindable)
+        data = body.read()
+        self.assertFalse(body.rewindable)
+        self.assertIn(b'\r\n\r\n' + b'data' * 1000 + b'\r\n--xyz--', data)
+
+    def test_pipe_upload(self):
+        read_fd, write_fd = os.pipe()
+        with os.fdopen(write_fd, 'wb') as writer:
+            writer.write(b'ID3' * 1000)
+        reader = os.fdopen(read_fd, 'rb')
+        self.addCleanup(reader.close)
+
+        with LocalServer() as server:
+            api = callfire.CallFireAPI('username', 'password', pool_size=1)
+            api.BASE_URL = server.url
+            self.addCleanup(api.close)
+
+            api.post_file_campaign_sound(
+                query={'name': 'greeting'}, payload=reader)
+
+        method, path, headers, body = server.requests[0]
+        self.assertEqual(headers['Transfer-Encoding'], 'chunked')
+        self.assertNotIn('Content-Length', headers)
+        self.assertIn(b'ID3' * 1000, body)
+
+    def test_upload(self):
+        with LocalServer() as server:
+            api = callfire.CallFireAPI('username', 'password', pool_size=1)
+            api.BASE_URL = server.url
+            self.addCleanup(api.close)
+
+            payload = os.urandom(200000)
+            api.post_file_campaign_sound(
+                query={'name': 'greeting'}, payload=io.BytesIO(payload))
+
+        method, path, headers, body = server.requests[0]
+        self.assertEqual(path, '/campaigns/sounds/files?name=greeting')
+        self.assertEqual(int(headers['Content-Length']), len(body))
+        boundary = headers['Content-Type'].split('boundary=')[1]
+        self.assertTrue(body.startswith('--{}'.format(boundary).encode()))
+        self.assertIn(payload, body)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import json
+import unittest
+try:
+    # py3
+    from urllib.parse import parse_qs, urlsplit
+except ImportError:
+    # py2
+    from urlparse import parse_qs, urlsplit
+
+from . import callfire
+
+from callfire.transport import MemoryTransport
+
+
+def paged_handler(total, with_total_count=True, max_limit=None):
+    """Returns a memory transport handler paging over `total` items."""
+    def handler(method, url, headers, body):
+        query = parse_qs(urlsplit(url).query)
+        limit = int(query['limit'][0])
+        if max_limit is not None:
+            limit = min(limit, max_limit)
+        offset = int(query['offset'][0])
+        page = {
+            'items': [{'id': i} for i in range(offset,
+                                                min(offset + limit, total))],
+            'limit': limit,
+            'offset': offset,
+        }
+        if with_total_count:
+            page['totalCount'] = total
+        return 200, {}, json.dumps(page).encode('utf-8')
+    return handler
+
+
+class PaginatorTest(unittest.TestCase):
+
+    def api(self, handler):
+        self.transport = MemoryTransport(handler)
+        return callfire.CallFireAPI(
+            'username', 'password', transport=self.transport)
+
+    def test_iter_items(self):
+        calls = self.api(paged_handler(250)).iter_calls(
+            query={'states': 'FINISHED'})
+
+        self.assertEqual([c['id'] for c in calls], list(range(250)))
+        self.assertEqual(calls.total_count, 250)
+        self.assertEqual(calls.pages_fetched, 3)
+        self.assertIn('states=FINISHED', self.transport.requests[0][1])
+
+    def test_stops_on_exact_last_page(self):
+        texts = self.api(paged_handler(200)).paginate(
+            'find_texts', page_size=50)
+
+        self.assertEqual(len(list(texts)), 200)
+        self.assertEqual(texts.pages_fetched, 4)
+
+    def test_without_total_count(self):
+        items = self.api(paged_handler(200, False)).iter_contact_list_items(
+            5, query={'limit': 100, 'offset': 100})
+
+        self.assertEqual([i['id'] for i in items], list(range(100, 200)))
+        # the last full page can only be told by an empty one
+        self.assertEqual(items.pages_fetched, 2)
+        self.assertIsNone(items.total_count)
+        self.assertIn('/contacts/lists/5/items', self.transport.requests[0][1])
+
+    def test_prefetch(self):
+        calls = self.api(paged_handler(1030)).iter_calls(
+            query={'offset': 10}, prefetch=4)
+
+        self.assertEqual([c['id'] for c in calls], list(range(10, 1030)))
+        self.assertEqual(calls.pages_fetched, 11)
+        offsets = sorted(
+            int(parse_qs(urlsplit(url).query)['offset'][0])
+            for _, url, _, _ in self.transport.requests)
+        self.assertEqual(offsets, list(range(10, 1030, 100)))
+
+    def test_prefetch_without_total_count(self):
+        calls = self.api(paged_handler(250, False)).iter_calls(prefetch=4)
+
+        self.assertEqual([c['id'] for c in calls], list(range(250)))
+        self.assertEqual(calls.pages_fetched, 3)
+
+    def test_server_capped_page_size(self):
+        for prefetch in (0, 4):
+            calls = self.api(paged_handler(3000, max_limit=1000)).iter_calls(
+                page_size=2000, prefetch=prefetch)
+
+            self.assertEqual([c['id'] for c in calls], list(range(3000)))
+            self.assertEqual(calls.pages_fetched, 3)
+
+    def test_prefetch_fills_short_pages(self):
+        handler = paged_handler(100)
+
+        def short_pages(method, url, headers, body):
+            status, headers, data = handler(method, url, headers, body)
+            page = json.loads(data.decode('utf-8'))
+            if page['offset'] == 30:
+                page['items'] = page['items'][:4]
+            return status, headers, json.dumps(page).encode('utf-8')
+
+        calls = self.api(short_pages).iter_calls(page_size=10, prefetch=3)
+        self.assertEqual([c['id'] for c in calls], list(range(100)))
+
+    def test_lazy(self):
+        calls = iter(self.api(paged_handler(1000)).iter_calls())
+
+        next(calls)
+        self.assertEqual(len(self.transport.requests), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
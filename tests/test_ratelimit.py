@@ -0,0 +1,123 @@
+import threading
+import time
+import unittest
+
+from . import callfire
+
+from callfire.ratelimit import parse_retry_after
+from callfire.transport import MemoryTransport
+
+
+class TokenBucketTest(unittest.TestCase):
+
+    def test_rate(self):
+        bucket = callfire.TokenBucket(rate=100, burst=5)
+        started = time.time()
+        for _ in range(15):
+            bucket.acquire()
+        # 5 at once, then 10 at 100/s
+        self.assertGreaterEqual(time.time() - started, 0.09)
+
+    def test_pause(self):
+        bucket = callfire.TokenBucket(rate=1000)
+        bucket.pause(0.05)
+        self.assertGreater(bucket.wait_time(), 0.04)
+        self.assertIsNone(bucket.reserve(max_wait=0.01))
+        self.assertGreater(bucket.reserve(), 0.04)
+
+
+class RateLimiterTest(unittest.TestCase):
+
+    def setUp(self):
+        self.limited = 0
+        self.transport = MemoryTransport(self.handler)
+        self.limiter = callfire.RateLimiter(
+            rate=200, rates={'texts': 50}, min_rate=10)
+        self.api = callfire.CallFireAPI(
+            'username', 'password', transport=self.transport,
+            rate_limiter=self.limiter)
+
+    def handler(self, method, url, headers, body):
+        if self.limited:
+            self.limited -= 1
+            return 429, {'Retry-After': '0.05'}, b'{}'
+        return 200, {}, b'{}'
+
+    def test_deadline_bounds_waits(self):
+        self.limited = 1
+        started = time.time()
+        with self.api.deadline(0.02):
+            with self.assertRaises(callfire.CallFireError) as context:
+                self.api.get_contact(1)
+        self.assertEqual(context.exception.wrapped_exc.code, 429)
+
+        # the group is still paused
+        with self.api.deadline(0.02):
+            with self.assertRaises(callfire.DeadlineExceeded):
+                self.api.get_contact(1)
+        self.assertLess(time.time() - started, 0.04)
+        self.assertEqual(len(self.transport.requests), 1)
+
+    def test_groups(self):
+        self.assertEqual(self.limiter.group('/texts/auto-replys/1'), 'texts')
+        self.assertEqual(self.limiter.group('/calls/recordings/1.mp3'),
+                         'calls')
+        self.assertEqual(self.limiter.group('/me'), 'me')
+
+    def test_group_rates_shared_by_threads(self):
+        started = time.time()
+        threads = [threading.Thread(target=self.api.get_text, args=(i,))
+                   for i in range(11)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertGreaterEqual(time.time() - started, 0.19)
+
+        # other groups have their own bucket
+        started = time.time()
+        self.api.get_call(1)
+        self.assertLess(time.time() - started, 0.05)
+
+    def test_429_retried_after_retry_after(self):
+        self.limited = 2
+        started = time.time()
+        self.assertEqual(self.api.get_contact(1).status, 200)
+
+        self.assertGreaterEqual(time.time() - started, 0.1)
+        self.assertEqual(len(self.transport.requests), 3)
+        self.assertEqual(self.limiter.throttled, 2)
+        # decreased once for both 429s
+        self.assertAlmostEqual(
+            self.limiter.bucket('/contacts').rate, 100, delta=1)
+
+    def test_429_retries_exhausted(self):
+        self.limiter.retries = 1
+        self.limited = 5
+        with self.assertRaises(callfire.CallFireError) as context:
+            self.api.delete_contact(1)
+        self.assertEqual(context.exception.wrapped_exc.code, 429)
+        self.assertEqual(len(self.transport.requests), 2)
+
+    def test_rate_recovers(self):
+        bucket = self.limiter.bucket('/contacts')
+        self.limiter.rate_limited('/contacts', 0)
+        self.assertEqual(bucket.rate, 100)
+        self.limiter.increase = 1000
+        time.sleep(0.02)
+        self.api.get_contact(1)
+        self.assertGreater(bucket.rate, 110)
+        time.sleep(0.2)
+        self.api.get_contact(1)
+        self.assertEqual(bucket.rate, 200)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after('3'), 3)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after('soon'))
+        self.assertEqual(
+            parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from . import callfire
+
+from callfire.transport import MemoryTransport
+
+
+class RecipientLoaderTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.checkpoint = os.path.join(self.directory, 'load.json')
+        self.failing = set()
+        self.bodies = []
+        self.transport = MemoryTransport(self.handler)
+        self.api = callfire.CallFireAPI(
+            'username', 'password', transport=self.transport)
+        self.reports = []
+
+    def handler(self, method, url, headers, body):
+        body = json.loads(body.decode('utf-8'))
+        self.bodies.append((url, body))
+        if isinstance(body, dict):
+            body = body.get('recipients') or body.get('contacts')
+        recipients = body or []
+        if recipients and recipients[0].get('phoneNumber') in self.failing:
+            return 500, {}, b'{}'
+        return 200, {}, b'{"items": []}'
+
+    def recipients(self, count):
+        return ({'phoneNumber': str(number)} for number in range(count))
+
+    def load(self, method, count, **kwargs):
+        loader = self.api.load_recipients(
+            method, 7, self.recipients(count), batch_size=10,
+            checkpoint=self.checkpoint, report=self.reports.append, **kwargs)
+        return loader, list(loader)
+
+    def test_load_recipients(self):
+        loader, results = self.load('add_text_broadcast_recipients', 25)
+
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(loader.items_sent, 25)
+        self.assertEqual(len(self.bodies), 3)
+        self.assertTrue(all(url.endswith('/texts/broadcasts/7/recipients')
+                            for url, _ in self.bodies))
+        self.assertGreater(loader.rate, 0)
+        self.assertIs(self.reports[-1], loader)
+
+    def test_resume_from_checkpoint(self):
+        self.failing = {'10'}
+        loader, results = self.load('add_call_broadcast_recipients', 35)
+        self.assertEqual(loader.chunks_failed, 1)
+        with open(self.checkpoint) as stream:
+            self.assertEqual(json.load(stream),
+                             {'batch_size': 10, 'done': [0, 2, 3]})
+
+        self.failing, self.bodies = set(), []
+        loader, results = self.load('add_call_broadcast_recipients', 35)
+        self.assertEqual([(r.offset, len(r.items)) for r in results],
+                         [(10, 10)])
+        self.assertEqual(loader.items_skipped, 25)
+        self.assertEqual(self.bodies[0][1][0], {'phoneNumber': '10'})
+
+        with self.assertRaises(ValueError):
+            list(self.api.load_recipients(
+                'add_call_broadcast_recipients', 7, [],
+                checkpoint=self.checkpoint))
+
+    def test_request_bodies(self):
+        self.load('add_call_broadcast_batch', 15, name='spring',
+                  scrub_duplicates=True)
+        bodies = sorted((body['name'], len(body['recipients']),
+                         body['scrubDuplicates'])
+                        for _, body in self.bodies)
+        self.assertEqual(bodies, [('spring-1', 10, True),
+                                  ('spring-2', 5, True)])
+
+        os.remove(self.checkpoint)
+        self.bodies = []
+        self.load('add_contact_list_items', 5)
+        self.assertEqual(self.bodies[0][1], {
+            'contacts': list(self.recipients(5))})
+        self.assertTrue(self.bodies[0][0].endswith('/contacts/lists/7/items'))
+
+        loader = self.api.load_recipients('add_contact_list_items', 7, [])
+        self.assertEqual(loader.body(0, [1, 2]), {'contactIds': [1, 2]})
+        self.assertEqual(loader.body(0, ['+1']), {'contactNumbers': ['+1']})
+
+    def test_read_csv(self):
+        path = os.path.join(self.directory, 'recipients.csv')
+        with io.open(path, 'w', encoding='utf-8') as stream:
+            stream.write(u'phoneNumber,message,name\n'
+                         u'12135551100,Hi,Jürgen\n'
+                         u'12135551101,,\n')
+
+        self.assertEqual(list(callfire.read_csv(path, attributes=['name'])), [
+            {'phoneNumber': '12135551100', 'message': 'Hi',
+             'attributes': {'name': u'Jürgen'}},
+            {'phoneNumber': '12135551101'}])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import io
+import json
+import unittest
+
+from . import callfire
+from .server import LocalServer
+
+from callfire.response import Response, StreamedResponse
+from callfire.transport import MemoryTransport
+
+
+class FakeRaw(io.BytesIO):
+    status = 200
+    reason = 'OK'
+    headers = {'Content-Type': 'application/json'}
+
+    def geturl(self):
+        return 'http://base_url.com/calls'
+
+
+class ResponseTest(unittest.TestCase):
+
+    def test_from_raw(self):
+        raw = FakeRaw(b'{"id": 1}')
+        response = Response.from_raw(raw)
+
+        self.assertTrue(raw.closed)
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.reason, 'OK')
+        self.assertEqual(response.url, 'http://base_url.com/calls')
+        self.assertEqual(response.bytes_received, 9)
+        self.assertFalse(hasattr(response, '__dict__'))
+
+    def test_body_is_re_readable(self):
+        response = Response(None, 200, 'OK', {}, b'{"id": 1}')
+
+        self.assertIs(response.json(), response.json())
+        self.assertEqual(response.read(), b'{"id": 1}')
+        self.assertEqual(response.read(), b'{"id": 1}')
+        self.assertEqual(response.read(4), b'{"id')
+        self.assertEqual(response.read(), b'{"id": 1}')
+        self.assertEqual(response.read(100), b'": 1}')
+        self.assertEqual(list(response.iter_items()), [])
+
+    def test_tracks_request(self):
+        api = callfire.CallFireAPI(
+            'username', 'password', transport=MemoryTransport())
+        response = api.send_texts(body=[{'message': 'Hi!'}])
+
+        self.assertEqual(response.bytes_sent, 20)
+        self.assertGreaterEqual(response.elapsed, 0)
+        self.assertEqual(response.json(), {})
+
+
+class StreamedResponseTest(unittest.TestCase):
+
+    def setUp(self):
+        self.payload = {'items': [{'id': i} for i in range(1000)]}
+        self.server = LocalServer(payload=self.payload).__enter__()
+        self.addCleanup(self.server.__exit__)
+
+    def api(self, **kwargs):
+        api = callfire.CallFireAPI('username', 'password', **kwargs)
+        api.BASE_URL = self.server.url
+        self.addCleanup(api.close)
+        return api
+
+    def test_streaming_urlopen(self):
+        api = self.api()
+        with api.streaming():
+            response = api.find_calls()
+
+        self.assertIsInstance(response, StreamedResponse)
+        self.assertEqual(response.status, 200)
+        with response:
+            items = iter(response.iter_items(chunk_size=100))
+            self.assertEqual(next(items), {'id': 0})
+            self.assertLess(response.bytes_received, 1000)
+            self.assertEqual(len(list(items)), 999)
+
+        # only the current thread was switched to streaming
+        self.assertIsInstance(api.find_calls(), Response)
+
+    def test_streaming_pool_releases_connection(self):
+        api = self.api(pool_size=1)
+        pool_manager = api.transport.pool_manager
+
+        with api.streaming():
+            api.find_calls().json()
+            api.find_calls().close()
+            self.assertEqual(
+                api.find_calls().read(),
+                json.dumps(self.payload).encode('utf-8'))
+            api.find_calls().json()
+
+        pool, = pool_manager.pools.values()
+        # the response closed before the end dropped its connection
+        self.assertEqual(pool.num_connections, 2)
+        self.assertEqual(pool.num_requests, 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,131 @@
+import unittest
+
+from . import callfire
+
+from callfire.transport import MemoryTransport
+
+try:
+    from urllib.error import URLError
+except ImportError:
+    from urllib2 import URLError
+
+
+class RetryPolicyTest(unittest.TestCase):
+
+    def setUp(self):
+        self.statuses = []
+        self.retries = []
+        self.bodies = []
+        self.headers = {}
+        self.transport = MemoryTransport(self.handler)
+        self.policy = callfire.RetryPolicy(
+            attempts=3, backoff=0.001, hooks=[self.hook])
+        self.api = callfire.CallFireAPI(
+            'username', 'password', transport=self.transport,
+            retry_policy=self.policy)
+
+    def handler(self, method, url, headers, body):
+        if hasattr(body, 'read'):
+            self.bodies.append(body.read())
+        status = self.statuses.pop(0) if self.statuses else 200
+        if status is None:
+            raise URLError('connection reset')
+        return status, self.headers, b'{}'
+
+    def hook(self, request, method, error, attempt, delay):
+        self.retries.append((method, request.path, attempt))
+
+    def test_idempotent_methods_retried(self):
+        self.statuses = [502, None]
+        self.assertEqual(self.api.get_contact(1).status, 200)
+        self.statuses = [503]
+        self.api.update_contact(1, body={})
+        self.statuses = [None]
+        self.api.delete_contact(1)
+
+        self.assertEqual(self.retries, [
+            ('GET', '/contacts/1', 1), ('GET', '/contacts/1', 2),
+            ('PUT', '/contacts/1', 1), ('DELETE', '/contacts/1', 1)])
+        self.assertEqual(self.policy.retries, 4)
+        self.assertEqual(len(self.transport.requests), 7)
+
+    def test_attempts_exhausted(self):
+        self.statuses = [500, 500, 500, 500]
+        with self.assertRaises(callfire.CallFireError) as context:
+            self.api.get_contact(1)
+        self.assertEqual(context.exception.wrapped_exc.code, 500)
+        self.assertEqual(len(self.transport.requests), 3)
+
+    def test_client_errors_not_retried(self):
+        self.statuses = [404]
+        with self.assertRaises(callfire.CallFireError):
+            self.api.get_contact(1)
+        self.assertEqual(self.retries, [])
+
+    def test_post_retried_on_opt_in(self):
+        self.statuses = [502]
+        with self.assertRaises(callfire.CallFireError):
+            self.api.send_texts(body=[{'message': 'hi'}])
+        self.statuses = [429]
+        self.api.send_texts(body=[{'message': 'hi'}])
+
+        self.policy.retry_post = True
+        self.statuses = [502]
+        self.api.send_texts(body=[{'message': 'hi'}])
+        self.assertEqual([attempt for _, _, attempt in self.retries], [1, 1])
+
+    def test_budget(self):
+        self.policy.budget = callfire.RetryBudget(ratio=0.5, reserve=1)
+        self.statuses = [500, 500]
+        with self.assertRaises(callfire.CallFireError):
+            self.api.get_contact(1)
+        self.assertEqual(self.policy.exhausted, 1)
+        self.assertEqual(len(self.transport.requests), 2)
+
+        # two more requests earn another retry
+        self.api.get_contact(1)
+        self.statuses = [500]
+        self.api.get_contact(1)
+        self.assertEqual(self.policy.retries, 2)
+
+    def test_multipart_body_rewound(self):
+        self.policy.retry_post = True
+        self.statuses = [503]
+        self.api.create_contact_list_from_file(payload=__file__)
+        first, second = self.bodies
+        self.assertEqual(first, second)
+        self.assertIn(b'test_multipart_body_rewound', second)
+
+    def test_retry_vetoed_by_deadline(self):
+        self.policy.budget = callfire.RetryBudget(reserve=10)
+        self.headers = {'Retry-After': '1'}
+        self.statuses = [503]
+        with self.api.deadline(0.05):
+            with self.assertRaises(callfire.CallFireError):
+                self.api.get_contact(1)
+
+        self.assertEqual(len(self.transport.requests), 1)
+        self.assertEqual(self.retries, [])
+        self.assertEqual(self.policy.retries, 0)
+        self.assertEqual(self.policy.budget.balance, 10)
+
+    def test_streamed_body_not_retried(self):
+        self.policy.retry_post = True
+        self.statuses = [503]
+        with self.assertRaises(callfire.CallFireError):
+            self.api.create_contact_list_from_file(
+                payload=iter([b'homePhone\n', b'12135551100\n']))
+
+        self.assertEqual(len(self.transport.requests), 1)
+        self.assertEqual(self.retries, [])
+        self.assertEqual(self.policy.retries, 0)
+
+    def test_backoff(self):
+        policy = callfire.RetryPolicy(backoff=1, max_backoff=5)
+        for _ in range(20):
+            self.assertLessEqual(policy.backoff_delay(1), 1)
+            self.assertLessEqual(policy.backoff_delay(10), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
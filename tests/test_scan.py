@@ -0,0 +1,73 @@
+import json
+import threading
+import unittest
+try:
+    # py3
+    from urllib.parse import parse_qs, urlsplit
+except ImportError:
+    # py2
+    from urlparse import parse_qs, urlsplit
+
+from . import callfire
+
+from callfire.scan import Window
+from callfire.transport import MemoryTransport
+
+
+class WindowScannerTest(unittest.TestCase):
+
+    def setUp(self):
+        # bursty history: sparse records with a dense spike in the middle
+        self.created = sorted(
+            list(range(0, 100000, 1000)) + list(range(50000, 50500)))
+        self.lock = threading.Lock()
+        self.max_offset = 0
+        self.api = callfire.CallFireAPI(
+            'username', 'password', transport=MemoryTransport(self.handler))
+
+    def handler(self, method, url, headers, body):
+        query = dict((k, int(v[0]))
+                     for k, v in parse_qs(urlsplit(url).query).items())
+        matching = [c for c in self.created
+                    if query['intervalBegin'] <= c <= query['intervalEnd']]
+        with self.lock:
+            self.max_offset = max(self.max_offset, query['offset'])
+        page = {
+            'items': [{'created': c} for c in matching[
+                query['offset']:query['offset'] + query['limit']]],
+            'totalCount': len(matching),
+        }
+        return 200, {}, json.dumps(page).encode('utf-8')
+
+    def test_scan(self):
+        scanner = self.api.scan('find_calls', 0, 100000, threshold=100,
+                                concurrency=4, page_size=20)
+        created = [call['created'] for call in scanner]
+
+        self.assertEqual(created, self.created)
+        self.assertGreater(scanner.windows_split, 0)
+        self.assertLess(self.max_offset, 100)
+        self.assertEqual(scanner.checkpoint, 100000)
+
+    def test_resume_from_checkpoint(self):
+        scanner = self.api.scan('find_texts', 0, 100000, threshold=100)
+        items = iter(scanner)
+        consumed = [next(items)['created'] for _ in range(150)]
+        items.close()
+
+        checkpoint = scanner.checkpoint
+        self.assertGreater(checkpoint, 0)
+        resumed = self.api.scan('find_texts', checkpoint, 100000,
+                                threshold=100)
+
+        self.assertEqual(
+            [c for c in consumed if c < checkpoint] +
+            [c['created'] for c in resumed],
+            self.created)
+
+    def test_window_bisect(self):
+        self.assertEqual(Window(0, 5).bisect(), (Window(0, 2), Window(2, 5)))
+
+
+if __name__ == '__main__':
+    unittest.main()
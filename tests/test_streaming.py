@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+import unittest
+
+from . import callfire
+
+from callfire.streaming import JSONItemStream
+from callfire.transport import MemoryTransport
+
+
+class JSONItemStreamTest(unittest.TestCase):
+
+    page = {
+        'items': [
+            {'id': 1, 'attributes': {'name': u'Zo\xeb', 'n': [1.5, None]}},
+            {'id': 22, 'message': 'a ] } , " tricky \\" string'},
+            12345,
+            True,
+        ],
+        'limit': 4,
+        'offset': 0,
+        'totalCount': 9,
+    }
+
+    def stream(self, data, **kwargs):
+        return JSONItemStream(io.BytesIO(data.encode('utf-8')), **kwargs)
+
+    def test_items_and_metadata(self):
+        data = json.dumps(self.page, indent=2, ensure_ascii=False)
+        # tiny chunks split values, numbers and utf-8 sequences
+        for chunk_size in (1, 3, 7, 4096):
+            stream = self.stream(data, chunk_size=chunk_size)
+            self.assertEqual(list(stream), self.page['items'])
+            self.assertEqual(
+                stream.metadata, {'limit': 4, 'offset': 0, 'totalCount': 9})
+
+    def test_metadata_before_items(self):
+        stream = self.stream('{"totalCount": 2, "items": [1, 2]}')
+        items = iter(stream)
+
+        self.assertEqual(next(items), 1)
+        self.assertEqual(stream.metadata, {'totalCount': 2})
+        self.assertEqual(list(items), [2])
+
+    def test_empty_and_missing_items(self):
+        self.assertEqual(list(self.stream('{"items": []}')), [])
+        self.assertEqual(list(self.stream('{"id": 5}')), [])
+        self.assertEqual(list(self.stream('[]')), [])
+
+    def test_top_level_array(self):
+        self.assertEqual(list(self.stream('[{"a": 1}, 2]')), [{'a': 1}, 2])
+
+    def test_numbers_across_chunks(self):
+        data = '[12.5,1e10,-3,{"n": 2E-3}]'
+        for chunk_size in (1, 2, 4, 8):
+            self.assertEqual(list(self.stream(data, chunk_size=chunk_size)),
+                             [12.5, 1e10, -3, {'n': 2e-3}])
+
+    def test_truncated_body(self):
+        with self.assertRaises(ValueError):
+            list(self.stream('{"items": [{"id": 1}, {"id"'))
+
+    def test_response_iter_items(self):
+        data = json.dumps(self.page).encode('utf-8')
+        api = callfire.CallFireAPI(
+            'username', 'password',
+            transport=MemoryTransport(lambda *args: (200, {}, data)))
+
+        items = api.find_calls().iter_items(chunk_size=16)
+        self.assertEqual(list(items), self.page['items'])
+        self.assertEqual(items.metadata['totalCount'], 9)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import threading
+import time
+import unittest
+
+from . import callfire
+from .server import LocalServer
+
+from callfire.base import JSONRequest
+from callfire.timeout import Deadline, Timeout
+from callfire.transport import MemoryTransport
+
+
+class RecordingTransport(MemoryTransport):
+
+    def __init__(self, handler=None):
+        super(RecordingTransport, self).__init__(handler)
+        self.timeouts = []
+
+    def open(self, request, base_url, auth_header, method, stream=False,
+             **kwargs):
+        self.timeouts.append(kwargs.get('timeout'))
+        return super(RecordingTransport, self).open(
+            request, base_url, auth_header, method, stream=stream)
+
+
+class LegacyTransport(MemoryTransport):
+
+    def open(self, request, base_url, auth_header, method, stream=False):
+        return super(LegacyTransport, self).open(
+            request, base_url, auth_header, method, stream=stream)
+
+
+class TimeoutTest(unittest.TestCase):
+
+    def setUp(self):
+        self.delay = 0
+        self.transport = RecordingTransport(self.handler)
+        self.api = callfire.CallFireAPI(
+            'username', 'password', transport=self.transport,
+            timeout=(3, 10))
+
+    def handler(self, method, url, headers, body):
+        time.sleep(self.delay)
+        if '/calls?' in url:
+            return 200, {}, b'{"items": [{"id": 1}], "totalCount": 5}'
+        return 200, {}, b'{}'
+
+    def test_timeout_coerce(self):
+        self.assertEqual(Timeout.coerce(5), Timeout(5, 5))
+        self.assertEqual(Timeout.coerce((1, 2)).total, 2)
+        self.assertIsNone(Timeout.coerce(None))
+        self.assertEqual(Timeout(None, 10).cap(4), Timeout(4, 4))
+
+    def test_client_and_call_timeouts(self):
+        self.api.get_call(1)
+        with self.api.with_timeout(1):
+            self.api.get_call(1)
+        self.api.get_call(1)
+        self.assertEqual(self.transport.timeouts,
+                         [Timeout(3, 10), Timeout(1, 1), Timeout(3, 10)])
+
+    def test_no_timeout_not_passed(self):
+        api = callfire.CallFireAPI(
+            'username', 'password', transport=LegacyTransport())
+        self.assertEqual(api.get_call(1).json(), {})
+
+    def test_deadline_caps_timeouts(self):
+        with self.api.deadline(2):
+            self.api.get_call(1)
+        connect, read = self.transport.timeouts[0]
+        self.assertLessEqual(read, 2)
+        self.assertEqual(connect, read)
+
+    def test_deadline_exceeded(self):
+        with self.api.deadline(0.01):
+            time.sleep(0.02)
+            with self.assertRaises(callfire.DeadlineExceeded):
+                self.api.get_call(1)
+        self.assertEqual(self.transport.requests, [])
+
+    def test_nested_deadline_only_sooner(self):
+        with self.api.deadline(0.5) as outer:
+            with self.api.deadline(10):
+                self.assertIs(Deadline.current(), outer)
+            self.assertIs(Deadline.current(), outer)
+        self.assertIsNone(Deadline.current())
+
+    def test_deadline_shared_with_threads(self):
+        entered, exited = threading.Event(), threading.Event()
+        seen = []
+
+        def worker(deadline):
+            with deadline:
+                entered.set()
+                exited.wait(5)
+            seen.append(Deadline.current())
+
+        with Deadline(100) as outer:
+            with Deadline(10) as inner:
+                thread = threading.Thread(target=worker, args=(inner,))
+                thread.start()
+                entered.wait(5)
+            self.assertIs(Deadline.current(), outer)
+            exited.set()
+            thread.join(5)
+        self.assertEqual(seen, [None])
+        self.assertIsNone(Deadline.current())
+
+    def test_batch_deadline(self):
+        self.delay = 0.02
+        results = list(self.api.map(
+            'get_call', range(20), concurrency=2, deadline=0.05))
+
+        failed = [r for r in results if not r.ok]
+        self.assertTrue(failed)
+        for result in failed:
+            self.assertIsInstance(result.error, callfire.DeadlineExceeded)
+        self.assertLess(len(self.transport.requests), 20)
+
+    def test_prefetch_threads_see_deadline(self):
+        with self.api.deadline(5):
+            calls = list(self.api.iter_calls(page_size=1, prefetch=2))
+        self.assertEqual(len(calls), 5)
+        for _, read in self.transport.timeouts:
+            self.assertLessEqual(read, 5)
+
+
+class TransportTimeoutTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = LocalServer().__enter__()
+        self.addCleanup(self.server.__exit__)
+
+    def assert_times_out(self, api):
+        api.BASE_URL = self.server.url
+        self.addCleanup(api.close)
+        started = time.time()
+        with self.assertRaises(callfire.CallFireError):
+            api._get(JSONRequest('/sleep/1'))
+        self.assertLess(time.time() - started, 0.5)
+
+    def test_pooled_read_timeout(self):
+        api = callfire.CallFireAPI('username', 'password', pool_size=1)
+        with api.with_timeout((1, 0.1)):
+            self.assert_times_out(api)
+
+        # the timed out connection is not reused, the next request works
+        self.assertEqual(
+            api._get(JSONRequest('/calls')).json(), {'path': '/calls'})
+
+    def test_urllib_timeout(self):
+        api = callfire.CallFireAPI('username', 'password', timeout=0.1)
+        self.assert_times_out(api)
+
+
+if __name__ == '__main__':
+    unittest.main()
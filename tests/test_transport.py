@@ -0,0 +1,130 @@
+import unittest
+try:
+    # py2
+    from urllib2 import HTTPError
+except ImportError:
+    # py3
+    from urllib.error import HTTPError
+
+from . import callfire_base
+from .server import LocalServer
+
+from callfire.transport import HTTPTransport, MemoryTransport, PoolManager
+
+
+class PoolManagerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.server = LocalServer().__enter__()
+        self.addCleanup(self.server.__exit__)
+        self.manager = PoolManager(maxsize=2)
+        self.addCleanup(self.manager.close)
+
+    def test_connection_reuse(self):
+        for i in range(5):
+            response = self.manager.urlopen(
+                'GET', '{}/calls/{}'.format(self.server.url, i))
+            self.assertEqual(response.status, 200)
+            self.assertEqual(
+                response.read(), '{{"path": "/calls/{}"}}'.format(i).encode())
+
+        pool, = self.manager.pools.values()
+        self.assertEqual(pool.num_requests, 5)
+        self.assertEqual(pool.num_connections, 1)
+
+    def test_error_status_raises_http_error(self):
+        with self.assertRaises(HTTPError) as cm:
+            self.manager.urlopen(
+                'GET', '{}/status/404'.format(self.server.url))
+
+        self.assertEqual(cm.exception.code, 404)
+        self.assertEqual(cm.exception.read(), b'{"path": "/status/404"}')
+
+        # the error body is drained, so the connection is reused
+        self.manager.urlopen('GET', self.server.url)
+        pool, = self.manager.pools.values()
+        self.assertEqual(pool.num_connections, 1)
+
+    def test_connection_refused_raises_url_error(self):
+        url = self.server.url
+        self.server.__exit__()
+        with self.assertRaises(callfire_base.URLError):
+            self.manager.urlopen('GET', url)
+
+    def test_post_over_dropped_connection_not_resent(self):
+        self.manager.urlopen('GET', self.server.url)
+        with self.assertRaises(callfire_base.URLError):
+            self.manager.urlopen(
+                'POST', '{}/drop'.format(self.server.url), body=b'{}')
+
+        self.assertEqual(
+            [request[:2] for request in self.server.requests],
+            [('GET', '/'), ('POST', '/drop')])
+
+    def test_get_over_dropped_connection_resent(self):
+        self.manager.urlopen('GET', self.server.url)
+        with self.assertRaises(callfire_base.URLError):
+            self.manager.urlopen('GET', '{}/drop'.format(self.server.url))
+
+        self.assertEqual(
+            [request[:2] for request in self.server.requests],
+            [('GET', '/'), ('GET', '/drop'), ('GET', '/drop')])
+
+    def test_base_api_pool(self):
+        base = callfire_base.BaseAPI('username', 'password', pool_size=2)
+        base.BASE_URL = self.server.url
+        self.addCleanup(base.close)
+
+        request = callfire_base.JSONRequest('/texts', body=[{'a': 1}])
+        self.assertEqual(base._post(request).json(), {'path': '/texts'})
+        self.assertEqual(base._get(request).json(), {'path': '/texts'})
+
+        method, path, headers, body = self.server.requests[0]
+        self.assertEqual(
+            (method, path, body), ('POST', '/texts', b'[{"a": 1}]'))
+        self.assertEqual(headers['Authorization'], base._get_auth_header())
+        self.assertIsInstance(base.transport, HTTPTransport)
+        pool, = base.transport.pool_manager.pools.values()
+        self.assertEqual(pool.num_connections, 1)
+
+        with self.assertRaises(callfire_base.CallFireError):
+            base._get(callfire_base.JSONRequest('/status/500'))
+
+
+class MemoryTransportTest(unittest.TestCase):
+
+    def test_default_transport(self):
+        base = callfire_base.BaseAPI('username', 'password')
+        self.assertIsInstance(base.transport, callfire_base.UrllibTransport)
+
+    def test_records_requests(self):
+        transport = MemoryTransport()
+        base = callfire_base.BaseAPI(
+            'username', 'password', transport=transport)
+        base.BASE_URL = 'http://base_url.com'
+
+        request = callfire_base.JSONRequest(
+            '/texts', query={'limit': 1}, body=[42])
+        self.assertEqual(base._post(request).json(), {})
+
+        (method, url, headers, body), = transport.requests
+        self.assertEqual(method, 'POST')
+        self.assertEqual(url, 'http://base_url.com/texts?limit=1')
+        self.assertEqual(headers['Authorization'], base._get_auth_header())
+        self.assertEqual(headers['Content-Type'], 'application/json')
+        self.assertEqual(body, b'[42]')
+
+    def test_handler_error_status(self):
+        transport = MemoryTransport(
+            lambda *args: (400, {}, b'{"error": "Bad Request"}'))
+        base = callfire_base.BaseAPI(
+            'username', 'password', transport=transport)
+
+        with self.assertRaises(callfire_base.CallFireError) as cm:
+            base._get(callfire_base.JSONRequest('/texts'))
+
+        self.assertEqual(cm.exception.wrapped_exc.code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()